@@ -5,29 +5,70 @@ Provides an easy way to run different types of tests during development.
 """
 
 import argparse
+import concurrent.futures
 import subprocess
 import sys
+from collections import deque
 from pathlib import Path
 
 
-def run_command(cmd, description):
-    """Run a command and handle errors."""
-    print(f"\n🔄 {description}")
-    print(f"Running: {' '.join(cmd)}")
-    
-    try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        print(f"✅ {description} completed successfully")
-        if result.stdout:
-            print(result.stdout)
+# Number of trailing output lines repeated when a command fails
+OUTPUT_TAIL_LINES = 200
+
+
+def run_command(cmd, description, buffer=None):
+    """Run a command, streaming its output, and handle errors.
+    
+    When ``buffer`` is a list, output is collected there instead of printed,
+    so commands running concurrently can be reported in a stable order.
+    """
+    if buffer is None:
+        emit = print
+    else:
+        def emit(text="", end="\n"):
+            buffer.append(text + end)
+    
+    emit(f"\n🔄 {description}")
+    emit(f"Running: {' '.join(cmd)}")
+    
+    # Stream output as it arrives; only the tail is kept for the failure summary
+    tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1
+    ) as proc:
+        for line in proc.stdout:
+            emit(line, end="")
+            tail.append(line)
+        returncode = proc.wait()
+    
+    if returncode == 0:
+        emit(f"✅ {description} completed successfully")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} failed")
-        if e.stdout:
-            print("STDOUT:", e.stdout)
-        if e.stderr:
-            print("STDERR:", e.stderr)
-        return False
+    
+    emit(f"❌ {description} failed (exit code {returncode})")
+    if tail:
+        emit(f"Last {len(tail)} lines of output:")
+        emit("".join(tail), end="")
+    return False
+
+
+def run_commands_parallel(commands):
+    """Run independent commands concurrently and report them in submission order."""
+    buffers = [[] for _ in commands]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(commands)) as executor:
+        futures = [
+            executor.submit(run_command, cmd, desc, buffer)
+            for (cmd, desc), buffer in zip(commands, buffers)
+        ]
+        results = []
+        for future, buffer in zip(futures, buffers):
+            results.append(future.result())
+            print("".join(buffer), end="")
+    return results
 
 
 def main():
@@ -95,10 +136,10 @@ def main():
             (["flake8", "src/", "tests/"], "Flake8 linting"),
         ]
         
-        for cmd, desc in lint_commands:
-            success &= run_command(cmd, desc)
-            if not success and args.fast:
-                return 1
+        # The linters are independent processes, so run them side by side
+        success &= all(run_commands_parallel(lint_commands))
+        if not success and args.fast:
+            return 1
     
     # Build pytest command
     pytest_cmd = ["pytest"]
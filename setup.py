@@ -30,12 +30,15 @@ setup(
         "pyautogui",
         "pywinauto",
         "pillow",
+        "mss",
         "pydantic>=2.0.0",
         "mcp>=1.6.0",
     ],
     entry_points={
         "console_scripts": [
             "mcp-ui-explorer=mcp_ui_explorer:wrapper.run",
+            "mcp-play-macro=mcp_ui_explorer.cli.play_macro:main",
+            "mcp-record-macro=mcp_ui_explorer.cli.record_macro:main",
         ],
     },
 ) 
\ No newline at end of file
@@ -2,19 +2,37 @@
 
 __version__ = "0.1.20"
 
-# Import from the new modular structure
-from .core.ui_explorer import UIExplorer
-from .server.mcp_server import create_server, run_server, ServerWrapper
+# Public names resolved on first access (PEP 562), so importing a subpackage or
+# the CLI tools does not load pywinauto/pyautogui or build the server wrapper
+_LAZY_IMPORTS = {
+    "UIExplorer": ".core.ui_explorer",
+    "create_server": ".server.mcp_server",
+    "run_server": ".server.mcp_server",
+    "ServerWrapper": ".server.mcp_server",
+}
 
-# Create a wrapper instance for compatibility
-wrapper = ServerWrapper()
 
-# For backward compatibility with existing entry points
-mcp = wrapper
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    if name in ("wrapper", "mcp"):
+        # Create a wrapper instance for compatibility; mcp is kept for
+        # backward compatibility with existing entry points
+        from .server.mcp_server import ServerWrapper
+        wrapper = ServerWrapper()
+        globals()["wrapper"] = wrapper
+        globals()["mcp"] = wrapper
+        return wrapper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Main entry point function
 async def main():
     """Main entry point for the MCP UI Explorer server."""
+    from .server.mcp_server import run_server
     await run_server()
 
-__all__ = ['UIExplorer', 'main', 'wrapper', 'mcp', 'create_server', 'run_server', 'ServerWrapper'] 
\ No newline at end of file
+__all__ = ['UIExplorer', 'main', 'wrapper', 'mcp', 'create_server', 'run_server', 'ServerWrapper']
@@ -0,0 +1 @@
+"""Command line tools for recording and playing back macros."""
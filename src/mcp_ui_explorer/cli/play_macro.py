@@ -0,0 +1,432 @@
+"""
+Standalone Macro Player for MCP UI Explorer
+
+This command allows you to play back recorded macros independently of the MCP server.
+Useful for testing recorded workflows.
+
+Usage:
+    mcp-play-macro --file "macros/My Workflow.json"
+    mcp-play-macro --file "macros/Login Workflow.json" --speed 2.0
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+# The playback stack (pywinauto, pyautogui, UI-TARS client) is imported lazily
+# inside StandaloneMacroPlayer so that --list and --help start quickly
+
+try:
+    import mss
+    import mss.tools
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+
+try:
+    import win32gui
+    WIN32GUI_AVAILABLE = True
+except ImportError:
+    WIN32GUI_AVAILABLE = False
+
+# Hierarchy screenshots are reused within the same time bucket (1/4 s)
+HIERARCHY_CACHE_BUCKETS_PER_SECOND = 4
+
+
+class StandaloneMacroPlayer:
+    """Standalone macro player for testing."""
+    
+    def __init__(self):
+        import pyautogui
+        from ..services.macro_player import MacroPlayer
+        from ..services.ui_tars import UITarsService
+        from ..utils.logging import setup_logging
+        
+        self.logger = setup_logging()
+        
+        # Long-lived screen capture session; creating it once avoids re-acquiring
+        # the OS capture resources on every verification screenshot
+        self._sct = mss.mss() if MSS_AVAILABLE else None
+        
+        # Read once per playback by refresh_screen_size() instead of per screenshot
+        self._screen_size = pyautogui.size()
+        
+        # Last hierarchy screenshot: (cache_key, image_data, image_path)
+        self._hierarchy_cache = None
+        
+        # Initialize UI-TARS service (optional for verification)
+        self.ui_tars_service = UITarsService()
+        
+        # Initialize the macro player
+        self.player = MacroPlayer(
+            screenshot_function=self.screenshot_ui,
+            ui_tars_service=self.ui_tars_service
+        )
+        
+        print(f"\n🎭 Standalone Macro Player")
+        print(f"🎮 Ready to play back recorded macros")
+    
+    def refresh_screen_size(self):
+        """Re-read the screen size, e.g. after a display configuration change."""
+        import pyautogui
+        
+        self._screen_size = pyautogui.size()
+        return self._screen_size
+    
+    def _save_png(self, png_bytes: bytes, output_prefix: str) -> str:
+        """Write an already-encoded PNG to disk and return its path."""
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        image_path = f"{output_prefix}_{timestamp}.png"
+        Path(image_path).write_bytes(png_bytes)
+        return image_path
+    
+    async def screenshot_ui(
+        self,
+        region=None,
+        need_hierarchy: bool = False,
+        output_prefix: str = "playback_screenshot",
+        persist: bool = False,
+        force_refresh: bool = False,
+        **kwargs
+    ):
+        """
+        Take a screenshot for verification purposes.
+        
+        Args:
+            region: Optional (left, top, right, bottom) tuple; defaults to the full screen
+            need_hierarchy: Walk and render the UI hierarchy (slow); pixel-only otherwise
+            output_prefix: Prefix for the saved screenshot file
+            persist: Also write the screenshot to disk; otherwise image_path is None
+                and the PNG only lives in memory
+            force_refresh: Bypass the short-lived hierarchy screenshot cache
+        """
+        import pyautogui
+        from PIL import Image
+        from ..hierarchical_ui_explorer import analyze_ui_hierarchy, render_ui_hierarchy
+        
+        try:
+            screen_width, screen_height = self._screen_size
+            if region is None:
+                region = (0, 0, screen_width, screen_height)
+            
+            if need_hierarchy or not MSS_AVAILABLE:
+                # Back-to-back verifications against the same foreground window
+                # reuse the previous tree walk instead of repeating it
+                cache_key = (
+                    tuple(region),
+                    win32gui.GetForegroundWindow() if WIN32GUI_AVAILABLE else None,
+                    int(time.monotonic() * HIERARCHY_CACHE_BUCKETS_PER_SECOND)
+                )
+                cached = self._hierarchy_cache
+                if not force_refresh and cached is not None and cached[0] == cache_key:
+                    _, image_data, image_path = cached
+                    if persist and image_path is None:
+                        image_path = self._save_png(image_data, output_prefix)
+                else:
+                    # Analyze UI elements and render them over the screenshot
+                    ui_hierarchy = analyze_ui_hierarchy(
+                        region=region,
+                        max_depth=4,
+                        focus_only=True,
+                        min_size=20,
+                        visible_only=True
+                    )
+                    
+                    # One capture shared by the overlay and the caller, encoded
+                    # once in memory instead of saved to disk and read back
+                    screenshot = None
+                    if MSS_AVAILABLE:
+                        sct_img = self._sct.grab({
+                            "left": 0,
+                            "top": 0,
+                            "width": screen_width,
+                            "height": screen_height
+                        })
+                        screenshot = Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
+                    annotated = render_ui_hierarchy(ui_hierarchy, True, screenshot)
+                    
+                    buffer = io.BytesIO()
+                    annotated.save(buffer, format="PNG")
+                    png_bytes = buffer.getvalue()
+                    image_data = memoryview(png_bytes)
+                    image_path = self._save_png(png_bytes, output_prefix) if persist else None
+                    
+                    self._hierarchy_cache = (cache_key, image_data, image_path)
+            else:
+                # Raw pixel grab of the requested region only
+                left, top, right, bottom = region
+                sct_img = self._sct.grab({
+                    "left": left,
+                    "top": top,
+                    "width": right - left,
+                    "height": bottom - top
+                })
+                
+                # Encode in memory and hand out a view instead of going
+                # through a file write and read back
+                png_bytes = mss.tools.to_png(sct_img.rgb, sct_img.size)
+                image_data = memoryview(png_bytes)
+                image_path = self._save_png(png_bytes, output_prefix) if persist else None
+            
+            # Return image data, path, and cursor position
+            cursor_x, cursor_y = pyautogui.position()
+            cursor_info = {
+                "success": True,
+                "position": {
+                    "absolute": {"x": cursor_x, "y": cursor_y},
+                    "normalized": {"x": cursor_x / screen_width, "y": cursor_y / screen_height}
+                }
+            }
+            
+            return (image_data, image_path, cursor_info)
+            
+        except Exception as e:
+            self.logger.error(f"Screenshot failed: {e}")
+            raise
+    
+    async def play_macro_file(
+        self,
+        macro_path: str,
+        speed_multiplier: float = 1.0,
+        verify_ui_context: bool = True,
+        stop_on_verification_failure: bool = False,
+        dry_run: bool = False
+    ):
+        """Play a macro file."""
+        macro_file = Path(macro_path)
+        
+        if not macro_file.exists():
+            print(f"❌ Error: Macro file not found: {macro_path}")
+            return False
+        
+        print(f"\n📂 Loading macro: {macro_file.name}")
+        print(f"🎯 Speed multiplier: {speed_multiplier}x")
+        print(f"🔍 UI verification: {'Enabled' if verify_ui_context else 'Disabled'}")
+        print(f"🛑 Stop on verification failure: {'Yes' if stop_on_verification_failure else 'No'}")
+        
+        if dry_run:
+            print(f"🧪 DRY RUN MODE: No actual actions will be performed")
+        
+        # Countdown before starting
+        print(f"\n⏰ Starting playback in:")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 3
+        for i in (3, 2, 1):
+            sys.stdout.write(f"   {i}...\n")
+            sys.stdout.flush()
+            # Sleep until the next whole second relative to a fixed deadline so
+            # the countdown does not drift with print/scheduling latency
+            await asyncio.sleep(max(0.0, deadline - (i - 1) - loop.time()))
+        
+        print(f"\n🎬 PLAYBACK STARTED!")
+        
+        try:
+            # The daemon plays many macros per process; pick up display changes between them
+            self.refresh_screen_size()
+            result = await self.player.play_macro(
+                macro_path=str(macro_file),
+                speed_multiplier=speed_multiplier,
+                verify_ui_context=verify_ui_context,
+                stop_on_verification_failure=stop_on_verification_failure
+            )
+            
+            if result["success"]:
+                print(f"\n✅ PLAYBACK COMPLETED SUCCESSFULLY!")
+                print(f"   Events executed: {result.get('events_executed', 0)}")
+                print(f"   Total duration: {result.get('total_duration', 0):.2f} seconds")
+                
+                if result.get('verification_results'):
+                    # The player keeps running counters, no need to rescan the results
+                    stats = result.get('playback_stats', {})
+                    passed = stats.get('verifications_passed', 0)
+                    total = passed + stats.get('verification_failures', 0)
+                    print(f"   Verification: {passed}/{total} passed")
+                
+                return True
+            else:
+                print(f"\n❌ PLAYBACK FAILED!")
+                print(f"   Error: {result.get('error', 'Unknown error')}")
+                print(f"   Events executed: {result.get('events_executed', 0)}")
+                
+                if result.get('failed_event'):
+                    failed_event = result['failed_event']
+                    print(f"   Failed at event: {failed_event.get('type', 'Unknown')} at {failed_event.get('timestamp', 'Unknown time')}")
+                
+                return False
+                
+        except KeyboardInterrupt:
+            print(f"\n\n⌨️  Playback interrupted by user")
+            return False
+        except Exception as e:
+            print(f"\n❌ Playback error: {e}")
+            return False
+
+
+async def read_stdin_lines():
+    """Yield lines from stdin without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    except (NotImplementedError, ValueError, OSError):
+        # Console stdin on Windows cannot be attached to the loop; read it on a thread
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line:
+                return
+            yield line
+    else:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            yield line.decode()
+
+
+async def run_daemon(player: "StandaloneMacroPlayer", **playback_options):
+    """Keep one player resident and play each macro path read from stdin."""
+    print(f"\n📥 Daemon mode: enter one macro path per line (Ctrl-D / Ctrl-Z to quit)")
+    all_succeeded = True
+    
+    async for line in read_stdin_lines():
+        macro_path = line.strip()
+        if not macro_path:
+            continue
+        all_succeeded &= await player.play_macro_file(macro_path=macro_path, **playback_options)
+    
+    return all_succeeded
+
+
+def list_available_macros():
+    """List all available macro files."""
+    macros_dir = Path("macros")
+    
+    if not macros_dir.exists():
+        print("📁 No macros directory found")
+        return []
+    
+    # Filter on the directory entry name; no per-file stat or Path objects needed
+    with os.scandir(macros_dir) as entries:
+        names = sorted(
+            entry.name for entry in entries
+            if entry.name.endswith(".json") and entry.is_file(follow_symlinks=False)
+        )
+    
+    if not names:
+        print("📁 No macro files found in macros directory")
+        return []
+    
+    print(f"\n📁 Available macros in {macros_dir}:")
+    for i, name in enumerate(names, 1):
+        print(f"   {i}. {name}")
+    
+    return [macros_dir / name for name in names]
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Play back recorded UI macros",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  mcp-play-macro --file "macros/Login Workflow.json"
+  mcp-play-macro --file "macros/File Upload.json" --speed 2.0
+  mcp-play-macro --list
+  mcp-play-macro --file "macros/Test.json" --no-verify --dry-run
+  mcp-play-macro --daemon < macro_paths.txt
+        """
+    )
+    
+    parser.add_argument(
+        "--file", "-f",
+        help="Path to the macro file to play"
+    )
+    
+    parser.add_argument(
+        "--speed", "-s",
+        type=float,
+        default=1.0,
+        help="Speed multiplier for playback (default: 1.0)"
+    )
+    
+    parser.add_argument(
+        "--no-verify",
+        action="store_true",
+        help="Disable UI context verification (faster but less reliable)"
+    )
+    
+    parser.add_argument(
+        "--stop-on-failure",
+        action="store_true",
+        help="Stop playback immediately if verification fails"
+    )
+    
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show what would be done without actually performing actions"
+    )
+    
+    parser.add_argument(
+        "--list", "-l",
+        action="store_true",
+        help="List available macro files"
+    )
+    
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Stay running and play each macro path read from stdin, reusing one player"
+    )
+    
+    args = parser.parse_args()
+    
+    # List available macros if requested
+    if args.list:
+        list_available_macros()
+        return
+    
+    # Validate arguments
+    if not args.file and not args.daemon:
+        print("❌ Error: No macro file specified")
+        print("\nUse --list to see available macros or --help for usage information")
+        sys.exit(1)
+    
+    if args.speed <= 0:
+        print("❌ Error: Speed multiplier must be positive")
+        sys.exit(1)
+    
+    # Prefer uvloop/winloop for faster timer and queue wakeups
+    from ..utils.system import install_fast_event_loop
+    install_fast_event_loop()
+    
+    # Create and run the player
+    player = StandaloneMacroPlayer()
+    
+    playback_options = dict(
+        speed_multiplier=args.speed,
+        verify_ui_context=not args.no_verify,
+        stop_on_verification_failure=args.stop_on_failure,
+        dry_run=args.dry_run
+    )
+    
+    try:
+        if args.daemon:
+            success = asyncio.run(run_daemon(player, **playback_options))
+        else:
+            success = asyncio.run(player.play_macro_file(macro_path=args.file, **playback_options))
+        
+        sys.exit(0 if success else 1)
+        
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main() 
\ No newline at end of file
@@ -0,0 +1,356 @@
+"""
+Standalone Macro Recorder for MCP UI Explorer
+
+This command allows you to record UI interactions independently of the MCP server.
+The recorded macros can later be played back through the MCP server.
+
+Usage:
+    mcp-record-macro --name "My Workflow" --description "Login to website"
+    
+Controls during recording:
+    - F9: Start/Stop recording
+    - F10: Pause/Resume recording
+    - ESC: Emergency stop
+"""
+
+import argparse
+import asyncio
+import signal
+import sys
+import time
+
+# MacroRecorder and friends pull in pywinauto/pyautogui; they are imported
+# lazily so that --help does not pay for them
+
+try:
+    from pynput import keyboard
+    PYNPUT_AVAILABLE = True
+except ImportError:
+    PYNPUT_AVAILABLE = False
+    print("Warning: pynput not available. Install with: pip install pynput")
+
+
+STATUS_EMOJI = {
+    "idle": "⚪",
+    "recording": "🔴",
+    "paused": "⏸️",
+    "stopped": "⏹️"
+}
+
+
+class StandaloneMacroRecorder:
+    """Standalone macro recorder with keyboard controls."""
+    
+    def __init__(self, macro_name: str, description: str = ""):
+        from ..services.macro_recorder import MacroRecorder
+        from ..utils.logging import setup_logging
+        
+        self.logger = setup_logging()
+        self.macro_name = macro_name
+        self.description = description
+        
+        # Initialize the macro recorder
+        self.recorder = MacroRecorder()
+        
+        # Control state
+        self.is_running = True
+        self.hotkey_listener = None
+        
+        # Hotkey actions are bridged from the pynput thread into this queue;
+        # both are created in run() once the event loop is running
+        self._loop = None
+        self.pending_actions = None
+        self._stop = None
+        
+        # Last (state, events) written to the status line
+        self._last_status = (None, None)
+        
+        print(f"\n🎬 Standalone Macro Recorder")
+        print(f"📝 Macro Name: {macro_name}")
+        print(f"📄 Description: {description}")
+        print(f"\n🎮 Controls:")
+        print(f"   F9  - Start/Stop recording")
+        print(f"   F10 - Pause/Resume recording")
+        print(f"   ESC - Emergency stop and exit")
+        print(f"\n⚠️  Note: Recording captures ALL mouse and keyboard input!")
+        print(f"   Make sure to only perform the actions you want to record.")
+    
+    def start_hotkey_listener(self):
+        """Start listening for hotkey controls."""
+        if not PYNPUT_AVAILABLE:
+            print("\n❌ Hotkey controls not available (pynput not installed)")
+            print("   You'll need to manually control recording via the console")
+            return
+        
+        # Single table lookup per keystroke instead of a chain of Key comparisons
+        hotkey_map = {
+            keyboard.Key.f9: "toggle_recording",
+            keyboard.Key.f10: "toggle_pause",
+            keyboard.Key.esc: "emergency_stop",
+        }
+        
+        def on_key_press(key):
+            action = hotkey_map.get(key)
+            if action is not None:
+                self.queue_action(action)
+        
+        self.hotkey_listener = keyboard.Listener(on_press=on_key_press)
+        self.hotkey_listener.start()
+        print("🎮 Hotkey controls active!")
+    
+    def queue_action(self, action: str):
+        """Queue an action to be processed by the main loop (thread-safe)."""
+        try:
+            # Hand the action over to the event loop thread
+            self._loop.call_soon_threadsafe(self.pending_actions.put_nowait, action)
+        except Exception as e:
+            self.logger.error(f"Failed to queue action {action}: {e}")
+    
+    async def _dispatch(self, action: str):
+        """Run the handler for a hotkey action."""
+        try:
+            if action == "toggle_recording":
+                await self.toggle_recording()
+            elif action == "toggle_pause":
+                await self.toggle_pause()
+            elif action == "emergency_stop":
+                await self.emergency_stop()
+            
+            # Handlers print their own lines, so redraw the status right away
+            if self.is_running:
+                self.show_status(force=True)
+        except Exception as e:
+            self.logger.error(f"Error processing action: {e}")
+    
+    async def _status_loop(self):
+        """Refresh the status line on a 1 Hz timer, independent of hotkey handling."""
+        while self.is_running:
+            self.show_status()
+            await asyncio.sleep(1.0)
+    
+    async def toggle_recording(self):
+        """Toggle recording on/off."""
+        from ..models.enums import MacroState
+        
+        current_state = self.recorder.state
+        
+        if current_state == MacroState.IDLE:
+            # Start recording
+            result = self.recorder.start_recording(
+                macro_name=self.macro_name,
+                description=self.description,
+                capture_ui_context=True,
+                capture_screenshots=True,
+                mouse_move_threshold=50.0,
+                keyboard_commit_events=["enter", "tab", "escape"]
+            )
+            
+            if result["success"]:
+                print(f"\n🔴 RECORDING STARTED: {self.macro_name}")
+                print("   Perform your workflow now...")
+            else:
+                print(f"\n❌ Failed to start recording: {result.get('error', 'Unknown error')}")
+                
+        elif current_state == MacroState.RECORDING:
+            # Stop recording
+            result = self.recorder.stop_recording(save_macro=True, output_format="both")
+            
+            if result["success"]:
+                print(f"\n⏹️  RECORDING STOPPED")
+                print(f"   Events recorded: {result.get('events_recorded', 0)}")
+                if 'saved_files' in result:
+                    print(f"   Files saved:")
+                    for file_path in result['saved_files']:
+                        print(f"     📁 {file_path}")
+                print(f"\n✅ Macro '{self.macro_name}' saved successfully!")
+                self.is_running = False
+            else:
+                print(f"\n❌ Failed to stop recording: {result.get('error', 'Unknown error')}")
+    
+    async def toggle_pause(self):
+        """Toggle pause/resume."""
+        from ..models.enums import MacroState
+        
+        current_state = self.recorder.state
+        
+        if current_state == MacroState.RECORDING:
+            result = self.recorder.pause_recording(pause=True)
+            if result["success"]:
+                print(f"\n⏸️  RECORDING PAUSED")
+                print("   Press F10 again to resume...")
+        elif current_state == MacroState.PAUSED:
+            result = self.recorder.pause_recording(pause=False)
+            if result["success"]:
+                print(f"\n▶️  RECORDING RESUMED")
+                print("   Continue your workflow...")
+    
+    async def emergency_stop(self):
+        """Emergency stop and exit."""
+        from ..models.enums import MacroState
+        
+        current_state = self.recorder.state
+        
+        if current_state in [MacroState.RECORDING, MacroState.PAUSED]:
+            result = self.recorder.stop_recording(save_macro=True, output_format="both")
+            if result["success"]:
+                print(f"\n🛑 EMERGENCY STOP - Recording saved")
+                if 'saved_files' in result:
+                    for file_path in result['saved_files']:
+                        print(f"     📁 {file_path}")
+            else:
+                print(f"\n🛑 EMERGENCY STOP - Recording may not be saved")
+        
+        print(f"\n👋 Exiting macro recorder...")
+        self.is_running = False
+        if self._stop is not None:
+            self._stop.set()
+    
+    def show_status(self, force: bool = False):
+        """Show current recording status, redrawing only when it changed."""
+        status = self.recorder.get_status()
+        current = (status["state"], status["events_recorded"])
+        if current == self._last_status and not force:
+            return
+        self._last_status = current
+        state, events = current
+        
+        sys.stdout.write(f"\r{STATUS_EMOJI.get(state, '❓')} Status: {state.upper()} | Events: {events}")
+        sys.stdout.flush()
+    
+    async def run(self):
+        """Run the standalone recorder."""
+        print(f"\n🚀 Starting macro recorder...")
+        print(f"   Press F9 to start recording when ready")
+        
+        self._loop = asyncio.get_running_loop()
+        self.pending_actions = asyncio.Queue()
+        self._stop = asyncio.Event()
+        self._install_interrupt_handler()
+        
+        # Start hotkey listener
+        self.start_hotkey_listener()
+        
+        status_task = asyncio.create_task(self._status_loop())
+        stop_task = asyncio.create_task(self._stop.wait())
+        
+        try:
+            # Main loop: sleep until a hotkey action or Ctrl-C arrives
+            while self.is_running:
+                action_task = asyncio.create_task(self.pending_actions.get())
+                done, _ = await asyncio.wait(
+                    {action_task, stop_task},
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                
+                if action_task not in done:
+                    action_task.cancel()
+                    print(f"\n\n⌨️  Keyboard interrupt received")
+                    await self.emergency_stop()
+                    break
+                
+                await self._dispatch(action_task.result())
+                
+        except KeyboardInterrupt:
+            print(f"\n\n⌨️  Keyboard interrupt received")
+            await self.emergency_stop()
+        
+        finally:
+            # Cleanup
+            status_task.cancel()
+            stop_task.cancel()
+            self._remove_interrupt_handler()
+            if self.hotkey_listener:
+                self.hotkey_listener.stop()
+            print(f"\n\n✅ Macro recorder stopped")
+    
+    def _install_interrupt_handler(self):
+        """Deliver Ctrl-C straight to the waiting main loop via the stop event."""
+        try:
+            self._loop.add_signal_handler(signal.SIGINT, self._stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows event loops do not support add_signal_handler
+            signal.signal(
+                signal.SIGINT,
+                lambda *_: self._loop.call_soon_threadsafe(self._stop.set)
+            )
+    
+    def _remove_interrupt_handler(self):
+        """Restore the default Ctrl-C behaviour."""
+        try:
+            self._loop.remove_signal_handler(signal.SIGINT)
+        except (NotImplementedError, RuntimeError):
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Record UI macros for MCP UI Explorer",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  mcp-record-macro --name "Login Workflow"
+  mcp-record-macro --name "File Upload" --description "Upload a file to the website"
+  
+The recorded macro will be saved in the 'macros' directory and can be played back
+using the MCP UI Explorer server's play_macro tool.
+        """
+    )
+    
+    parser.add_argument(
+        "--name", "-n",
+        required=True,
+        help="Name for the macro (required)"
+    )
+    
+    parser.add_argument(
+        "--description", "-d",
+        default="",
+        help="Description of what the macro does"
+    )
+    
+    parser.add_argument(
+        "--no-ui-context",
+        action="store_true",
+        help="Disable UI context capture (faster but less reliable playback)"
+    )
+    
+    parser.add_argument(
+        "--no-screenshots",
+        action="store_true",
+        help="Disable screenshot capture (faster recording)"
+    )
+    
+    parser.add_argument(
+        "--mouse-threshold",
+        type=float,
+        default=50.0,
+        help="Minimum mouse movement distance to record (default: 50 pixels)"
+    )
+    
+    args = parser.parse_args()
+    
+    # Validate macro name
+    if not args.name.strip():
+        print("❌ Error: Macro name cannot be empty")
+        sys.exit(1)
+    
+    # Prefer uvloop/winloop for faster timer and queue wakeups
+    from ..utils.system import install_fast_event_loop
+    install_fast_event_loop()
+    
+    # Create and run the recorder
+    recorder = StandaloneMacroRecorder(
+        macro_name=args.name.strip(),
+        description=args.description.strip()
+    )
+    
+    try:
+        asyncio.run(recorder.run())
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main() 
\ No newline at end of file
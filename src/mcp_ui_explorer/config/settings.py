@@ -175,6 +175,26 @@ class UIConfig(BaseModel):
     default_verification_timeout: float = Field(default=3.0, description="Default verification timeout")
     auto_verify: bool = Field(default=True, description="Enable automatic verification by default")
     screenshot_prefix: str = Field(default="ui_hierarchy", description="Default screenshot filename prefix")
+    screenshot_format: str = Field(
+        default="jpg",
+        description="Encoding for UI screenshots: 'jpg' (fast, lossy) or 'png' (lossless)"
+    )
+    before_screenshot_ttl: float = Field(
+        default=5.0,
+        description="Max age in seconds of the last screenshot reused as the 'before' image (0 disables reuse)"
+    )
+    hierarchy_cache_ttl: float = Field(
+        default=1.0,
+        description="Seconds a UI hierarchy walk is reused for screenshots of the same window and region (0 disables)"
+    )
+    compare_before_after: bool = Field(
+        default=True,
+        description="Compare verification screenshots against a 'before' image taken ahead of each action"
+    )
+    disable_pyautogui_pause: bool = Field(
+        default=False,
+        description="Set pyautogui.PAUSE to 0, removing its implicit sleep after every pyautogui call"
+    )
 
 
 class LoggingConfig(BaseModel):
@@ -198,6 +218,10 @@ class Settings(BaseModel):
     
     # Environment
     debug: bool = Field(default=False, description="Enable debug mode")
+    compact_tool_schemas: bool = Field(
+        default=False,
+        description="Advertise tools with stub schemas; full schemas are served as mcp://ui_explorer/tools/<name> resources"
+    )
     
     # Component configurations
     ui_tars: UITarsConfig = Field(default_factory=UITarsConfig)
@@ -210,6 +234,7 @@ class Settings(BaseModel):
         """Create settings from environment variables."""
         return cls(
             debug=os.getenv("MCP_UI_EXPLORER_DEBUG", "false").lower() == "true",
+            compact_tool_schemas=os.getenv("MCP_UI_EXPLORER_COMPACT_TOOL_SCHEMAS", "false").lower() == "true",
             ui_tars=UITarsConfig(
                 provider=os.getenv("MCP_UI_EXPLORER_UI_TARS__PROVIDER", "local"),
                 api_url=os.getenv("MCP_UI_EXPLORER_UI_TARS__API_URL", "http://127.0.0.1:1234/v1"),
@@ -228,6 +253,11 @@ class Settings(BaseModel):
                 default_verification_timeout=float(os.getenv("MCP_UI_EXPLORER_UI__DEFAULT_VERIFICATION_TIMEOUT", "3.0")),
                 auto_verify=os.getenv("MCP_UI_EXPLORER_UI__AUTO_VERIFY", "true").lower() == "true",
                 screenshot_prefix=os.getenv("MCP_UI_EXPLORER_UI__SCREENSHOT_PREFIX", "ui_hierarchy"),
+                screenshot_format=os.getenv("MCP_UI_EXPLORER_UI__SCREENSHOT_FORMAT", "jpg"),
+                before_screenshot_ttl=float(os.getenv("MCP_UI_EXPLORER_UI__BEFORE_SCREENSHOT_TTL", "5.0")),
+                hierarchy_cache_ttl=float(os.getenv("MCP_UI_EXPLORER_UI__HIERARCHY_CACHE_TTL", "1.0")),
+                compare_before_after=os.getenv("MCP_UI_EXPLORER_UI__COMPARE_BEFORE_AFTER", "true").lower() == "true",
+                disable_pyautogui_pause=os.getenv("MCP_UI_EXPLORER_UI__DISABLE_PYAUTOGUI_PAUSE", "false").lower() == "true",
             ),
             logging=LoggingConfig(
                 level=os.getenv("MCP_UI_EXPLORER_LOGGING__LEVEL", "INFO"),
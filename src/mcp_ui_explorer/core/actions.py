@@ -1,17 +1,37 @@
 """UI action implementations for MCP UI Explorer."""
 
+import io
 import time
-from typing import Dict, Any, List, Optional, Union, Tuple
-import pyautogui
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, Any, List, Optional, Union, Tuple, Callable
+from PIL import Image
+
+try:
+    import mss
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+
+try:
+    import win32gui
+    WIN32GUI_AVAILABLE = True
+except ImportError:
+    WIN32GUI_AVAILABLE = False
 
 from ..config import get_settings
 from ..utils.logging import get_logger
 from ..utils.coordinates import CoordinateConverter
+from ..utils.ui_backend import send_click, send_text, send_key, send_hotkey, get_pyautogui
 from ..models.enums import RegionType, ControlType
 from ..hierarchical_ui_explorer import (
     get_predefined_regions,
+    get_screen_size,
     analyze_ui_hierarchy,
-    visualize_ui_hierarchy
+    render_ui_hierarchy,
+    screenshot_path
 )
 from ..services.ui_tars import UITarsService
 from ..services.verification import VerificationService
@@ -19,6 +39,78 @@ from ..services.macro_recorder import MacroRecorder
 from ..services.macro_player import MacroPlayer
 
 
+# Default verification queries for press_key, keyed by lowercase key name
+KEY_VERIFICATION_QUERIES = {
+    "enter": "form was submitted or action was triggered by pressing Enter",
+    "return": "form was submitted or action was triggered by pressing Enter",
+    "tab": "focus moved to next element or field",
+    "escape": "dialog closed or action was cancelled",
+    "backspace": "text was deleted or removed from input field",
+    "delete": "text was deleted or removed from input field",
+}
+
+# Default verification queries for hot_key, keyed by the set of lowercase key
+# names so that the order the keys are given in does not matter
+HOTKEY_VERIFICATION_QUERIES = {
+    frozenset(combo.split("+")): query
+    for combos, query in (
+        (("ctrl+c", "cmd+c"), "content was copied to clipboard"),
+        (("ctrl+v", "cmd+v"), "content was pasted from clipboard"),
+        (("ctrl+z", "cmd+z"), "last action was undone"),
+        (("ctrl+s", "cmd+s"), "file was saved or save dialog appeared"),
+        (("ctrl+o", "cmd+o"), "open dialog appeared"),
+        (("alt+tab", "cmd+tab"), "application switcher appeared or focus changed"),
+        (("ctrl+a", "cmd+a"), "all content was selected"),
+    )
+    for combo in combos
+}
+
+# Extra modifiers may be held on top of a known shortcut (ctrl+shift+s is still a save)
+HOTKEY_MODIFIERS = frozenset({"ctrl", "shift", "alt", "cmd", "win"})
+
+
+@lru_cache(maxsize=128)
+def hotkey_verification_query(keys: frozenset) -> Optional[str]:
+    """Get the default verification query for a set of lowercase key names.
+
+    An exact match wins; otherwise the largest known shortcut contained in
+    keys is used, provided every other key is a modifier.
+    """
+    query = HOTKEY_VERIFICATION_QUERIES.get(keys)
+    if query is not None:
+        return query
+    
+    best = None
+    for combo, combo_query in HOTKEY_VERIFICATION_QUERIES.items():
+        if combo < keys and keys - combo <= HOTKEY_MODIFIERS:
+            if best is None or len(combo) > len(best[0]):
+                best = (combo, combo_query)
+    return best[1] if best else None
+
+
+# Pillow format name and save options for each ui.screenshot_format value
+SCREENSHOT_FORMATS = {
+    "jpg": ("JPEG", {"quality": 85, "optimize": False}),
+    "jpeg": ("JPEG", {"quality": 85, "optimize": False}),
+    "png": ("PNG", {}),
+}
+
+# Pixels an accessibility element's edges may be off from the position it was found at
+ELEMENT_POSITION_TOLERANCE = 10
+
+
+@lru_cache(maxsize=128)
+def parse_region_string(region: str) -> Tuple[int, int, int, int]:
+    """Parse a "left,top,right,bottom" region string into a tuple."""
+    try:
+        region_coords = tuple(map(int, region.split(',')))
+        if len(region_coords) != 4:
+            raise ValueError("Region must be 4 values: left,top,right,bottom")
+    except Exception as e:
+        raise ValueError(f"Error parsing region: {str(e)}")
+    return region_coords
+
+
 class UIActions:
     """Core UI action implementations."""
     
@@ -28,20 +120,95 @@ class UIActions:
         self.ui_tars_service = ui_tars_service
         self.verification_service = verification_service
         
-        # Initialize macro recorder with screenshot function
-        self.macro_recorder = MacroRecorder(screenshot_function=self.screenshot_ui)
+        # pyautogui still backs scrolling, cursor queries and the non-Windows
+        # input fallback; its implicit per-call PAUSE can be turned off
+        if self.settings.ui.disable_pyautogui_pause:
+            get_pyautogui().PAUSE = 0
+        
+        # Dedicated workers for screenshot and macro file writes, so disk I/O
+        # does not compete with input injection for the default executor
+        self._io_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ui-actions-io")
+        
+        # Long-lived screen capture session, created once instead of per screenshot.
+        # The macro recorder grabs from pynput listener threads, so grabs are serialized
+        self._sct = mss.mss() if MSS_AVAILABLE else None
+        self._sct_lock = threading.Lock()
+        
+        # Initialize macro recorder with screenshot function; raw frames for its
+        # per-event screenshots come from the shared capture session
+        self.macro_recorder = MacroRecorder(
+            screenshot_function=self.screenshot_ui,
+            frame_function=self.screenshot_ui_fast if self._sct is not None else None
+        )
         
         # Initialize macro player with screenshot function and UI-TARS service
         self.macro_player = MacroPlayer(
             screenshot_function=self.screenshot_ui,
             ui_tars_service=self.ui_tars_service
         )
+        
+        # Most recent persisted screenshot as (image_data, image_path, taken_at),
+        # reused as the next action's "before" image while still fresh
+        self._last_screenshot: Optional[Tuple[memoryview, str, float]] = None
+        
+        # Recent UI hierarchy walks: cache key -> (taken_at, hierarchy). Keys
+        # include the foreground window, so switching windows misses the cache
+        self._hierarchy_cache: Dict[Tuple, Tuple[float, List[Dict[str, Any]]]] = {}
+        self.hierarchy_cache_hit = False
+        
+        # Prime the capture and encoding paths once the event loop gets a
+        # chance, so the first recorded or replayed action is not the slow one
+        self._warmed_up = False
+        self._warmup_task = None
+        try:
+            asyncio.get_running_loop().call_soon(self._start_warmup)
+        except RuntimeError:
+            # No loop yet; warmup() can still be awaited explicitly
+            pass
+    
+    def _start_warmup(self) -> None:
+        if not self._warmed_up and self._warmup_task is None:
+            self._warmup_task = asyncio.ensure_future(self.warmup())
+    
+    async def warmup(self) -> Dict[str, Any]:
+        """Prime screen capture, screen-size and region caches, and image encoding."""
+        if self._warmed_up:
+            return {"success": True, "message": "Already warmed up"}
+        
+        try:
+            start = time.perf_counter()
+            get_pyautogui()
+            screen_width, screen_height = get_screen_size()
+            get_predefined_regions()
+            
+            # A 1x1 grab opens the capture handles; encoding a tiny image loads
+            # the PIL encoder plugins used by screenshot_ui
+            if self._sct is not None:
+                with self._sct_lock:
+                    self._sct.grab({"left": 0, "top": 0, "width": 1, "height": 1})
+            extension = self.settings.ui.screenshot_format.lower()
+            image_format, save_options = SCREENSHOT_FORMATS.get(extension, SCREENSHOT_FORMATS["png"])
+            Image.new("RGB", (1, 1)).save(io.BytesIO(), format=image_format, **save_options)
+            
+            self._warmed_up = True
+            return {
+                "success": True,
+                "message": "UI action backends warmed up",
+                "screen_size": {"width": screen_width, "height": screen_height},
+                "duration": time.perf_counter() - start
+            }
+        except Exception as e:
+            self.logger.warning(f"Warmup failed: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Warmup failed: {str(e)}"
+            }
     
     async def get_cursor_position(self) -> Dict[str, Any]:
         """Get the current position of the mouse cursor."""
         try:
-            x, y = pyautogui.position()
-            screen_width, screen_height = pyautogui.size()
+            x, y = get_pyautogui().position()
+            screen_width, screen_height = get_screen_size()
             
             return {
                 "success": True,
@@ -64,55 +231,244 @@ class UIActions:
         output_prefix: str = None,
         min_size: int = 20,
         max_depth: int = 4,
-        focus_only: bool = True
-    ) -> Tuple[bytes, str, Dict[str, Any]]:
-        """Take a screenshot with UI elements highlighted."""
+        focus_only: bool = True,
+        keep_in_memory: bool = False
+    ) -> Tuple[memoryview, Optional[str], Dict[str, Any]]:
+        """Take a screenshot with UI elements highlighted.
+        
+        The image, encoded as configured by ui.screenshot_format, is returned
+        as a memoryview. With keep_in_memory the
+        image is not written to disk and the returned path is None.
+        """
         output_prefix = output_prefix or self.settings.ui.screenshot_prefix
         
         # Parse region
         region_coords = None
         if region:
+            # RegionType members are str, so both forms resolve by plain string
+            # lookup; predefined regions include "screen"
+            region_name = region.lower()
             predefined_regions = get_predefined_regions()
-            if isinstance(region, RegionType):
-                if region == RegionType.SCREEN:
-                    screen_width, screen_height = pyautogui.size()
-                    region_coords = (0, 0, screen_width, screen_height)
-                elif region.value in predefined_regions:
-                    region_coords = predefined_regions[region.value]
-                else:
-                    raise ValueError(f"Unknown region: {region.value}")
-            elif isinstance(region, str):
-                if region.lower() in predefined_regions:
-                    region_coords = predefined_regions[region.lower()]
-                elif region.lower() == "screen":
-                    screen_width, screen_height = pyautogui.size()
-                    region_coords = (0, 0, screen_width, screen_height)
-                else:
-                    try:
-                        region_coords = tuple(map(int, region.split(',')))
-                        if len(region_coords) != 4:
-                            raise ValueError("Region must be 4 values: left,top,right,bottom")
-                    except Exception as e:
-                        raise ValueError(f"Error parsing region: {str(e)}")
+            if region_name in predefined_regions:
+                region_coords = predefined_regions[region_name]
+            else:
+                region_coords = parse_region_string(region)
         
         # Analyze UI elements - more selective by default
+        ui_hierarchy = self._analyze_ui_hierarchy_cached(region_coords, max_depth, focus_only, min_size)
+        
+        # Capture the primary screen (hierarchy positions are absolute) and
+        # draw the hierarchy over it, then encode in memory
+        screenshot = None
+        if self._sct is not None:
+            with self._sct_lock:
+                sct_img = self._sct.grab(self._sct.monitors[1])
+            screenshot = Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
+        image = render_ui_hierarchy(ui_hierarchy, highlight_levels, screenshot)
+        extension = self.settings.ui.screenshot_format.lower()
+        if extension not in SCREENSHOT_FORMATS:
+            extension = "png"
+        image_format, save_options = SCREENSHOT_FORMATS[extension]
+        if image_format == "JPEG" and image.mode != "RGB":
+            image = image.convert("RGB")
+        buffer = io.BytesIO()
+        image.save(buffer, format=image_format, **save_options)
+        image_data = buffer.getbuffer()
+        
+        # Write the file on the I/O pool only when a path is wanted, reading
+        # the cursor position while the write is in flight
+        image_path = None
+        write = None
+        if not keep_in_memory:
+            image_path = screenshot_path(output_prefix, extension)
+            write = asyncio.get_running_loop().run_in_executor(
+                self._io_executor, self._write_image, image_path, image_data
+            )
+        
+        cursor_position = await self.get_cursor_position()
+        if write is not None:
+            await write
+            self._last_screenshot = (image_data, image_path, time.time())
+        
+        # Return both the image data and path
+        return (image_data, image_path, cursor_position)
+    
+    def screenshot_ui_fast(self, region: Optional[Tuple[int, int, int, int]] = None) -> memoryview:
+        """Grab raw BGRA pixels of the primary screen or a (left, top, right, bottom) region.
+        
+        Nothing is encoded or written. The returned memoryview has shape
+        (height, width, 4) and wraps the grabbed frame without copying; each
+        call returns a new frame. Safe to call from any thread.
+        """
+        if self._sct is None:
+            raise RuntimeError("Fast screenshots require the mss package")
+        
+        if region is None:
+            monitor = self._sct.monitors[1]
+        else:
+            left, top, right, bottom = region
+            monitor = {"left": left, "top": top, "width": right - left, "height": bottom - top}
+        with self._sct_lock:
+            sct_img = self._sct.grab(monitor)
+        width, height = sct_img.size
+        return memoryview(sct_img.raw).cast("B", (height, width, 4))
+    
+    def _analyze_ui_hierarchy_cached(
+        self,
+        region: Optional[Tuple[int, int, int, int]],
+        max_depth: int,
+        focus_only: bool,
+        min_size: int
+    ) -> List[Dict[str, Any]]:
+        """Walk the UI hierarchy, reusing a recent walk of the same window and region.
+        
+        Sets hierarchy_cache_hit so callers can tell whether the UI was re-read.
+        """
+        foreground = win32gui.GetForegroundWindow() if WIN32GUI_AVAILABLE else None
+        key = (foreground, region, max_depth, focus_only, min_size)
+        now = time.monotonic()
+        ttl = self.settings.ui.hierarchy_cache_ttl
+        
+        cached = self._hierarchy_cache.get(key)
+        if cached is not None and now - cached[0] < ttl:
+            self.hierarchy_cache_hit = True
+            return cached[1]
+        
+        # Only input actions clear the cache, so drop expired walks here to keep
+        # screenshot-only sessions from accumulating one per window and region
+        for stale in [k for k, (walked_at, _) in self._hierarchy_cache.items() if now - walked_at >= ttl]:
+            del self._hierarchy_cache[stale]
+        
         ui_hierarchy = analyze_ui_hierarchy(
-            region=region_coords,
+            region=region,
             max_depth=max_depth,
             focus_only=focus_only,
             min_size=min_size,
             visible_only=True
-        )   
+        )
+        self._hierarchy_cache[key] = (now, ui_hierarchy)
+        self.hierarchy_cache_hit = False
+        return ui_hierarchy
+    
+    def _invalidate_screen_caches(self) -> None:
+        """Forget cached screenshots and hierarchies once the UI is about to change."""
+        self._last_screenshot = None
+        self._hierarchy_cache.clear()
+    
+    async def _before_screenshot(self, output_prefix: str) -> Optional[str]:
+        """Get a "before" image path, reusing the last screenshot if recent enough."""
+        if self._last_screenshot is not None:
+            age = time.time() - self._last_screenshot[2]
+            if age < self.settings.ui.before_screenshot_ttl:
+                return self._last_screenshot[1]
         
-        # Create visualization
-        image_path = visualize_ui_hierarchy(ui_hierarchy, output_prefix, highlight_levels)
+        try:
+            _, image_path, _ = await self.screenshot_ui(output_prefix=output_prefix)
+            return image_path
+        except Exception as e:
+            self.logger.warning(f"Failed to take before screenshot: {str(e)}")
+            return None
+    
+    def _wants_before_screenshot(self, auto_verify: bool, skip_before_screenshot: bool) -> bool:
+        """Whether an action should capture a "before" image for verification."""
+        return (
+            auto_verify
+            and not skip_before_screenshot
+            and self.verification_service.requires_comparison_image()
+        )
+    
+    async def _wait_before_action(self, delay: float, take_screenshot: bool, output_prefix: str) -> Optional[str]:
+        """Wait before an action, taking the "before" screenshot during the wait."""
+        before_task = None
+        if take_screenshot:
+            before_task = asyncio.create_task(self._before_screenshot(output_prefix))
         
-        # Load the image and return it
-        with open(image_path, 'rb') as f:
-            image_data = f.read()
+        if delay > 0:
+            await asyncio.sleep(delay)
         
-        # Return both the image data and path
-        return (image_data, image_path, await self.get_cursor_position())
+        # The screenshot must be complete before any input is sent
+        return await before_task if before_task is not None else None
+    
+    @staticmethod
+    def _write_image(image_path: str, image_data: memoryview) -> None:
+        """Write encoded image bytes to disk."""
+        with open(image_path, 'wb') as f:
+            f.write(image_data)
+    
+    async def _run_with_verification(
+        self,
+        action: Callable[[], Any],
+        result: Dict[str, Any],
+        failure_message: str,
+        action_description: str,
+        expected_result: str,
+        action_noun: str,
+        verification_query: str,
+        auto_verify: bool,
+        verification_timeout: float,
+        before_image_path: Optional[str]
+    ) -> Dict[str, Any]:
+        """Inject an input action, then auto-verify its effect if enabled.
+        
+        A plain callable is run in a worker thread; a coroutine function is
+        awaited directly.
+        """
+        try:
+            # Anything captured before this point no longer reflects the screen
+            self._invalidate_screen_caches()
+            if asyncio.iscoroutinefunction(action):
+                await action()
+            else:
+                await asyncio.to_thread(action)
+        except Exception as e:
+            self.logger.error(f"{failure_message}: {str(e)}")
+            return {
+                "success": False,
+                "error": f"{failure_message}: {str(e)}",
+                "auto_verification": {"enabled": auto_verify, "verification_passed": False}
+            }
+        
+        if not auto_verify:
+            result["auto_verification"] = {"enabled": False}
+            return result
+        
+        try:
+            verification_result = await self.verification_service.verify_action(
+                action_description=action_description,
+                expected_result=expected_result,
+                verification_query=verification_query,
+                timeout=verification_timeout,
+                comparison_image=before_image_path,
+                screenshot_function=self.screenshot_ui
+            )
+            
+            # Add verification results to the response
+            result["auto_verification"] = {
+                "enabled": True,
+                "verification_passed": verification_result.get("verification_passed", False),
+                "verification_details": verification_result.get("verification_details", {}),
+                "verification_screenshot": verification_result.get("verification_screenshot"),
+                "verification_query": verification_query,
+                "before_screenshot": before_image_path
+            }
+            
+            # Update success status based on verification
+            if not verification_result.get("verification_passed", False):
+                result["message"] += f" (WARNING: Auto-verification failed - {action_noun} may not have had expected effect)"
+            else:
+                result["message"] += " (Auto-verification: SUCCESS)"
+                
+        except Exception as e:
+            result["auto_verification"] = {
+                "enabled": True,
+                "verification_passed": False,
+                "error": f"Verification failed: {str(e)}",
+                "verification_query": verification_query,
+                "before_screenshot": before_image_path
+            }
+            result["message"] += f" (Auto-verification error: {str(e)})"
+        
+        return result
     
     async def click_ui_element(
         self,
@@ -122,97 +478,46 @@ class UIActions:
         normalized: bool = False,
         auto_verify: bool = None,
         verification_query: Optional[str] = None,
-        verification_timeout: float = None
+        verification_timeout: float = None,
+        skip_before_screenshot: bool = False
     ) -> Dict[str, Any]:
         """Click at specific coordinates with optional automatic verification."""
-        wait_time = wait_time or self.settings.ui.default_wait_time
+        wait_time = wait_time if wait_time is not None else self.settings.ui.default_wait_time
         auto_verify = auto_verify if auto_verify is not None else self.settings.ui.auto_verify
         verification_timeout = verification_timeout or self.settings.ui.default_verification_timeout
         
-        # Convert coordinates
-        coord_info = CoordinateConverter.create_coordinate_info(x, y, normalized)
+        # Convert coordinates; absolute input needs no screen-size lookup
+        if normalized:
+            coord_info = CoordinateConverter.create_coordinate_info(x, y, normalized)
+        else:
+            coord_info = CoordinateConverter.absolute_only(x, y)
         abs_x = coord_info["coordinates"]["absolute"]["x"]
         abs_y = coord_info["coordinates"]["absolute"]["y"]
         
-        # Take a before screenshot if auto-verification is enabled
-        before_image_path = None
-        if auto_verify:
-            try:
-                _, before_image_path, _ = await self.screenshot_ui(
-                    output_prefix="before_click"
-                )
-            except Exception as e:
-                self.logger.warning(f"Failed to take before screenshot: {str(e)}")
-                before_image_path = None
-        
-        # Wait before clicking
-        time.sleep(wait_time)
+        # Wait before clicking, taking the before screenshot meanwhile
+        before_image_path = await self._wait_before_action(
+            wait_time,
+            self._wants_before_screenshot(auto_verify, skip_before_screenshot),
+            "before_click"
+        )
         
-        try:
-            pyautogui.click(abs_x, abs_y)
-            
-            # Base result
-            result = {
+        return await self._run_with_verification(
+            lambda: send_click(abs_x, abs_y),
+            result={
                 "success": True,
                 "message": f"Clicked at {coord_info['input']['type']} coordinates ({x}, {y}) -> absolute ({abs_x}, {abs_y})",
                 "coordinates": coord_info["coordinates"],
                 "wait_time": wait_time
-            }
-            
-            # Perform automatic verification if enabled
-            if auto_verify:
-                try:
-                    # Generate verification query if not provided
-                    if not verification_query:
-                        verification_query = f"UI change or response from clicking at coordinates ({abs_x}, {abs_y})"
-                    
-                    # Perform verification
-                    verification_result = await self.verification_service.verify_action(
-                        action_description=f"Clicked at {coord_info['input']['type']} coordinates ({x}, {y})",
-                        expected_result="UI should respond to the click action",
-                        verification_query=verification_query,
-                        timeout=verification_timeout,
-                        comparison_image=before_image_path,
-                        screenshot_function=self.screenshot_ui
-                    )
-                    
-                    # Add verification results to the response
-                    result["auto_verification"] = {
-                        "enabled": True,
-                        "verification_passed": verification_result.get("verification_passed", False),
-                        "verification_details": verification_result.get("verification_details", {}),
-                        "verification_screenshot": verification_result.get("verification_screenshot"),
-                        "verification_query": verification_query,
-                        "before_screenshot": before_image_path
-                    }
-                    
-                    # Update success status based on verification
-                    if not verification_result.get("verification_passed", False):
-                        result["message"] += " (WARNING: Auto-verification failed - click may not have had expected effect)"
-                    else:
-                        result["message"] += " (Auto-verification: SUCCESS)"
-                        
-                except Exception as e:
-                    result["auto_verification"] = {
-                        "enabled": True,
-                        "verification_passed": False,
-                        "error": f"Verification failed: {str(e)}",
-                        "verification_query": verification_query,
-                        "before_screenshot": before_image_path
-                    }
-                    result["message"] += f" (Auto-verification error: {str(e)})"
-            else:
-                result["auto_verification"] = {"enabled": False}
-            
-            return result
-            
-        except Exception as e:
-            self.logger.error(f"Failed to click: {str(e)}")
-            return {
-                "success": False,
-                "error": f"Failed to click at coordinates ({x}, {y}): {str(e)}",
-                "auto_verification": {"enabled": auto_verify, "verification_passed": False}
-            }
+            },
+            failure_message=f"Failed to click at coordinates ({x}, {y})",
+            action_description=f"Clicked at {coord_info['input']['type']} coordinates ({x}, {y})",
+            expected_result="UI should respond to the click action",
+            action_noun="click",
+            verification_query=verification_query or f"UI change or response from clicking at coordinates ({abs_x}, {abs_y})",
+            auto_verify=auto_verify,
+            verification_timeout=verification_timeout,
+            before_image_path=before_image_path
+        )
     
     async def keyboard_input(
         self,
@@ -222,99 +527,48 @@ class UIActions:
         press_enter: bool = False,
         auto_verify: bool = None,
         verification_query: Optional[str] = None,
-        verification_timeout: float = None
+        verification_timeout: float = None,
+        skip_before_screenshot: bool = False
     ) -> Dict[str, Any]:
         """Send keyboard input to the active window with optional automatic verification."""
         auto_verify = auto_verify if auto_verify is not None else self.settings.ui.auto_verify
         verification_timeout = verification_timeout or self.settings.ui.default_verification_timeout
         
-        # Take a before screenshot if auto-verification is enabled
-        before_image_path = None
-        if auto_verify:
-            try:
-                _, before_image_path, _ = await self.screenshot_ui(
-                    output_prefix="before_typing"
-                )
-            except Exception as e:
-                self.logger.warning(f"Failed to take before screenshot: {str(e)}")
-                before_image_path = None
+        # Wait before typing, taking the before screenshot meanwhile
+        before_image_path = await self._wait_before_action(
+            delay,
+            self._wants_before_screenshot(auto_verify, skip_before_screenshot),
+            "before_typing"
+        )
         
-        # Wait before typing
-        time.sleep(delay)
+        def type_text():
+            send_text(text, interval)
+            if press_enter:
+                send_key('enter')
         
-        try:
-            # Type the text
-            pyautogui.write(text, interval=interval)
-            
-            # Press Enter if requested
+        if not verification_query:
             if press_enter:
-                pyautogui.press('enter')
-            
-            # Base result
-            result = {
+                verification_query = f"text '{text}' was entered and form was submitted or action was triggered"
+            else:
+                verification_query = f"text '{text}' appears in the input field or text area"
+        
+        return await self._run_with_verification(
+            type_text,
+            result={
                 "success": True,
                 "message": f"Typed text: '{text}'" + (" and pressed Enter" if press_enter else ""),
                 "text": text,
                 "press_enter": press_enter
-            }
-            
-            # Perform automatic verification if enabled
-            if auto_verify:
-                try:
-                    # Generate verification query if not provided
-                    if not verification_query:
-                        if press_enter:
-                            verification_query = f"text '{text}' was entered and form was submitted or action was triggered"
-                        else:
-                            verification_query = f"text '{text}' appears in the input field or text area"
-                    
-                    # Perform verification
-                    verification_result = await self.verification_service.verify_action(
-                        action_description=f"Typed text '{text}'" + (" and pressed Enter" if press_enter else ""),
-                        expected_result="Text should appear in the UI or trigger expected action",
-                        verification_query=verification_query,
-                        timeout=verification_timeout,
-                        comparison_image=before_image_path,
-                        screenshot_function=self.screenshot_ui
-                    )
-                    
-                    # Add verification results to the response
-                    result["auto_verification"] = {
-                        "enabled": True,
-                        "verification_passed": verification_result.get("verification_passed", False),
-                        "verification_details": verification_result.get("verification_details", {}),
-                        "verification_screenshot": verification_result.get("verification_screenshot"),
-                        "verification_query": verification_query,
-                        "before_screenshot": before_image_path
-                    }
-                    
-                    # Update success status based on verification
-                    if not verification_result.get("verification_passed", False):
-                        result["message"] += " (WARNING: Auto-verification failed - typing may not have had expected effect)"
-                    else:
-                        result["message"] += " (Auto-verification: SUCCESS)"
-                        
-                except Exception as e:
-                    result["auto_verification"] = {
-                        "enabled": True,
-                        "verification_passed": False,
-                        "error": f"Verification failed: {str(e)}",
-                        "verification_query": verification_query,
-                        "before_screenshot": before_image_path
-                    }
-                    result["message"] += f" (Auto-verification error: {str(e)})"
-            else:
-                result["auto_verification"] = {"enabled": False}
-            
-            return result
-            
-        except Exception as e:
-            self.logger.error(f"Failed to type text: {str(e)}")
-            return {
-                "success": False,
-                "error": f"Failed to type text: {str(e)}",
-                "auto_verification": {"enabled": auto_verify, "verification_passed": False}
-            }
+            },
+            failure_message="Failed to type text",
+            action_description=f"Typed text '{text}'" + (" and pressed Enter" if press_enter else ""),
+            expected_result="Text should appear in the UI or trigger expected action",
+            action_noun="typing",
+            verification_query=verification_query,
+            auto_verify=auto_verify,
+            verification_timeout=verification_timeout,
+            before_image_path=before_image_path
+        )
     
     async def press_key(
         self,
@@ -324,101 +578,46 @@ class UIActions:
         interval: float = 0.0,
         auto_verify: bool = None,
         verification_query: Optional[str] = None,
-        verification_timeout: float = None
+        verification_timeout: float = None,
+        skip_before_screenshot: bool = False
     ) -> Dict[str, Any]:
         """Press a specific keyboard key with optional automatic verification."""
         auto_verify = auto_verify if auto_verify is not None else self.settings.ui.auto_verify
         verification_timeout = verification_timeout or self.settings.ui.default_verification_timeout
         
-        # Take a before screenshot if auto-verification is enabled
-        before_image_path = None
-        if auto_verify:
-            try:
-                _, before_image_path, _ = await self.screenshot_ui(
-                    output_prefix="before_keypress"
-                )
-            except Exception as e:
-                self.logger.warning(f"Failed to take before screenshot: {str(e)}")
-                before_image_path = None
+        # Wait before pressing, taking the before screenshot meanwhile
+        before_image_path = await self._wait_before_action(
+            delay,
+            self._wants_before_screenshot(auto_verify, skip_before_screenshot),
+            "before_keypress"
+        )
         
-        # Wait before pressing
-        time.sleep(delay)
+        async def press_repeatedly():
+            # Space out repeated presses without holding a worker thread asleep
+            for press in range(presses):
+                if press:
+                    await asyncio.sleep(interval)
+                await asyncio.to_thread(send_key, key)
         
-        try:
-            # Press the key the specified number of times
-            pyautogui.press(key, presses=presses, interval=interval)
-            
-            # Base result
-            result = {
+        return await self._run_with_verification(
+            press_repeatedly if interval > 0 and presses > 1 else lambda: send_key(key, presses),
+            result={
                 "success": True,
                 "message": f"Pressed key '{key}' {presses} time(s)",
                 "key": key,
                 "presses": presses
-            }
-            
-            # Perform automatic verification if enabled
-            if auto_verify:
-                try:
-                    # Generate verification query if not provided
-                    if not verification_query:
-                        if key.lower() in ['enter', 'return']:
-                            verification_query = "form was submitted or action was triggered by pressing Enter"
-                        elif key.lower() == 'tab':
-                            verification_query = "focus moved to next element or field"
-                        elif key.lower() == 'escape':
-                            verification_query = "dialog closed or action was cancelled"
-                        elif key.lower() in ['backspace', 'delete']:
-                            verification_query = "text was deleted or removed from input field"
-                        else:
-                            verification_query = f"UI responded to pressing the '{key}' key"
-                    
-                    # Perform verification
-                    verification_result = await self.verification_service.verify_action(
-                        action_description=f"Pressed key '{key}' {presses} time(s)",
-                        expected_result=f"UI should respond to the '{key}' key press",
-                        verification_query=verification_query,
-                        timeout=verification_timeout,
-                        comparison_image=before_image_path,
-                        screenshot_function=self.screenshot_ui
-                    )
-                    
-                    # Add verification results to the response
-                    result["auto_verification"] = {
-                        "enabled": True,
-                        "verification_passed": verification_result.get("verification_passed", False),
-                        "verification_details": verification_result.get("verification_details", {}),
-                        "verification_screenshot": verification_result.get("verification_screenshot"),
-                        "verification_query": verification_query,
-                        "before_screenshot": before_image_path
-                    }
-                    
-                    # Update success status based on verification
-                    if not verification_result.get("verification_passed", False):
-                        result["message"] += " (WARNING: Auto-verification failed - key press may not have had expected effect)"
-                    else:
-                        result["message"] += " (Auto-verification: SUCCESS)"
-                        
-                except Exception as e:
-                    result["auto_verification"] = {
-                        "enabled": True,
-                        "verification_passed": False,
-                        "error": f"Verification failed: {str(e)}",
-                        "verification_query": verification_query,
-                        "before_screenshot": before_image_path
-                    }
-                    result["message"] += f" (Auto-verification error: {str(e)})"
-            else:
-                result["auto_verification"] = {"enabled": False}
-            
-            return result
-            
-        except Exception as e:
-            self.logger.error(f"Failed to press key: {str(e)}")
-            return {
-                "success": False,
-                "error": f"Failed to press key: {str(e)}",
-                "auto_verification": {"enabled": auto_verify, "verification_passed": False}
-            }
+            },
+            failure_message="Failed to press key",
+            action_description=f"Pressed key '{key}' {presses} time(s)",
+            expected_result=f"UI should respond to the '{key}' key press",
+            action_noun="key press",
+            verification_query=verification_query or KEY_VERIFICATION_QUERIES.get(
+                key.lower(), f"UI responded to pressing the '{key}' key"
+            ),
+            auto_verify=auto_verify,
+            verification_timeout=verification_timeout,
+            before_image_path=before_image_path
+        )
     
     async def hot_key(
         self,
@@ -426,110 +625,43 @@ class UIActions:
         delay: float = 0.1,
         auto_verify: bool = None,
         verification_query: Optional[str] = None,
-        verification_timeout: float = None
+        verification_timeout: float = None,
+        skip_before_screenshot: bool = False
     ) -> Dict[str, Any]:
         """Press a keyboard shortcut (multiple keys together) with optional automatic verification."""
         auto_verify = auto_verify if auto_verify is not None else self.settings.ui.auto_verify
         verification_timeout = verification_timeout or self.settings.ui.default_verification_timeout
         
-        # Take a before screenshot if auto-verification is enabled
-        before_image_path = None
-        if auto_verify:
-            try:
-                _, before_image_path, _ = await self.screenshot_ui(
-                    output_prefix="before_hotkey"
-                )
-            except Exception as e:
-                self.logger.warning(f"Failed to take before screenshot: {str(e)}")
-                before_image_path = None
+        # Wait before pressing, taking the before screenshot meanwhile
+        before_image_path = await self._wait_before_action(
+            delay,
+            self._wants_before_screenshot(auto_verify, skip_before_screenshot),
+            "before_hotkey"
+        )
         
-        # Wait before pressing
-        time.sleep(delay)
+        # Format the key combination for the message
+        key_combo = "+".join(keys)
         
-        try:
-            # Press the keys together
-            pyautogui.hotkey(*keys)
-            
-            # Format the key combination for the message
-            key_combo = "+".join(keys)
-            
-            # Base result
-            result = {
+        return await self._run_with_verification(
+            lambda: send_hotkey(keys),
+            result={
                 "success": True,
                 "message": f"Pressed keyboard shortcut: {key_combo}",
                 "keys": keys
-            }
-            
-            # Perform automatic verification if enabled
-            if auto_verify:
-                try:
-                    # Generate verification query if not provided
-                    if not verification_query:
-                        key_combo_lower = key_combo.lower()
-                        if 'ctrl+c' in key_combo_lower or 'cmd+c' in key_combo_lower:
-                            verification_query = "content was copied to clipboard"
-                        elif 'ctrl+v' in key_combo_lower or 'cmd+v' in key_combo_lower:
-                            verification_query = "content was pasted from clipboard"
-                        elif 'ctrl+z' in key_combo_lower or 'cmd+z' in key_combo_lower:
-                            verification_query = "last action was undone"
-                        elif 'ctrl+s' in key_combo_lower or 'cmd+s' in key_combo_lower:
-                            verification_query = "file was saved or save dialog appeared"
-                        elif 'ctrl+o' in key_combo_lower or 'cmd+o' in key_combo_lower:
-                            verification_query = "open dialog appeared"
-                        elif 'alt+tab' in key_combo_lower or 'cmd+tab' in key_combo_lower:
-                            verification_query = "application switcher appeared or focus changed"
-                        elif 'ctrl+a' in key_combo_lower or 'cmd+a' in key_combo_lower:
-                            verification_query = "all content was selected"
-                        else:
-                            verification_query = f"UI responded to the {key_combo} keyboard shortcut"
-                    
-                    # Perform verification
-                    verification_result = await self.verification_service.verify_action(
-                        action_description=f"Pressed keyboard shortcut: {key_combo}",
-                        expected_result=f"UI should respond to the {key_combo} shortcut",
-                        verification_query=verification_query,
-                        timeout=verification_timeout,
-                        comparison_image=before_image_path,
-                        screenshot_function=self.screenshot_ui
-                    )
-                    
-                    # Add verification results to the response
-                    result["auto_verification"] = {
-                        "enabled": True,
-                        "verification_passed": verification_result.get("verification_passed", False),
-                        "verification_details": verification_result.get("verification_details", {}),
-                        "verification_screenshot": verification_result.get("verification_screenshot"),
-                        "verification_query": verification_query,
-                        "before_screenshot": before_image_path
-                    }
-                    
-                    # Update success status based on verification
-                    if not verification_result.get("verification_passed", False):
-                        result["message"] += " (WARNING: Auto-verification failed - hotkey may not have had expected effect)"
-                    else:
-                        result["message"] += " (Auto-verification: SUCCESS)"
-                        
-                except Exception as e:
-                    result["auto_verification"] = {
-                        "enabled": True,
-                        "verification_passed": False,
-                        "error": f"Verification failed: {str(e)}",
-                        "verification_query": verification_query,
-                        "before_screenshot": before_image_path
-                    }
-                    result["message"] += f" (Auto-verification error: {str(e)})"
-            else:
-                result["auto_verification"] = {"enabled": False}
-            
-            return result
-            
-        except Exception as e:
-            self.logger.error(f"Failed to press hotkey: {str(e)}")
-            return {
-                "success": False,
-                "error": f"Failed to press hotkey: {str(e)}",
-                "auto_verification": {"enabled": auto_verify, "verification_passed": False}
-            }
+            },
+            failure_message="Failed to press hotkey",
+            action_description=f"Pressed keyboard shortcut: {key_combo}",
+            expected_result=f"UI should respond to the {key_combo} shortcut",
+            action_noun="hotkey",
+            verification_query=(
+                verification_query
+                or hotkey_verification_query(frozenset(key.lower() for key in keys))
+                or f"UI responded to the {key_combo} keyboard shortcut"
+            ),
+            auto_verify=auto_verify,
+            verification_timeout=verification_timeout,
+            before_image_path=before_image_path
+        )
     
     # Macro recording methods
     
@@ -572,9 +704,10 @@ class UIActions:
     ) -> Dict[str, Any]:
         """Stop recording and optionally save the macro."""
         try:
-            result = self.macro_recorder.stop_recording(
-                save_macro=save_macro,
-                output_format=output_format
+            # Saving writes the macro package and ZIP; keep it off the event loop
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._io_executor,
+                partial(self.macro_recorder.stop_recording, save_macro=save_macro, output_format=output_format)
             )
             
             if result["success"]:
@@ -669,7 +802,7 @@ class UIActions:
             region = None
             if focus_only:
                 # Use full screen but only focus window
-                screen_width, screen_height = pyautogui.size()
+                screen_width, screen_height = get_screen_size()
                 region = (0, 0, screen_width, screen_height)
             
             ui_hierarchy = analyze_ui_hierarchy(
@@ -682,6 +815,9 @@ class UIActions:
             
             # Flatten hierarchy and apply filters
             matching_elements = []
+            text_lower = text.lower() if text else None
+            automation_id_lower = automation_id.lower() if automation_id else None
+            class_name_lower = class_name.lower() if class_name else None
             
             def search_element(element, path="", depth=0):
                 """Recursively search through element hierarchy."""
@@ -693,19 +829,19 @@ class UIActions:
                     matches = False
                 
                 # Text filter (case-insensitive partial match)
-                if text and text.lower() not in element.get('text', '').lower():
+                if text_lower and text_lower not in element.get('text', '').lower():
                     matches = False
                 
                 # Automation ID filter
-                if automation_id:
+                if automation_id_lower:
                     elem_auto_id = element.get('properties', {}).get('automation_id', '')
-                    if automation_id.lower() not in elem_auto_id.lower():
+                    if automation_id_lower not in elem_auto_id.lower():
                         matches = False
                 
                 # Class name filter
-                if class_name:
+                if class_name_lower:
                     elem_class = element.get('properties', {}).get('class_name', '')
-                    if class_name.lower() not in elem_class.lower():
+                    if class_name_lower not in elem_class.lower():
                         matches = False
                 
                 if matches:
@@ -719,7 +855,7 @@ class UIActions:
                     center_x = (pos['left'] + pos['right']) / 2
                     center_y = (pos['top'] + pos['bottom']) / 2
                     
-                    screen_width, screen_height = pyautogui.size()
+                    screen_width, screen_height = get_screen_size()
                     element_copy['click_coordinates'] = {
                         "absolute": {"x": int(center_x), "y": int(center_y)},
                         "normalized": {"x": center_x / screen_width, "y": center_y / screen_height}
@@ -765,10 +901,11 @@ class UIActions:
         wait_time: float = None,
         auto_verify: bool = None,
         verification_query: Optional[str] = None,
-        verification_timeout: float = None
+        verification_timeout: float = None,
+        skip_before_screenshot: bool = False
     ) -> Dict[str, Any]:
         """Click on a UI element using accessibility APIs, with coordinate fallback."""
-        wait_time = wait_time or self.settings.ui.default_wait_time
+        wait_time = wait_time if wait_time is not None else self.settings.ui.default_wait_time
         auto_verify = auto_verify if auto_verify is not None else self.settings.ui.auto_verify
         verification_timeout = verification_timeout or self.settings.ui.default_verification_timeout
         
@@ -802,39 +939,27 @@ class UIActions:
             
             target_element = find_result["elements"][element_index]
             
-            # Take a before screenshot if auto-verification is enabled
-            before_image_path = None
-            if auto_verify:
-                try:
-                    _, before_image_path, _ = await self.screenshot_ui(
-                        output_prefix="before_accessibility_click"
-                    )
-                except Exception as e:
-                    self.logger.warning(f"Failed to take before screenshot: {str(e)}")
-                    before_image_path = None
-            
-            # Wait before clicking
-            time.sleep(wait_time)
+            # Wait before clicking, taking the before screenshot meanwhile
+            before_image_path = await self._wait_before_action(
+                wait_time,
+                self._wants_before_screenshot(auto_verify, skip_before_screenshot),
+                "before_accessibility_click"
+            )
             
             # Try to click using accessibility API first
+            self._invalidate_screen_caches()
             accessibility_success = False
             error_msg = ""
             
             try:
                 # Attempt to find and click the actual pywinauto element
-                from pywinauto import Desktop
-                desktop = Desktop(backend="uia")
+                from ..hierarchical_ui_explorer import get_all_windows
                 
                 # Try to find the element using the accessibility API
                 found_element = None
                 
                 # Get windows to search
-                if find_result["search_criteria"]["focus_only"]:
-                    import win32gui
-                    foreground_hwnd = win32gui.GetForegroundWindow()
-                    windows = [w for w in desktop.windows() if w.handle == foreground_hwnd and w.is_visible()]
-                else:
-                    windows = [w for w in desktop.windows() if w.is_visible()]
+                windows = get_all_windows(find_result["search_criteria"]["focus_only"])
                 
                 # Search for the element using hierarchy path or properties
                 for window in windows:
@@ -875,8 +1000,15 @@ class UIActions:
                     verification_timeout=verification_timeout
                 )
             
-            # Determine overall success
-            overall_success = accessibility_success or (coordinate_result and coordinate_result.get("success", False))
+            # Determine overall success and the method that succeeded, once
+            coordinate_success = bool(coordinate_result and coordinate_result.get("success", False))
+            overall_success = accessibility_success or coordinate_success
+            if accessibility_success:
+                click_method = "accessibility"
+            elif coordinate_success:
+                click_method = "coordinates"
+            else:
+                click_method = "failed"
             
             # Build result
             result = {
@@ -889,10 +1021,10 @@ class UIActions:
                 },
                 "coordinate_fallback": {
                     "attempted": not accessibility_success and fallback_to_coordinates,
-                    "success": coordinate_result.get("success", False) if coordinate_result else False,
+                    "success": coordinate_success,
                     "result": coordinate_result if coordinate_result else None
                 },
-                "click_method": "accessibility" if accessibility_success else ("coordinates" if coordinate_result and coordinate_result.get("success", False) else "failed"),
+                "click_method": click_method,
                 "wait_time": wait_time
             }
             
@@ -953,57 +1085,73 @@ class UIActions:
     
     def _find_element_in_window(self, window, target_element, control_type, text, automation_id, class_name):
         """Find a specific element within a window using pywinauto."""
+        text_lower = text.lower() if text else None
+        automation_id_lower = automation_id.lower() if automation_id else None
+        class_name_lower = class_name.lower() if class_name else None
+        
         try:
+            target_pos = target_element['position']
+            target_left = target_pos['left'] + ELEMENT_POSITION_TOLERANCE
+            target_top = target_pos['top'] + ELEMENT_POSITION_TOLERANCE
+            target_right = target_pos['right'] - ELEMENT_POSITION_TOLERANCE
+            target_bottom = target_pos['bottom'] - ELEMENT_POSITION_TOLERANCE
+            
             def search_recursively(element, depth=0, max_depth=10):
                 if depth > max_depth:
                     return None
                 
                 try:
+                    try:
+                        rect = element.rectangle()
+                    except Exception:
+                        rect = None
+                    
+                    # Elements nest inside their parents, so nothing below an element
+                    # that does not cover the target position can be the target
+                    if (rect is not None and rect.right > rect.left and rect.bottom > rect.top and
+                            not (rect.left <= target_left and rect.top <= target_top and
+                                 rect.right >= target_right and rect.bottom >= target_bottom)):
+                        return None
+                    
                     # Check if current element matches
-                    element_control_type = element.element_info.control_type if hasattr(element, 'element_info') else ''
-                    element_text = ''
-                    if hasattr(element, 'window_text') and callable(element.window_text):
-                        element_text = element.window_text()
+                    info = getattr(element, 'element_info', None)
+                    element_control_type = getattr(info, 'control_type', '')
+                    element_automation_id = getattr(info, 'automation_id', '')
+                    element_class_name = getattr(info, 'class_name', '')
                     
-                    element_automation_id = ''
-                    element_class_name = ''
-                    if hasattr(element, 'element_info'):
-                        element_automation_id = getattr(element.element_info, 'automation_id', '')
-                        element_class_name = getattr(element.element_info, 'class_name', '')
+                    try:
+                        element_text = element.window_text()
+                    except AttributeError:
+                        element_text = ''
                     
                     # Check if this element matches our criteria
                     matches = True
                     if control_type and element_control_type != control_type:
                         matches = False
-                    if text and text.lower() not in element_text.lower():
+                    if text_lower and text_lower not in element_text.lower():
                         matches = False
-                    if automation_id and automation_id.lower() not in element_automation_id.lower():
+                    if automation_id_lower and automation_id_lower not in element_automation_id.lower():
                         matches = False
-                    if class_name and class_name.lower() not in element_class_name.lower():
+                    if class_name_lower and class_name_lower not in element_class_name.lower():
                         matches = False
                     
                     if matches:
+                        # If we can't get position, still consider it a match
+                        if rect is None:
+                            return element
+                        
                         # Additional check: verify position matches roughly
-                        try:
-                            rect = element.rectangle()
-                            target_pos = target_element['position']
-                            
-                            # Allow some tolerance in position matching (within 10 pixels)
-                            if (abs(rect.left - target_pos['left']) <= 10 and
-                                abs(rect.top - target_pos['top']) <= 10 and
-                                abs(rect.right - target_pos['right']) <= 10 and
-                                abs(rect.bottom - target_pos['bottom']) <= 10):
-                                return element
-                        except:
-                            # If we can't get position, still consider it a match
+                        if (abs(rect.left - target_pos['left']) <= ELEMENT_POSITION_TOLERANCE and
+                            abs(rect.top - target_pos['top']) <= ELEMENT_POSITION_TOLERANCE and
+                            abs(rect.right - target_pos['right']) <= ELEMENT_POSITION_TOLERANCE and
+                            abs(rect.bottom - target_pos['bottom']) <= ELEMENT_POSITION_TOLERANCE):
                             return element
                     
-                    # Search children
-                    if hasattr(element, 'children') and callable(element.children):
-                        for child in element.children():
-                            result = search_recursively(child, depth + 1, max_depth)
-                            if result:
-                                return result
+                    # Search children; elements without children() end the branch below
+                    for child in element.children():
+                        result = search_recursively(child, depth + 1, max_depth)
+                        if result:
+                            return result
                 
                 except Exception as e:
                     # Element might not be accessible, continue search
@@ -1,12 +1,13 @@
 """Main UI Explorer class that coordinates all components."""
 
+import heapq
 from typing import Dict, Any, Optional, Union, List
 from datetime import datetime
 
 from ..config import get_settings
 from ..utils.logging import get_logger, setup_logging
 from ..utils.system import setup_unicode_encoding
-from ..models.enums import RegionType, ControlType
+from ..models.enums import RegionType, ControlType, coerce_control_type
 from ..services.ui_tars import UITarsService
 from ..services.memory import MemoryService
 from ..services.verification import VerificationService
@@ -369,7 +370,7 @@ class UIExplorer:
     async def find_elements_near_cursor(
         self,
         max_distance: int = 100,
-        control_type: Optional[ControlType] = None,
+        control_type: Optional[Union[ControlType, str]] = None,
         limit: int = 5
     ) -> Dict[str, Any]:
         """Find UI elements closest to the current cursor position."""
@@ -392,8 +393,13 @@ class UIExplorer:
                 visible_only=True
             )
             
-            # Flatten hierarchy and calculate distances
-            elements_with_distance = []
+            # Flatten hierarchy into (distance, order, element) candidates
+            candidates = []
+            control_type_value = coerce_control_type(control_type).value if control_type else None
+            # Squared distances in doubled coordinates; no division or sqrt per element
+            cursor_x2 = 2 * cursor_x
+            cursor_y2 = 2 * cursor_y
+            max_distance_sq = (2 * max_distance) ** 2
             
             def process_element(element):
                 # Skip elements without position
@@ -401,70 +407,71 @@ class UIExplorer:
                     return
                     
                 # Apply control type filter if specified
-                if control_type and element['control_type'] != control_type.value:
+                if control_type_value and element['control_type'] != control_type_value:
                     return
                     
-                # Calculate center point of element
+                # Calculate offset of the element's doubled center point from the cursor
                 pos = element['position']
-                if isinstance(pos, dict) and all(k in pos for k in ['left', 'top', 'right', 'bottom']):
-                    element_center_x = (pos['left'] + pos['right']) / 2
-                    element_center_y = (pos['top'] + pos['bottom']) / 2
-                else:
+                try:
+                    dx = pos['left'] + pos['right'] - cursor_x2
+                    dy = pos['top'] + pos['bottom'] - cursor_y2
+                except (KeyError, TypeError):
                     return
                 
-                # Calculate Euclidean distance
-                distance = ((element_center_x - cursor_x) ** 2 + (element_center_y - cursor_y) ** 2) ** 0.5
-                
-                # Add to list if within max_distance
-                if distance <= max_distance:
-                    from ..utils.coordinates import CoordinateConverter
-                    
-                    left, top, right, bottom = pos['left'], pos['top'], pos['right'], pos['bottom']
-                    center_x = (left + right) / 2
-                    center_y = (top + bottom) / 2
-                    
-                    coordinates = {
-                        "absolute": {
-                            "left": int(left), "top": int(top), 
-                            "right": int(right), "bottom": int(bottom),
-                            "center_x": int(center_x), "center_y": int(center_y)
-                        },
-                        "normalized": {
-                            "left": left / screen_width, "top": top / screen_height,
-                            "right": right / screen_width, "bottom": bottom / screen_height,
-                            "center_x": center_x / screen_width, "center_y": center_y / screen_height
-                        }
-                    }
-                    
-                    element_copy = {
-                        "control_type": element['control_type'],
-                        "text": element['text'],
-                        "position": pos,  # Keep original for backward compatibility
-                        "coordinates": coordinates,  # New unified format
-                        "distance": round(distance, 2),
-                        "properties": element['properties']['automation_id'] if 'properties' in element and 'automation_id' in element['properties'] else ""
-                    }
-                    elements_with_distance.append(element_copy)
+                # Add to candidates if within max_distance; only candidates get a real distance
+                distance_sq = dx * dx + dy * dy
+                if distance_sq <= max_distance_sq:
+                    candidates.append((round(distance_sq ** 0.5 / 2, 2), len(candidates), element))
                 
                 # Process children
                 if 'children' in element:
                     for child in element['children']:
                         process_element(child)
             
+            def describe_element(element, distance):
+                pos = element['position']
+                left, top, right, bottom = pos['left'], pos['top'], pos['right'], pos['bottom']
+                center_x = (left + right) / 2
+                center_y = (top + bottom) / 2
+                
+                coordinates = {
+                    "absolute": {
+                        "left": int(left), "top": int(top), 
+                        "right": int(right), "bottom": int(bottom),
+                        "center_x": int(center_x), "center_y": int(center_y)
+                    },
+                    "normalized": {
+                        "left": left / screen_width, "top": top / screen_height,
+                        "right": right / screen_width, "bottom": bottom / screen_height,
+                        "center_x": center_x / screen_width, "center_y": center_y / screen_height
+                    }
+                }
+                
+                return {
+                    "control_type": element['control_type'],
+                    "text": element['text'],
+                    "position": pos,  # Keep original for backward compatibility
+                    "coordinates": coordinates,  # New unified format
+                    "distance": distance,
+                    "properties": element['properties']['automation_id'] if 'properties' in element and 'automation_id' in element['properties'] else ""
+                }
+            
             # Process all root elements
             for element in ui_hierarchy:
                 process_element(element)
                 
-            # Sort by distance and limit results
-            elements_with_distance.sort(key=lambda x: x['distance'])
-            closest_elements = elements_with_distance[:limit]
+            # Pick the closest elements; output dicts are only built for those returned
+            closest_elements = [
+                describe_element(element, distance)
+                for distance, _, element in heapq.nsmallest(limit, candidates)
+            ]
             
             result = {
                 "success": True,
                 "cursor_position": cursor_pos["position"],
                 "elements": closest_elements,
-                "total_found": len(elements_with_distance),
-                "showing": min(len(elements_with_distance), limit)
+                "total_found": len(candidates),
+                "showing": len(closest_elements)
             }
             
             # Track and add metadata
@@ -562,6 +569,15 @@ class UIExplorer:
         
         return result
     
+    async def warmup(self) -> Dict[str, Any]:
+        """Prime the screenshot and input backends ahead of the first action."""
+        result = await self.ui_actions.warmup()
+        
+        # Track and add metadata
+        result = self._track_and_log("warmup", locals(), result)
+        
+        return result
+    
     async def play_macro(
         self,
         macro_path: str,
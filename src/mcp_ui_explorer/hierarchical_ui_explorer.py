@@ -3,6 +3,7 @@ import os
 import json
 import time
 import argparse
+from functools import lru_cache
 import pyautogui
 from pywinauto import Desktop
 from PIL import Image, ImageDraw, ImageFont
@@ -29,9 +30,28 @@ def create_parser():
     parser.add_argument('--text', type=str, help='Only include elements containing this text (case-insensitive, partial match)')
     return parser
 
+# Screen size is queried once and reused; call refresh_screen_size() after a
+# resolution or DPI change
+_screen_size = None
+
+def get_screen_size():
+    """Return the cached (width, height) of the primary screen"""
+    global _screen_size
+    if _screen_size is None:
+        _screen_size = tuple(pyautogui.size())
+    return _screen_size
+
+def refresh_screen_size():
+    """Re-query the screen size and drop everything derived from it"""
+    global _screen_size
+    _screen_size = None
+    get_predefined_regions.cache_clear()
+    return get_screen_size()
+
 # Define predefined regions
+@lru_cache(maxsize=1)
 def get_predefined_regions():
-    screen_width, screen_height = pyautogui.size()
+    screen_width, screen_height = get_screen_size()
     half_width = screen_width // 2
     half_height = screen_height // 2
     
@@ -48,18 +68,31 @@ def get_predefined_regions():
         "center": (screen_width//4, screen_height//4, screen_width*3//4, screen_height*3//4)
     }
 
+@lru_cache(maxsize=1)
+def get_desktop():
+    """Return the shared UIA Desktop"""
+    return Desktop(backend="uia")
+
 def get_all_windows(focus_only=False):
     """Get all visible windows or just the focused one"""
-    desktop = Desktop(backend="uia")
-    
     if focus_only:
         import win32gui
-        foreground_hwnd = win32gui.GetForegroundWindow()
-        windows = [w for w in desktop.windows() if w.handle == foreground_hwnd and w.is_visible()]
-    else:
-        windows = [w for w in desktop.windows() if w.is_visible()]
+        from pywinauto.controls.uiawrapper import UIAWrapper
+        from pywinauto.uia_element_info import UIAElementInfo
         
-    return windows
+        # Wrap the foreground window by handle rather than enumerating every
+        # top-level window to find it
+        foreground_hwnd = win32gui.GetForegroundWindow()
+        if not foreground_hwnd:
+            return []
+        try:
+            window = UIAWrapper(UIAElementInfo(foreground_hwnd))
+            return [window] if window.is_visible() else []
+        except Exception as e:
+            print(f"Error getting foreground window: {str(e)}")
+            return []
+    
+    return [w for w in get_desktop().windows() if w.is_visible()]
 
 def element_to_dict(element, region=None, min_size=5, visible_only=False):
     """Convert a UI element to a dictionary with its properties"""
@@ -75,38 +108,46 @@ def element_to_dict(element, region=None, min_size=5, visible_only=False):
                 return None
         
         # Skip elements that are too small
-        if rect.width() < min_size or rect.height() < min_size:
+        width = rect.width()
+        height = rect.height()
+        if width < min_size or height < min_size:
             return None
         
         # Skip elements that are not visible on screen if visible_only is True
         if visible_only:
             # Check if element is within screen boundaries
-            screen_width, screen_height = pyautogui.size()
+            screen_width, screen_height = get_screen_size()
             if (rect.right < 0 or rect.left > screen_width or 
                 rect.bottom < 0 or rect.top > screen_height):
                 return None
             
             # Check if element is visible (has non-zero size and not hidden)
-            if hasattr(element, 'is_visible') and callable(element.is_visible):
+            try:
                 if not element.is_visible():
                     return None
+            except AttributeError:
+                pass
             
             # Check if element is enabled/interactive if possible
-            if hasattr(element, 'is_enabled') and callable(element.is_enabled):
+            try:
                 if not element.is_enabled():
                     return None
+            except AttributeError:
+                pass
             
         # Get element text
-        text = ""
-        if hasattr(element, 'window_text') and callable(element.window_text):
+        try:
             text = element.window_text()
+        except AttributeError:
+            text = ""
         
         # Get control type
-        control_type = element.element_info.control_type
+        info = element.element_info
+        control_type = info.control_type
         
         # Get class name and automation id if available
-        class_name = element.element_info.class_name if hasattr(element.element_info, 'class_name') else ''
-        automation_id = element.element_info.automation_id if hasattr(element.element_info, 'automation_id') else ''
+        class_name = getattr(info, 'class_name', '')
+        automation_id = getattr(info, 'automation_id', '')
         
         # Create basic element info
         element_info = {
@@ -117,8 +158,8 @@ def element_to_dict(element, region=None, min_size=5, visible_only=False):
                 'top': rect.top,
                 'right': rect.right,
                 'bottom': rect.bottom,
-                'width': rect.width(),
-                'height': rect.height()
+                'width': width,
+                'height': height
             },
             'properties': {
                 'class_name': class_name,
@@ -143,15 +184,18 @@ def build_element_tree(element, depth=0, max_depth=5, region=None, min_size=5, v
         return None
         
     # Add children recursively
-    if hasattr(element, 'children') and callable(element.children):
-        try:
-            children = element.children()
-            for child in children:
-                child_dict = build_element_tree(child, depth + 1, max_depth, region, min_size, visible_only)
-                if child_dict:
-                    element_dict['children'].append(child_dict)
-        except Exception as e:
-            print(f"Error processing children: {str(e)}")
+    try:
+        children = element.children()
+    except AttributeError:
+        children = []
+    except Exception as e:
+        print(f"Error processing children: {str(e)}")
+        children = []
+    
+    for child in children:
+        child_dict = build_element_tree(child, depth + 1, max_depth, region, min_size, visible_only)
+        if child_dict:
+            element_dict['children'].append(child_dict)
     
     return element_dict
 
@@ -240,19 +284,32 @@ def draw_element_hierarchy(image, element, draw, highlight_levels=False, current
     for child in element['children']:
         draw_element_hierarchy(image, child, draw, highlight_levels, current_depth + 1, level_colors)
 
-def visualize_ui_hierarchy(hierarchy, output_prefix="ui_hierarchy", highlight_levels=False):
-    """Create visualization of UI hierarchy"""
-    # Take a screenshot
-    screenshot = pyautogui.screenshot()
+def render_ui_hierarchy(hierarchy, highlight_levels=False, image=None):
+    """Draw the UI hierarchy over a screenshot and return the annotated image
+    
+    If image is given (a full-screen PIL image the caller already captured) it
+    is drawn on in place instead of taking a new screenshot.
+    """
+    screenshot = image if image is not None else pyautogui.screenshot()
     draw = ImageDraw.Draw(screenshot)
     
     # Draw each top-level window
     for window in hierarchy:
         draw_element_hierarchy(screenshot, window, draw, highlight_levels)
     
-    # Save the image
+    return screenshot
+
+def screenshot_path(output_prefix="ui_hierarchy", extension="png"):
+    """Build the timestamped file name used for saved visualizations"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    image_path = f"{output_prefix}_{timestamp}.png"
+    return f"{output_prefix}_{timestamp}.{extension}"
+
+def visualize_ui_hierarchy(hierarchy, output_prefix="ui_hierarchy", highlight_levels=False, image=None):
+    """Create visualization of UI hierarchy"""
+    screenshot = render_ui_hierarchy(hierarchy, highlight_levels, image)
+    
+    # Save the image
+    image_path = screenshot_path(output_prefix)
     screenshot.save(image_path)
     
     # Return the path
@@ -415,14 +472,15 @@ def main():
     def filter_by_control_type_and_text(elements, control_type, text_filter=None):
         # This will store all directly matching elements in a flat list
         flat_matches = []
+        text_filter_lower = text_filter.lower() if text_filter else None
         
         def collect_matches(element, parent_path=""):
             # Check if element matches control_type and text filter
             control_type_match = element['control_type'] == control_type
             
             text_match = True
-            if text_filter:
-                text_match = text_filter.lower() in element['text'].lower()
+            if text_filter_lower:
+                text_match = text_filter_lower in element['text'].lower()
             
             current_path = parent_path
             if current_path:
@@ -552,13 +610,14 @@ def create_parser():
 def find_elements_by_criteria(hierarchy, control_type=None, text=None, path=None):
     """Find elements matching criteria"""
     matches = []
+    text_lower = text.lower() if text else None
     
     def search_element(element, current_path=""):
         # Check if this element matches
         if control_type and element['control_type'] == control_type:
-            if not text or (text.lower() in element['text'].lower()):
+            if not text_lower or (text_lower in element['text'].lower()):
                 matches.append((element, current_path))
-        elif text and text.lower() in element['text'].lower():
+        elif text_lower and text_lower in element['text'].lower():
             matches.append((element, current_path))
             
         # Search children
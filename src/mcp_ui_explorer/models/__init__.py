@@ -1,6 +1,6 @@
 """Models package for MCP UI Explorer."""
 
-from .enums import RegionType, ControlType, MacroState, MacroEventType
+from .enums import RegionType, ControlType, MacroState, MacroEventType, coerce_control_type
 from .inputs import (
     ExploreUIInput,
     FindNearCursorInput,
@@ -18,6 +18,7 @@ from .inputs import (
     StopMacroRecordingInput,
     PauseMacroRecordingInput,
     GetMacroStatusInput,
+    WarmupInput,
     PlayMacroInput,
     FindUIElementsInput,
     ClickUIElementByAccessibilityInput,
@@ -28,6 +29,7 @@ __all__ = [
     "ControlType",
     "MacroState",
     "MacroEventType",
+    "coerce_control_type",
     "ExploreUIInput",
     "FindNearCursorInput",
     "ScreenshotUIInput",
@@ -44,6 +46,7 @@ __all__ = [
     "StopMacroRecordingInput",
     "PauseMacroRecordingInput",
     "GetMacroStatusInput",
+    "WarmupInput",
     "PlayMacroInput",
     "FindUIElementsInput",
     "ClickUIElementByAccessibilityInput",
@@ -67,4 +67,17 @@ class MacroEventType(str, Enum):
     KEYBOARD_HOTKEY = "keyboard_hotkey"
     UI_CHANGE = "ui_change"
     SCREENSHOT = "screenshot"
-    WAIT = "wait" 
\ No newline at end of file
+    WAIT = "wait" 
+
+
+# Value -> member map; a dict lookup skips EnumType.__call__ on the common path
+_CONTROL_TYPE_LOOKUP = ControlType._value2member_map_
+
+
+def coerce_control_type(value: str) -> ControlType:
+    """Return the ControlType for a member or its string value."""
+    member = _CONTROL_TYPE_LOOKUP.get(value)
+    if member is None:
+        # Raises the usual ValueError for unknown values
+        member = ControlType(value)
+    return member
@@ -38,6 +38,7 @@ class ScreenshotUIInput(BaseModel):
     min_size: int = Field(default=20, description="Minimum element size to include (default: 20)")
     output_prefix: str = Field(default="ui_hierarchy", description="Prefix for output files")
     region: Optional[str] = Field(default=None, description="Region to analyze: predefined regions or custom 'left,top,right,bottom' coordinates")
+    verbose_preamble: bool = Field(default=False, description="Also send a plain 'Screenshot saved to' message before the JSON result")
 
 
 class ClickUIElementInput(BaseModel):
@@ -180,6 +181,10 @@ class GetMacroStatusInput(BaseModel):
     include_events: bool = Field(default=False, description="Whether to include the recorded events in the response")
 
 
+class WarmupInput(BaseModel):
+    """Input model for warmup tool."""
+
+
 class PlayMacroInput(BaseModel):
     """Input model for play_macro tool."""
     
@@ -2,14 +2,31 @@
 
 import json
 import time
+import logging
 import asyncio
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Callable
 
-import pyautogui
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from ..models.enums import MacroEventType
 from ..utils.logging import get_logger
+from ..utils.ui_backend import send_text, send_key, send_hotkey, send_keyboard_batch, get_pyautogui
+
+
+# Keyboard events that can be coalesced into a single input batch
+KEYBOARD_EVENT_TYPES = {
+    MacroEventType.KEYBOARD_TYPE: ("text", "text"),
+    MacroEventType.KEYBOARD_KEY: ("key", "key"),
+    MacroEventType.KEYBOARD_HOTKEY: ("hotkey", "keys"),
+}
+
+# Pre-event delays below this are not slept, so such events can share a batch
+MIN_SLEEP_DELAY = 0.01
 
 
 class MacroPlayer:
@@ -17,6 +34,8 @@ class MacroPlayer:
     
     def __init__(self, screenshot_function: Optional[Callable] = None, ui_tars_service=None):
         self.logger = get_logger(__name__)
+        # Debug messages are formatted only when enabled; refreshed when playback starts
+        self._debug = self.logger.isEnabledFor(logging.DEBUG)
         self.screenshot_function = screenshot_function
         self.ui_tars_service = ui_tars_service
         
@@ -24,15 +43,21 @@ class MacroPlayer:
         self.is_playing = False
         self.current_macro = None
         self.playback_stats = {}
+        self.verification_results: List[Dict[str, Any]] = []
     
     async def play_macro(
         self,
         macro_path: str,
         speed_multiplier: float = 1.0,
         verify_ui_context: bool = True,
-        stop_on_verification_failure: bool = True
+        stop_on_verification_failure: bool = True,
+        start_index: int = 0
     ) -> Dict[str, Any]:
-        """Play back a recorded macro."""
+        """Play back a recorded macro.
+        
+        start_index resumes playback from a given event, e.g. the failed_index
+        reported by a previous run.
+        """
         try:
             # Load macro file
             macro_data = self._load_macro(macro_path)
@@ -44,6 +69,8 @@ class MacroPlayer:
             
             self.current_macro = macro_data
             self.is_playing = True
+            self.verification_results = []
+            self._debug = self.logger.isEnabledFor(logging.DEBUG)
             
             # Initialize playback stats
             self.playback_stats = {
@@ -51,12 +78,14 @@ class MacroPlayer:
                 "events_executed": 0,
                 "events_skipped": 0,
                 "verification_failures": 0,
+                "verifications_passed": 0,
                 "start_time": time.time()
             }
             
             self.logger.info(f"Starting playback of macro: {macro_data.get('name', 'Unknown')}")
             
             # Disable pyautogui failsafe for smooth playback
+            pyautogui = get_pyautogui()
             original_failsafe = pyautogui.FAILSAFE
             pyautogui.FAILSAFE = False
             
@@ -66,7 +95,8 @@ class MacroPlayer:
                     macro_data.get("events", []),
                     speed_multiplier,
                     verify_ui_context,
-                    stop_on_verification_failure
+                    stop_on_verification_failure,
+                    start_index
                 )
                 
                 self.playback_stats["end_time"] = time.time()
@@ -74,7 +104,8 @@ class MacroPlayer:
                 
                 result.update({
                     "macro_name": macro_data.get("name", "Unknown"),
-                    "playback_stats": self.playback_stats
+                    "playback_stats": self.playback_stats,
+                    "verification_results": self.verification_results
                 })
                 
                 return result
@@ -101,6 +132,9 @@ class MacroPlayer:
                 return None
             
             if path.suffix.lower() == '.json':
+                if ORJSON_AVAILABLE:
+                    # Recorded macros can be several MB; orjson parses them much faster
+                    return orjson.loads(path.read_bytes())
                 with open(path, 'r', encoding='utf-8') as f:
                     return json.load(f)
             else:
@@ -116,19 +150,24 @@ class MacroPlayer:
         events: List[Dict[str, Any]],
         speed_multiplier: float,
         verify_ui_context: bool,
-        stop_on_verification_failure: bool
+        stop_on_verification_failure: bool,
+        start_index: int = 0
     ) -> Dict[str, Any]:
-        """Execute the macro events."""
+        """Execute the macro events, starting at start_index."""
         if not events:
             return {
                 "success": True,
                 "message": "No events to execute"
             }
         
-        start_time = events[0].get("timestamp", 0)
-        last_event_time = start_time
+        # Precompute the whole timing schedule once so any index can be
+        # started from directly (resume after a failure)
+        schedule = self._compile_schedule(events, speed_multiplier)
         
-        for i, event in enumerate(events):
+        i = start_index
+        while i < len(events):
+            event = events[i]
+            
             if not self.is_playing:
                 return {
                     "success": False,
@@ -137,13 +176,25 @@ class MacroPlayer:
                 }
             
             try:
-                # Calculate timing delay
-                event_time = event.get("timestamp", last_event_time)
-                delay = (event_time - last_event_time) / speed_multiplier
+                delay = schedule[i]
                 
-                if delay > 0.01:  # Only sleep for significant delays
+                if delay > MIN_SLEEP_DELAY:  # Only sleep for significant delays
                     await asyncio.sleep(delay)
                 
+                # Keystrokes that follow each other without a real pause are
+                # injected together instead of one event at a time
+                batch_end = self._keyboard_run_end(events, schedule, i)
+                if batch_end > i + 1:
+                    await asyncio.to_thread(
+                        send_keyboard_batch,
+                        [self._keyboard_action(e) for e in events[i:batch_end]]
+                    )
+                    self.playback_stats["events_executed"] += batch_end - i
+                    if self._debug:
+                        self.logger.debug(f"Executed {batch_end - i} keyboard events as one batch")
+                    i = batch_end
+                    continue
+                
                 # Execute the event
                 success = await self._execute_event(event, verify_ui_context)
                 
@@ -156,11 +207,10 @@ class MacroPlayer:
                         return {
                             "success": False,
                             "message": f"Stopped playback due to verification failure at event {i + 1}",
-                            "failed_event": event
+                            "failed_event": event,
+                            "failed_index": i
                         }
                 
-                last_event_time = event_time
-                
             except Exception as e:
                 self.logger.error(f"Failed to execute event {i + 1}: {str(e)}")
                 self.playback_stats["events_skipped"] += 1
@@ -169,59 +219,101 @@ class MacroPlayer:
                     return {
                         "success": False,
                         "message": f"Failed to execute event {i + 1}: {str(e)}",
-                        "failed_event": event
+                        "failed_event": event,
+                        "failed_index": i
                     }
+            
+            i += 1
         
         return {
             "success": True,
             "message": f"Successfully executed {self.playback_stats['events_executed']} events"
         }
     
+    def _keyboard_run_end(self, events: List[Dict[str, Any]], schedule: List[float], start: int) -> int:
+        """Index just past the run of back-to-back keyboard events starting at start."""
+        end = start
+        while (
+            end < len(events)
+            and events[end].get("event_type") in KEYBOARD_EVENT_TYPES
+            and self._keyboard_action(events[end])[1]
+            and (end == start or schedule[end] <= MIN_SLEEP_DELAY)
+        ):
+            end += 1
+        return end
+    
+    def _keyboard_action(self, event: Dict[str, Any]) -> tuple:
+        """Convert a keyboard event into a (kind, value) action for the input backend."""
+        kind, field = KEYBOARD_EVENT_TYPES[event["event_type"]]
+        return (kind, event.get("data", {}).get(field))
+    
+    def _compile_schedule(self, events: List[Dict[str, Any]], speed_multiplier: float) -> List[float]:
+        """Flatten event timestamps into a per-index list of pre-event delays."""
+        schedule = []
+        last_event_time = events[0].get("timestamp", 0)
+        for event in events:
+            event_time = event.get("timestamp", last_event_time)
+            schedule.append((event_time - last_event_time) / speed_multiplier)
+            last_event_time = event_time
+        return schedule
+    
     async def _execute_event(self, event: Dict[str, Any], verify_ui_context: bool) -> bool:
         """Execute a single macro event."""
         event_type = event.get("event_type")
         data = event.get("data", {})
+        pyautogui = get_pyautogui()
         
         try:
             if event_type == MacroEventType.MOUSE_CLICK:
                 # Verify UI context if enabled
                 if verify_ui_context and self._should_verify_ui_context(event):
-                    if not await self._verify_ui_context(event):
+                    passed = await self._verify_ui_context(event)
+                    self.verification_results.append({
+                        "timestamp": event.get("timestamp"),
+                        "passed": passed
+                    })
+                    if not passed:
                         self.logger.warning(f"UI context verification failed for click event")
                         self.playback_stats["verification_failures"] += 1
                         return False
+                    self.playback_stats["verifications_passed"] += 1
                 
                 # Execute click
                 x, y = data.get("x", 0), data.get("y", 0)
                 pyautogui.click(x, y)
-                self.logger.debug(f"Executed click at ({x}, {y})")
+                if self._debug:
+                    self.logger.debug(f"Executed click at ({x}, {y})")
                 
             elif event_type == MacroEventType.KEYBOARD_TYPE:
                 # Execute typing
                 text = data.get("text", "")
-                pyautogui.write(text)
-                self.logger.debug(f"Executed typing: '{text}'")
+                send_text(text)
+                if self._debug:
+                    self.logger.debug(f"Executed typing: '{text}'")
                 
             elif event_type == MacroEventType.KEYBOARD_KEY:
                 # Execute key press
                 key = data.get("key", "")
                 if key:
-                    pyautogui.press(key)
-                    self.logger.debug(f"Executed key press: {key}")
+                    send_key(key)
+                    if self._debug:
+                        self.logger.debug(f"Executed key press: {key}")
                 
             elif event_type == MacroEventType.KEYBOARD_HOTKEY:
                 # Execute hotkey combination
                 keys = data.get("keys", [])
                 if keys:
-                    pyautogui.hotkey(*keys)
-                    self.logger.debug(f"Executed hotkey: {'+'.join(keys)}")
+                    send_hotkey(keys)
+                    if self._debug:
+                        self.logger.debug(f"Executed hotkey: {'+'.join(keys)}")
                 
             elif event_type == MacroEventType.MOUSE_SCROLL:
                 # Execute scroll event
                 x, y = data.get("x", 0), data.get("y", 0)
                 dx, dy = data.get("scroll_dx", 0), data.get("scroll_dy", 0)
                 pyautogui.scroll(dy, x=x, y=y)
-                self.logger.debug(f"Executed scroll at ({x}, {y}) dx={dx}, dy={dy}")
+                if self._debug:
+                    self.logger.debug(f"Executed scroll at ({x}, {y}) dx={dx}, dy={dy}")
                 
             elif event_type == MacroEventType.MOUSE_MOVE:
                 # Handle mouse move or legacy scroll events
@@ -230,23 +322,27 @@ class MacroPlayer:
                     x, y = data.get("x", 0), data.get("y", 0)
                     dx, dy = data.get("scroll_dx", 0), data.get("scroll_dy", 0)
                     pyautogui.scroll(dy, x=x, y=y)
-                    self.logger.debug(f"Executed legacy scroll at ({x}, {y}) dx={dx}, dy={dy}")
+                    if self._debug:
+                        self.logger.debug(f"Executed legacy scroll at ({x}, {y}) dx={dx}, dy={dy}")
                 else:
                     # Mouse move event
                     x, y = data.get("x", 0), data.get("y", 0)
                     pyautogui.moveTo(x, y)
-                    self.logger.debug(f"Executed mouse move to ({x}, {y})")
+                    if self._debug:
+                        self.logger.debug(f"Executed mouse move to ({x}, {y})")
                 
             elif event_type == MacroEventType.WAIT:
                 # Wait event
                 duration = data.get("duration", 0)
                 if duration > 0:
                     await asyncio.sleep(duration)
-                    self.logger.debug(f"Executed wait: {duration}s")
+                    if self._debug:
+                        self.logger.debug(f"Executed wait: {duration}s")
                 
             elif event_type == MacroEventType.SCREENSHOT:
                 # Screenshot events are informational, skip execution
-                self.logger.debug(f"Skipped screenshot event: {data.get('action', 'unknown')}")
+                if self._debug:
+                    self.logger.debug(f"Skipped screenshot event: {data.get('action', 'unknown')}")
                 
             else:
                 self.logger.warning(f"Unknown event type: {event_type}")
@@ -279,8 +375,12 @@ class MacroPlayer:
             if not closest_element:
                 return True
             
-            # Take a current screenshot
-            _, image_path, _ = await self.screenshot_function(output_prefix="verification")
+            # Take a current screenshot; image_path may be None when the
+            # screenshot function keeps the encoded image in memory only
+            image_data, image_path, _ = await self.screenshot_function(
+                output_prefix="verification",
+                keep_in_memory=True
+            )
             
             # Use UI-TARS to find the element
             click_data = event.get("data", {})
@@ -296,9 +396,10 @@ class MacroPlayer:
                 query = f"{element_type} element"
             
             # Analyze current UI
-            result = await self.ui_tars_service.analyze_ui(
+            result = await self.ui_tars_service.analyze_image(
                 image_path=image_path,
-                query=query
+                query=query,
+                image_bytes=image_data if image_path is None else None
             )
             
             if not result.get("success"):
@@ -1,25 +1,117 @@
 """Macro recording service for capturing user interactions with UI context."""
 
+import io
+import re
+import logging
 import json
 import time
+import queue
 import threading
 import shutil
 import zipfile
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Callable
-from dataclasses import dataclass, asdict
+from typing import Deque, Dict, Any, List, Optional, Callable, Tuple
+from dataclasses import dataclass
 
 from pynput import mouse, keyboard
 import pyautogui
-from PIL import Image, ImageDraw
+from PIL import Image, ImageDraw, ImageFont
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import mss
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+
+try:
+    import win32gui
+    WIN32_AVAILABLE = True
+except ImportError:
+    WIN32_AVAILABLE = False
+
+try:
+    from pywinauto.uia_element_info import UIAElementInfo
+    UIA_AVAILABLE = True
+except ImportError:
+    UIA_AVAILABLE = False
 
 from ..models.enums import MacroState, MacroEventType
 from ..utils.logging import get_logger
 from ..hierarchical_ui_explorer import analyze_ui_hierarchy, visualize_ui_hierarchy
 
 
-@dataclass
+# Resolved UI elements are cached per 8x8 pixel cell; at most this many cells are kept
+UI_CONTEXT_CACHE_SIZE = 128
+UI_CONTEXT_CELL_SHIFT = 3
+
+# Characters dropped from macro names to form package directory names
+UNSAFE_NAME_CHARS = re.compile(r"[^\w \-]+")
+
+# Special keys that edit the text buffer instead of being recorded
+EDIT_KEYS = frozenset({"backspace", "delete"})
+
+# Modifier keys are only recorded as part of hotkey combinations
+MODIFIER_KEYS = frozenset({"ctrl_l", "ctrl_r", "alt_l", "alt_r", "shift", "shift_r", "cmd"})
+
+# Cursor movement keys are not recorded
+NAVIGATION_KEYS = frozenset({"left", "right", "up", "down", "home", "end", "page_up", "page_down"})
+
+# Hierarchy snapshot entry: (area, left, top, right, bottom, 2 * center x, 2 * center y, element)
+SnapshotEntry = Tuple[int, int, int, int, int, int, int, Dict[str, Any]]
+
+# Nearby fallback only considers elements whose center is within this many pixels
+NEARBY_ELEMENT_DISTANCE = 100
+
+# Seconds a window's class, title and rect are reused by the basic window fallback
+HWND_INFO_TTL = 0.5
+
+# Events this many seconds apart and within mouse_move_threshold pixels share one lookup
+UI_CONTEXT_COALESCE_WINDOW = 0.03
+
+# Pending UI-context lookups; when full, the oldest lookup is dropped
+UI_CONTEXT_QUEUE_SIZE = 64
+
+# Pending event screenshots; when full, new screenshots are skipped
+SCREENSHOT_QUEUE_SIZE = 8
+
+# Seconds stopping a recording waits to queue a worker's stop sentinel and
+# again for the worker to finish; past that the daemon thread is abandoned
+WORKER_STOP_TIMEOUT = 10.0
+
+
+@lru_cache(maxsize=None)
+def _annotation_font(size: int) -> ImageFont.ImageFont:
+    """Load the coordinate annotation font once per size."""
+    # Windows, macOS, then Linux
+    for path in ("arial.ttf", "/System/Library/Fonts/Arial.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"):
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=None)
+def _metadata_font(size: int) -> ImageFont.ImageFont:
+    """Load the screenshot metadata font once per size."""
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+@dataclass(slots=True)
 class MacroEvent:
     """Represents a single event in a macro recording."""
     
@@ -30,21 +122,42 @@ class MacroEvent:
     screenshot_path: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization."""
-        return asdict(self)
+        """Convert to dictionary for serialization.
+        
+        The dictionary shares data, ui_context and their contents with the
+        event; copy them before modifying.
+        """
+        return {
+            "event_type": self.event_type.value,
+            "timestamp": self.timestamp,
+            "data": self.data,
+            "ui_context": self.ui_context,
+            "screenshot_path": self.screenshot_path
+        }
 
 
 class MacroRecorder:
     """Service for recording user interactions as macros."""
     
-    def __init__(self, screenshot_function: Optional[Callable] = None):
+    def __init__(
+        self,
+        screenshot_function: Optional[Callable] = None,
+        frame_function: Optional[Callable[[], memoryview]] = None
+    ):
         self.logger = get_logger(__name__)
+        # Debug messages are formatted only when enabled; refreshed when recording starts or resumes
+        self._debug = self.logger.isEnabledFor(logging.DEBUG)
         self.screenshot_function = screenshot_function
+        # Returns the screen as a (height, width, 4) BGRA memoryview; when
+        # unset, event screenshots are captured with pyautogui
+        self.frame_function = frame_function
         
         # Recording state
         self.state = MacroState.IDLE
         self.current_macro: Optional[Dict[str, Any]] = None
-        self.events: List[MacroEvent] = []
+        # Listener callbacks append without taking self.lock (deque appends are
+        # atomic); readers work from a list snapshot
+        self.events: Deque[MacroEvent] = deque()
         
         # Event listeners
         self.mouse_listener: Optional[mouse.Listener] = None
@@ -55,19 +168,70 @@ class MacroRecorder:
         self.capture_screenshots = True
         self.mouse_move_threshold = 50.0
         self.keyboard_commit_events = ["enter", "tab", "escape"]
+        self._commit_keys = frozenset(self.keyboard_commit_events)
         
         # State tracking
         self.last_mouse_position = (0, 0)
-        self.current_text_buffer = ""
+        self._screen_size: Tuple[int, int] = (0, 0)
+        # Typed characters since the last commit; joined once when committed
+        self.current_text_buffer: List[str] = []
         self.last_ui_context_time = 0
         self.ui_context_cache_duration = 2.0  # seconds
         
+        # UI context is resolved on a worker thread while listeners run, so the
+        # pynput callbacks return without waiting on accessibility queries
+        self._resolve_queue: Optional[queue.Queue] = None
+        self._resolve_thread: Optional[threading.Thread] = None
+        
+        # Event screenshots are grabbed in the callback but annotated, encoded
+        # and written to disk on a worker thread
+        self._shot_queue: Optional[queue.Queue] = None
+        self._shot_thread: Optional[threading.Thread] = None
+        
+        # Pixel cell -> (resolved at, element), oldest first
+        self._ui_context_cache: "OrderedDict[Tuple[int, int], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        
+        # (foreground HWND, cursor position, event) of the last text commit that
+        # was resolved, so repeated commits into the same field can reuse it
+        self._last_text_commit: Optional[Tuple[int, Tuple[int, int], MacroEvent]] = None
+        
+        # (foreground HWND, built at, flattened elements) for the hierarchy fallback
+        self._hierarchy_snapshot_data: Optional[Tuple[int, float, List[SnapshotEntry]]] = None
+        
+        # HWND -> (queried at, class name, title, rect)
+        self._hwnd_info_cache: Dict[int, Tuple[float, str, str, Tuple[int, int, int, int]]] = {}
+        
         # Package organization
         self.macro_package_dir: Optional[Path] = None
+        self._package_name: Optional[str] = None
         self.screenshot_counter = 0
         
-        # Thread safety
+        # Last captured frame and its RGBA image, reused while the screen is unchanged
+        self._last_frame: Optional[memoryview] = None
+        self._last_frame_image: Optional[Image.Image] = None
+        
+        # Without frame_function, frames are grabbed with one mss instance,
+        # created on first use and closed when recording stops. Listener and
+        # worker threads share it, so grabs are serialized, as in
+        # UIActions.screenshot_ui_fast.
+        self._sct: Optional[Any] = None
+        self._sct_lock = threading.Lock()
+        
+        # Package ZIPs are built in the background; package name -> pending build
+        self._zip_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="macro-zip")
+        self._zip_jobs: Dict[str, Future] = {}
+        
+        # Package ZIP opened at start_recording; screenshots are written into it
+        # as they are taken, so saving does not read them back. ZipFile is not
+        # thread-safe, hence the lock.
+        self._package_zip: Optional[zipfile.ZipFile] = None
+        self._zip_lock = threading.Lock()
+        
+        # Thread safety: self.lock serializes start/stop/pause, which start
+        # threads and write files; _state_lock only covers swapping state,
+        # current_macro and events, so get_status never waits on that I/O
         self.lock = threading.Lock()
+        self._state_lock = threading.Lock()
     
     def start_recording(
         self,
@@ -79,6 +243,10 @@ class MacroRecorder:
         keyboard_commit_events: List[str] = None
     ) -> Dict[str, Any]:
         """Start recording a new macro."""
+        # Derive the package name before taking the lock
+        safe_name = UNSAFE_NAME_CHARS.sub("", macro_name).rstrip()
+        package_name = f"{safe_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        
         with self.lock:
             if self.state == MacroState.RECORDING:
                 return {
@@ -87,39 +255,49 @@ class MacroRecorder:
                 }
             
             # Initialize recording
-            self.current_macro = {
+            current_macro = {
                 "name": macro_name,
                 "description": description or "",
                 "created_at": datetime.now().isoformat(),
                 "version": "1.0"
             }
-            
-            self.events = []
+            with self._state_lock:
+                self.current_macro = current_macro
+                self.events = deque()
             self.capture_ui_context = capture_ui_context
             self.capture_screenshots = capture_screenshots
             self.mouse_move_threshold = mouse_move_threshold
             self.keyboard_commit_events = keyboard_commit_events or ["enter", "tab", "escape"]
+            self._commit_keys = frozenset(key.lower() for key in self.keyboard_commit_events)
             
             # Reset state tracking
-            self.current_text_buffer = ""
-            self.last_mouse_position = pyautogui.position()
+            self._debug = self.logger.isEnabledFor(logging.DEBUG)
+            self.current_text_buffer.clear()
+            self.last_mouse_position = tuple(pyautogui.position())
+            self._screen_size = tuple(pyautogui.size())
             self.last_ui_context_time = 0
+            self._ui_context_cache.clear()
+            self._hwnd_info_cache.clear()
+            self._hierarchy_snapshot_data = None
+            self._last_text_commit = None
             self.screenshot_counter = 0
             
             # Initialize package directory for screenshots
+            self._package_name = package_name
+            self.macro_package_dir = None
             if self.capture_screenshots:
-                safe_name = "".join(c for c in macro_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                package_name = f"{safe_name}_{timestamp}"
-                
                 self.macro_package_dir = Path("macros") / package_name
                 self.macro_package_dir.mkdir(parents=True, exist_ok=True)
                 (self.macro_package_dir / "screenshots").mkdir(exist_ok=True)
+                self._package_zip = zipfile.ZipFile(
+                    Path("macros") / f"{package_name}.zip", 'w', zipfile.ZIP_DEFLATED
+                )
             
             # Start event listeners
             self._start_listeners()
             
-            self.state = MacroState.RECORDING
+            with self._state_lock:
+                self.state = MacroState.RECORDING
             
             # Record initial state
             self._record_initial_state()
@@ -150,8 +328,10 @@ class MacroRecorder:
             
             # Record final state
             self._record_final_state()
+            self._close_screen_capture()
             
-            self.state = MacroState.STOPPED
+            with self._state_lock:
+                self.state = MacroState.STOPPED
             
             result = {
                 "success": True,
@@ -165,6 +345,12 @@ class MacroRecorder:
                 save_result = self._save_macro(output_format)
                 result.update(save_result)
             
+            # Not saved (or saving failed): discard the partial package ZIP
+            package_zip = self._take_package_zip()
+            if package_zip is not None:
+                package_zip.close()
+                Path(package_zip.filename).unlink(missing_ok=True)
+            
             self.logger.info(f"Stopped recording macro: {self.current_macro['name']} ({len(self.events)} events)")
             
             return result
@@ -180,11 +366,14 @@ class MacroRecorder:
             
             if pause and self.state == MacroState.RECORDING:
                 self._stop_listeners()
-                self.state = MacroState.PAUSED
+                with self._state_lock:
+                    self.state = MacroState.PAUSED
                 action = "paused"
             elif not pause and self.state == MacroState.PAUSED:
+                self._debug = self.logger.isEnabledFor(logging.DEBUG)
                 self._start_listeners()
-                self.state = MacroState.RECORDING
+                with self._state_lock:
+                    self.state = MacroState.RECORDING
                 action = "resumed"
             else:
                 return {
@@ -201,22 +390,73 @@ class MacroRecorder:
             }
     
     def get_status(self, include_events: bool = False) -> Dict[str, Any]:
-        """Get current recording status."""
-        with self.lock:
+        """Get current recording status, including the ZIP state of each saved package."""
+        with self._state_lock:
+            events = list(self.events)
             status = {
                 "state": self.state.value,
-                "events_recorded": len(self.events),
+                "events_recorded": len(events),
                 "current_macro": self.current_macro
             }
-            
-            if include_events:
-                status["events"] = [event.to_dict() for event in self.events]
-            
-            return status
+        
+        # Oldest first; a package's ZIP is complete once its zip_state is "done"
+        status["package_saves"] = [self.get_save_status(name) for name in list(self._zip_jobs)]
+        
+        if include_events:
+            status["events"] = [event.to_dict() for event in events]
+        
+        return status
+    
+    def get_save_status(self, package_name: str) -> Dict[str, Any]:
+        """Get the state of a macro package ZIP started by stop_recording."""
+        job = self._zip_jobs.get(package_name)
+        if job is None:
+            return {
+                "success": False,
+                "error": f"No macro package named '{package_name}' has been saved."
+            }
+        
+        if not job.done():
+            return {"success": True, "package_name": package_name, "zip_state": "pending"}
+        
+        error = job.exception()
+        if error is not None:
+            return {
+                "success": False,
+                "package_name": package_name,
+                "zip_state": "failed",
+                "error": f"Failed to create ZIP package: {str(error)}"
+            }
+        return {
+            "success": True,
+            "package_name": package_name,
+            "zip_state": "done",
+            "package_zip": str(job.result())
+        }
     
     def _start_listeners(self):
         """Start mouse and keyboard event listeners."""
         try:
+            # UI-context worker
+            self._resolve_queue = queue.Queue(maxsize=UI_CONTEXT_QUEUE_SIZE)
+            self._resolve_thread = threading.Thread(
+                target=self._resolve_worker,
+                args=(self._resolve_queue,),
+                name="macro-ui-context",
+                daemon=True
+            )
+            self._resolve_thread.start()
+            
+            # Screenshot worker
+            self._shot_queue = queue.Queue(maxsize=SCREENSHOT_QUEUE_SIZE)
+            self._shot_thread = threading.Thread(
+                target=self._screenshot_worker,
+                args=(self._shot_queue,),
+                name="macro-screenshots",
+                daemon=True
+            )
+            self._shot_thread.start()
+            
             # Mouse listener
             self.mouse_listener = mouse.Listener(
                 on_click=self._on_mouse_click,
@@ -245,6 +485,174 @@ class MacroRecorder:
         if self.keyboard_listener:
             self.keyboard_listener.stop()
             self.keyboard_listener = None
+        
+        # Let the worker finish the lookups already queued, so every recorded
+        # event has its context before the macro is saved
+        if self._resolve_thread:
+            jobs = self._resolve_queue
+            self._resolve_queue = None
+            self._stop_worker(self._resolve_thread, jobs)
+            self._resolve_thread = None
+        
+        if self._shot_thread:
+            jobs = self._shot_queue
+            self._shot_queue = None
+            self._stop_worker(self._shot_thread, jobs)
+            self._shot_thread = None
+    
+    def _stop_worker(self, thread: threading.Thread, jobs: queue.Queue):
+        """Queue the None sentinel for a worker and wait for it to finish.
+        
+        Never blocks for longer than WORKER_STOP_TIMEOUT at either step, so a
+        stuck worker cannot keep stop_recording holding the lock.
+        """
+        try:
+            jobs.put(None, timeout=WORKER_STOP_TIMEOUT)
+        except queue.Full:
+            self.logger.warning(f"{thread.name} worker is not draining its queue; dropping pending jobs")
+            while True:
+                try:
+                    jobs.get_nowait()
+                except queue.Empty:
+                    pass
+                try:
+                    jobs.put_nowait(None)
+                    break
+                except queue.Full:
+                    continue
+        
+        thread.join(timeout=WORKER_STOP_TIMEOUT)
+        if thread.is_alive():
+            self.logger.warning(f"{thread.name} worker did not stop within {WORKER_STOP_TIMEOUT}s")
+    
+    def _resolve_worker(self, jobs: queue.Queue):
+        """Attach UI context to recorded events until a None sentinel arrives."""
+        # UI Automation is COM; each thread using it must initialize COM itself
+        try:
+            import comtypes
+            comtypes.CoInitializeEx()
+        except Exception:
+            comtypes = None
+        
+        # (x, y, event timestamp, ui_context) of the last lookup, for coalescing bursts
+        last_resolved = None
+        
+        try:
+            while True:
+                job = jobs.get()
+                if job is None:
+                    return
+                event, x, y, source = job
+                
+                if source is not None:
+                    # Jobs run in order, so the source event is already resolved
+                    event.ui_context = dict(source.ui_context) if source.ui_context else None
+                    continue
+                
+                if last_resolved is not None:
+                    last_x, last_y, last_time, last_context = last_resolved
+                    if (event.timestamp - last_time <= UI_CONTEXT_COALESCE_WINDOW
+                            and abs(x - last_x) + abs(y - last_y) <= self.mouse_move_threshold):
+                        event.ui_context = dict(last_context) if last_context else None
+                        # Slide the window so a whole burst shares the first lookup
+                        last_resolved = (last_x, last_y, event.timestamp, last_context)
+                        continue
+                
+                try:
+                    event.ui_context = self._get_element_at_point(x, y)
+                except Exception as e:
+                    # Keep the worker alive; the event is saved without context
+                    self.logger.warning(f"Failed to resolve UI context at ({x}, {y}): {str(e)}")
+                    event.ui_context = None
+                last_resolved = (x, y, event.timestamp, event.ui_context)
+                if self._debug and event.ui_context:
+                    self.logger.debug(f"Resolved {event.event_type.value} at ({x}, {y}) to {event.ui_context.get('control_type', 'Unknown')} '{event.ui_context.get('text', '')}'")
+        finally:
+            if comtypes is not None:
+                comtypes.CoUninitialize()
+    
+    def _request_ui_context(self, event: MacroEvent, x: int, y: int, source: Optional[MacroEvent] = None):
+        """Resolve the UI element at (x, y) for an event, in the background while recording.
+        
+        With a source event, its UI context is copied instead of resolved.
+        """
+        if not self.capture_ui_context:
+            return
+        
+        jobs = self._resolve_queue
+        if jobs is None:
+            # Listeners are stopped (e.g. the final text commit); resolve inline
+            if source is not None:
+                event.ui_context = dict(source.ui_context) if source.ui_context else None
+            else:
+                event.ui_context = self._get_element_at_point(x, y)
+            return
+        
+        job = (event, x, y, source)
+        try:
+            jobs.put_nowait(job)
+        except queue.Full:
+            # Keep the newest lookups; the dropped event is saved without context
+            try:
+                dropped = jobs.get_nowait()
+            except queue.Empty:
+                dropped = job
+            if dropped is None:
+                # Listeners are stopping; keep the sentinel and skip this lookup
+                jobs.put_nowait(None)
+                return
+            self.logger.debug("UI context queue full; dropped the oldest lookup")
+            try:
+                jobs.put_nowait(job)
+            except queue.Full:
+                pass
+    
+    def _screenshot_worker(self, jobs: queue.Queue):
+        """Write queued event screenshots until a None sentinel arrives."""
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            event, frame, output_path, action_type, action_data = job
+            try:
+                event.screenshot_path = self._create_full_screen_screenshot_with_indicators(
+                    output_path, action_type, action_data, self._frame_to_rgba(frame)
+                )
+            except Exception as e:
+                # Keep the worker alive; the event is saved without a screenshot
+                self.logger.warning(f"Failed to write {action_type} screenshot: {str(e)}")
+    
+    def _request_screenshot(self, event: MacroEvent, prefix: str, action_data: Optional[Dict] = None):
+        """Screenshot the screen for an event, writing the file in the background while recording."""
+        if not self.capture_screenshots:
+            return
+        
+        jobs = self._shot_queue
+        if jobs is None:
+            event.screenshot_path = self._take_screenshot(prefix, action_data)
+            return
+        
+        if jobs.full():
+            # Never block the listener; the event is saved without a screenshot
+            if self._debug:
+                self.logger.debug(f"Screenshot queue full; skipped {prefix} screenshot")
+            return
+        
+        try:
+            output_path = self._next_screenshot_path(prefix)
+            if output_path is None:
+                return
+            # Grab now so the screenshot shows the screen at the time of the event
+            frame = self._grab_screen()
+        except Exception as e:
+            self.logger.warning(f"Failed to take screenshot: {str(e)}")
+            return
+        
+        try:
+            jobs.put_nowait((event, frame, output_path, prefix, action_data))
+        except queue.Full:
+            if self._debug:
+                self.logger.debug(f"Screenshot queue full; skipped {prefix} screenshot")
     
     def _on_mouse_click(self, x: int, y: int, button: mouse.Button, pressed: bool):
         """Handle mouse click events."""
@@ -255,20 +663,11 @@ class MacroRecorder:
         if not pressed:
             return
         
+        self.last_mouse_position = (x, y)
+        
         # Commit any pending text before mouse action
         self._commit_text_buffer()
         
-        # Get UI element at click location using direct detection
-        ui_element = None
-        if self.capture_ui_context:
-            ui_element = self._get_element_at_point(x, y)
-        
-        # Take focused screenshot if enabled
-        screenshot_path = None
-        if self.capture_screenshots:
-            action_data = {"x": x, "y": y, "button": button.name}
-            screenshot_path = self._take_screenshot("click", action_data)
-        
         event = MacroEvent(
             event_type=MacroEventType.MOUSE_CLICK,
             timestamp=time.time(),
@@ -276,18 +675,18 @@ class MacroRecorder:
                 "x": x,
                 "y": y,
                 "button": button.name,
-                "screen_size": pyautogui.size()
-            },
-            ui_context=ui_element,  # Store the detected UI element
-            screenshot_path=screenshot_path
+                "screen_size": self._screen_size
+            }
         )
         
         self.events.append(event)
         
-        # Enhanced logging with UI element info
-        if ui_element:
-            self.logger.debug(f"Recorded mouse click at ({x}, {y}) with {button.name} on {ui_element.get('control_type', 'Unknown')} '{ui_element.get('text', '')}'")
-        else:
+        # Take focused screenshot if enabled
+        self._request_screenshot(event, "click", {"x": x, "y": y, "button": button.name})
+        
+        # The UI element at the click location is attached by the worker
+        self._request_ui_context(event, x, y)
+        if self._debug:
             self.logger.debug(f"Recorded mouse click at ({x}, {y}) with {button.name}")
     
     def _on_mouse_move(self, x: int, y: int):
@@ -315,12 +714,13 @@ class MacroRecorder:
                 "scroll_dx": dx,
                 "scroll_dy": dy,
                 "action": "scroll",
-                "screen_size": pyautogui.size()
+                "screen_size": self._screen_size
             }
         )
         
         self.events.append(event)
-        self.logger.debug(f"Recorded mouse scroll at ({x}, {y}) dx={dx}, dy={dy}")
+        if self._debug:
+            self.logger.debug(f"Recorded mouse scroll at ({x}, {y}) dx={dx}, dy={dy}")
     
     def _on_key_press(self, key):
         """Handle key press events."""
@@ -331,14 +731,15 @@ class MacroRecorder:
             # Handle special keys
             if hasattr(key, 'name'):
                 key_name = key.name
+                key_lower = key_name.lower()
                 
                 # Skip F9 key presses (recording control)
-                if key_name.lower() == 'f9':
+                if key_lower == 'f9':
                     self.logger.debug("Ignoring F9 key press (recording control)")
                     return
                 
                 # Check if this is a commit event
-                if key_name.lower() in self.keyboard_commit_events:
+                if key_lower in self._commit_keys:
                     self._commit_text_buffer()
                     
                     # Record the key press
@@ -351,26 +752,29 @@ class MacroRecorder:
                         }
                     )
                     self.events.append(event)
-                    self.logger.debug(f"Recorded special key: {key_name}")
+                    if self._debug:
+                        self.logger.debug(f"Recorded special key: {key_name}")
                 
                 # Handle backspace and delete - modify text buffer instead of recording
-                elif key_name.lower() in ['backspace', 'delete']:
-                    if key_name.lower() == 'backspace' and self.current_text_buffer:
+                elif key_lower in EDIT_KEYS:
+                    if key_lower == 'backspace' and self.current_text_buffer:
                         # Remove last character from buffer
-                        self.current_text_buffer = self.current_text_buffer[:-1]
-                        self.logger.debug(f"Backspace: removed character (buffer: '{self.current_text_buffer}')")
-                    elif key_name.lower() == 'delete':
+                        self.current_text_buffer.pop()
+                        if self._debug:
+                            self.logger.debug(f"Backspace: removed character (buffer: {len(self.current_text_buffer)} chars)")
+                    elif key_lower == 'delete':
                         # For delete, we can't easily handle cursor position in buffer, so just log it
-                        self.logger.debug(f"Delete key pressed (buffer unchanged: '{self.current_text_buffer}')")
+                        if self._debug:
+                            self.logger.debug(f"Delete key pressed (buffer unchanged: {len(self.current_text_buffer)} chars)")
                     # Don't record backspace/delete as separate events
                 
                 # Handle modifier keys and other special keys
-                elif key_name in ['ctrl_l', 'ctrl_r', 'alt_l', 'alt_r', 'shift', 'shift_r', 'cmd']:
+                elif key_lower in MODIFIER_KEYS:
                     # Don't record modifier keys alone, they'll be captured in hotkey combinations
                     pass
                 else:
                     # Other special keys (arrows, function keys, etc.) - only record if they're not editing keys
-                    if key_name.lower() not in ['left', 'right', 'up', 'down', 'home', 'end', 'page_up', 'page_down']:
+                    if key_lower not in NAVIGATION_KEYS:
                         event = MacroEvent(
                             event_type=MacroEventType.KEYBOARD_KEY,
                             timestamp=time.time(),
@@ -380,15 +784,18 @@ class MacroRecorder:
                             }
                         )
                         self.events.append(event)
-                        self.logger.debug(f"Recorded special key: {key_name}")
+                        if self._debug:
+                            self.logger.debug(f"Recorded special key: {key_name}")
                     else:
-                        self.logger.debug(f"Ignored navigation key: {key_name}")
+                        if self._debug:
+                            self.logger.debug(f"Ignored navigation key: {key_name}")
             
             # Handle regular character keys
             elif hasattr(key, 'char') and key.char:
                 # Add to text buffer
-                self.current_text_buffer += key.char
-                self.logger.debug(f"Added to text buffer: '{key.char}' (buffer: '{self.current_text_buffer}')")
+                self.current_text_buffer.append(key.char)
+                if self._debug:
+                    self.logger.debug(f"Added to text buffer: '{key.char}' (buffer: {len(self.current_text_buffer)} chars)")
             
         except Exception as e:
             self.logger.error(f"Error handling key press: {str(e)}")
@@ -400,184 +807,267 @@ class MacroRecorder:
     
     def _commit_text_buffer(self):
         """Commit the current text buffer as a keyboard event."""
-        if not self.current_text_buffer.strip():
+        text = "".join(self.current_text_buffer)
+        if not text.strip():
             return
         
-        # Get current cursor position for context
-        cursor_pos = pyautogui.position()
-        
-        # Get UI element for text input using direct detection
-        ui_element = None
-        if self.capture_ui_context:
-            ui_element = self._get_element_at_point(cursor_pos[0], cursor_pos[1])
-        
-        # Take focused screenshot for text input
-        screenshot_path = None
-        if self.capture_screenshots:
-            action_data = {"x": cursor_pos[0], "y": cursor_pos[1], "text": self.current_text_buffer}
-            screenshot_path = self._take_screenshot("type", action_data)
+        # The mouse listener keeps this current, so there is no need to query
+        cursor_pos = self.last_mouse_position
+        foreground = self._foreground_window()
         
         event = MacroEvent(
             event_type=MacroEventType.KEYBOARD_TYPE,
             timestamp=time.time(),
             data={
-                "text": self.current_text_buffer,
+                "text": text,
                 "cursor_position": cursor_pos
-            },
-            ui_context=ui_element,  # Store the detected UI element
-            screenshot_path=screenshot_path
+            }
         )
         
         self.events.append(event)
         
-        # Enhanced logging with UI element info
-        if ui_element:
-            self.logger.debug(f"Committed text: '{self.current_text_buffer}' to {ui_element.get('control_type', 'Unknown')} '{ui_element.get('text', '')}'")
+        # Repeated commits into the same window with the mouse where it was
+        # (e.g. filling a form with Tab) resolve to the same element; reuse
+        # the previous commit's context and skip the screenshot
+        previous = self._last_text_commit
+        if (previous is not None and foreground and previous[0] == foreground
+                and abs(cursor_pos[0] - previous[1][0]) + abs(cursor_pos[1] - previous[1][1]) <= self.mouse_move_threshold):
+            event.data["reused_context"] = True
+            self._request_ui_context(event, cursor_pos[0], cursor_pos[1], source=previous[2])
+            if self._debug:
+                self.logger.debug(f"Committed text: '{text}' (reusing previous context)")
         else:
-            self.logger.debug(f"Committed text: '{self.current_text_buffer}'")
+            self._last_text_commit = (foreground, cursor_pos, event)
+            
+            # Take focused screenshot for text input
+            self._request_screenshot(
+                event, "type", {"x": cursor_pos[0], "y": cursor_pos[1], "text": text}
+            )
+            
+            # The UI element receiving the text is attached by the worker
+            self._request_ui_context(event, cursor_pos[0], cursor_pos[1])
+            if self._debug:
+                self.logger.debug(f"Committed text: '{text}'")
         
         # Clear the buffer
-        self.current_text_buffer = ""
+        self.current_text_buffer.clear()
+    
+    @staticmethod
+    def _foreground_window() -> int:
+        """Get the foreground window handle, or 0 when it cannot be determined."""
+        if not WIN32_AVAILABLE:
+            return 0
+        try:
+            return win32gui.GetForegroundWindow()
+        except Exception:
+            return 0
     
     def _get_element_at_point(self, x: int, y: int) -> Optional[Dict[str, Any]]:
+        """Get the UI element at the specified coordinates, reusing recent lookups nearby.
+        
+        Bursts of clicks and text commits at the same spot would otherwise repeat
+        the whole accessibility walk; results are kept per 8x8 pixel cell for
+        ui_context_cache_duration seconds.
+        """
+        key = (x >> UI_CONTEXT_CELL_SHIFT, y >> UI_CONTEXT_CELL_SHIFT)
+        now = time.monotonic()
+        cached = self._ui_context_cache.get(key)
+        if cached is not None and now - cached[0] < self.ui_context_cache_duration:
+            self._ui_context_cache.move_to_end(key)
+            # Each event gets its own copy, since events are serialized separately
+            return dict(cached[1])
+        
+        element = self._resolve_element_at_point(x, y)
+        self.last_ui_context_time = now
+        if element is not None:
+            self._ui_context_cache[key] = (now, element)
+            self._ui_context_cache.move_to_end(key)
+            while len(self._ui_context_cache) > UI_CONTEXT_CACHE_SIZE:
+                self._ui_context_cache.popitem(last=False)
+            return dict(element)
+        return None
+    
+    def _element_from_point(self, x: int, y: int) -> Optional[Dict[str, Any]]:
+        """Hit-test the point with UI Automation's ElementFromPoint in a single call."""
+        if not UIA_AVAILABLE:
+            return None
+        
+        try:
+            info = UIAElementInfo.from_point(x, y)
+            rect = info.rectangle
+        except Exception as e:
+            if self._debug:
+                self.logger.debug(f"ElementFromPoint failed at ({x}, {y}): {e}")
+            return None
+        
+        if rect.width() <= 0 or rect.height() <= 0:
+            return None
+        
+        return {
+            "control_type": info.control_type or "Unknown",
+            "text": info.name or "",
+            "position": {
+                "left": rect.left,
+                "top": rect.top,
+                "right": rect.right,
+                "bottom": rect.bottom,
+                "width": rect.width(),
+                "height": rect.height()
+            },
+            "distance": 0,
+            "properties": {
+                "class_name": info.class_name or "",
+                "automation_id": info.automation_id or "",
+                "detection_method": "uia_element_from_point"
+            }
+        }
+    
+    def _resolve_element_at_point(self, x: int, y: int) -> Optional[Dict[str, Any]]:
         """Get the UI element directly at the specified coordinates using accessibility APIs."""
+        element = self._element_from_point(x, y)
+        if element is not None:
+            if self._debug:
+                self.logger.debug(f"Found element via ElementFromPoint: {element['control_type']} '{element['text']}'")
+            return element
+        
         try:
-            # Use the new accessibility-based element finding
-            from ..hierarchical_ui_explorer import analyze_ui_hierarchy
-            
-            # Analyze a small region around the click point using accessibility APIs
-            region_size = 200
-            region = (
-                max(0, x - region_size // 2),
-                max(0, y - region_size // 2), 
-                min(pyautogui.size()[0], x + region_size // 2),
-                min(pyautogui.size()[1], y + region_size // 2)
-            )
-            
-            self.logger.debug(f"Analyzing UI at point ({x}, {y}) with region {region}")
-            
-            # Get UI hierarchy using the accessibility-first approach
-            ui_hierarchy = analyze_ui_hierarchy(
-                region=region,
-                max_depth=8,
-                focus_only=True,
-                min_size=5,
-                visible_only=True
-            )
-            
-            if ui_hierarchy:
-                # Find the element that contains our click point
-                element = self._find_closest_element(ui_hierarchy, x, y)
-                if element:
-                    # Add detection method metadata
-                    element["properties"] = element.get("properties", {})
-                    element["properties"]["detection_method"] = "accessibility_hierarchy"
-                    element["distance"] = 0  # Point is inside element
-                    
-                    self.logger.debug(f"Found element via accessibility: {element.get('control_type')} '{element.get('text')}'")
-                    return element
-            
-            # Fallback: try to find any nearby elements if no direct hit
-            self.logger.debug(f"No element found at exact point, searching nearby")
-            closest_element = self._find_closest_element(ui_hierarchy, x, y)
-            if closest_element:
-                closest_element["properties"] = closest_element.get("properties", {})
-                closest_element["properties"]["detection_method"] = "accessibility_nearby"
-                
-                self.logger.debug(f"Found nearby element via accessibility: {closest_element.get('control_type')} '{closest_element.get('text')}' distance={closest_element.get('distance', 0)}")
-                return closest_element
+            # Query the point against the focused window's hierarchy snapshot
+            element = self._find_closest_element(self._hierarchy_snapshot(), x, y)
+            if element:
+                if element["distance"] == 0:
+                    if self._debug:
+                        self.logger.debug(f"Found element via accessibility: {element.get('control_type')} '{element.get('text')}'")
+                else:
+                    if self._debug:
+                        self.logger.debug(f"Found nearby element via accessibility: {element.get('control_type')} '{element.get('text')}' distance={element['distance']}")
+                return element
             
             # Final fallback: basic window detection
-            self.logger.debug(f"Accessibility detection failed, falling back to basic window detection")
+            self.logger.debug("Accessibility detection failed, falling back to basic window detection")
             return self._get_basic_window_info(x, y)
                 
         except Exception as e:
             self.logger.warning(f"Failed to get element at point ({x}, {y}): {str(e)}")
             return self._get_basic_window_info(x, y)
     
-    def _find_closest_element(self, ui_hierarchy: List[Dict], x: int, y: int) -> Optional[Dict[str, Any]]:
-        """Find the UI element that contains the specified position, or the closest one if none contain it."""
-        containing_elements = []
-        closest_element = None
-        min_distance = float('inf')
+    def _hierarchy_snapshot(self) -> List[SnapshotEntry]:
+        """Get the focused window's UI elements, rebuilt when focus moves or the snapshot expires.
         
-        def check_element(element):
-            nonlocal closest_element, min_distance
-            
-            if 'position' not in element:
-                return
-            
-            pos = element['position']
+        Elements are flattened to SnapshotEntry tuples and sorted by area, so
+        the first entry containing a point is the most specific element there.
+        Centers are stored doubled so distances stay in integer arithmetic.
+        """
+        foreground = self._foreground_window()
+        now = time.monotonic()
+        snapshot = self._hierarchy_snapshot_data
+        if (snapshot is not None and snapshot[0] == foreground
+                and now - snapshot[1] < self.ui_context_cache_duration):
+            return snapshot[2]
+        
+        if self._debug:
+            self.logger.debug(f"Building UI hierarchy snapshot for window {foreground}")
+        ui_hierarchy = analyze_ui_hierarchy(
+            region=None,
+            max_depth=8,
+            focus_only=True,
+            min_size=5,
+            visible_only=True
+        )
+        
+        entries = []
+        pending = list(ui_hierarchy)
+        while pending:
+            element = pending.pop()
+            pending.extend(element.get('children', ()))
+            pos = element.get('position')
+            if pos is None:
+                continue
             left = pos.get('left', 0)
             top = pos.get('top', 0)
             right = pos.get('right', 0)
             bottom = pos.get('bottom', 0)
-            
-            # Check if the point is within the element bounds
-            if left <= x <= right and top <= y <= bottom:
-                containing_elements.append({
-                    "control_type": element.get('control_type', 'Unknown'),
-                    "text": element.get('text', ''),
-                    "position": pos,
-                    "distance": 0,  # Point is inside, so distance is 0
-                    "properties": element.get('properties', {}),
-                    "area": (right - left) * (bottom - top)  # For sorting by size
-                })
-            else:
-                # Calculate distance to the center of the element
-                center_x = (left + right) / 2
-                center_y = (top + bottom) / 2
-                distance = ((x - center_x) ** 2 + (y - center_y) ** 2) ** 0.5
-                
-                # Only consider reasonably close elements (within 100 pixels)
-                if distance < min_distance and distance <= 100:
-                    min_distance = distance
-                    closest_element = {
-                        "control_type": element.get('control_type', 'Unknown'),
-                        "text": element.get('text', ''),
-                        "position": pos,
-                        "distance": distance,
-                        "properties": element.get('properties', {})
-                    }
-            
-            # Check children
-            if 'children' in element:
-                for child in element['children']:
-                    check_element(child)
+            entries.append((
+                (right - left) * (bottom - top), left, top, right, bottom,
+                left + right, top + bottom, element
+            ))
+        entries.sort(key=itemgetter(0))
         
-        for element in ui_hierarchy:
-            check_element(element)
+        self._hierarchy_snapshot_data = (foreground, now, entries)
+        return entries
+    
+    def _find_closest_element(
+        self,
+        entries: List[SnapshotEntry],
+        x: int,
+        y: int
+    ) -> Optional[Dict[str, Any]]:
+        """Find the smallest snapshot element containing the position, or the closest one nearby."""
+        closest = None
+        # Squared distances in doubled coordinates; no division or sqrt per element
+        x2 = 2 * x
+        y2 = 2 * y
+        min_distance_sq = (2 * NEARBY_ELEMENT_DISTANCE) ** 2
         
-        # If we found elements that contain the point, return the smallest one
-        # (most specific/deepest in the hierarchy)
-        if containing_elements:
-            # Sort by area (smallest first) to get the most specific element
-            containing_elements.sort(key=lambda e: e['area'])
-            return containing_elements[0]
+        for _, left, top, right, bottom, center_x2, center_y2, element in entries:
+            if left <= x <= right and top <= y <= bottom:
+                # Sorted by area, so this is the most specific element containing the point
+                return self._element_context(element, 0, "accessibility_hierarchy")
+            
+            dx = x2 - center_x2
+            dy = y2 - center_y2
+            distance_sq = dx * dx + dy * dy
+            if distance_sq <= min_distance_sq:
+                min_distance_sq = distance_sq
+                closest = element
         
-        # If no element contains the point, return the closest one
-        return closest_element
+        if closest is None:
+            return None
+        # Only the winner's real distance is computed
+        return self._element_context(closest, min_distance_sq ** 0.5 / 2, "accessibility_nearby")
+    
+    @staticmethod
+    def _element_context(element: Dict[str, Any], distance: float, detection_method: str) -> Dict[str, Any]:
+        """Build an event's UI context from a snapshot element without modifying the snapshot."""
+        return {
+            "control_type": element.get('control_type', 'Unknown'),
+            "text": element.get('text', ''),
+            "position": element['position'],
+            "distance": distance,
+            "properties": {**element.get('properties', {}), "detection_method": detection_method}
+        }
+    
+    def _hwnd_info(self, hwnd: int) -> Tuple[str, str, Tuple[int, int, int, int]]:
+        """Get (class name, title, rect) of a window, reusing results for HWND_INFO_TTL seconds."""
+        now = time.monotonic()
+        cached = self._hwnd_info_cache.get(hwnd)
+        if cached is not None and now - cached[0] < HWND_INFO_TTL:
+            return cached[1:]
+        
+        info = (win32gui.GetClassName(hwnd), win32gui.GetWindowText(hwnd), win32gui.GetWindowRect(hwnd))
+        if len(self._hwnd_info_cache) >= UI_CONTEXT_CACHE_SIZE:
+            self._hwnd_info_cache.clear()
+        self._hwnd_info_cache[hwnd] = (now, *info)
+        return info
     
     def _get_basic_window_info(self, x: int, y: int) -> Optional[Dict[str, Any]]:
         """Get basic window information as a fallback."""
+        if not WIN32_AVAILABLE:
+            return None
+        
         try:
-            import win32gui
-            
             hwnd = win32gui.WindowFromPoint((x, y))
             if hwnd:
-                window_title = win32gui.GetWindowText(hwnd)
-                window_class = win32gui.GetClassName(hwnd)
-                rect = win32gui.GetWindowRect(hwnd)
+                window_class, window_title, rect = self._hwnd_info(hwnd)
                 
                 # Simple application detection
-                app_name = window_title
+                title_lower = window_title.lower()
                 if window_class in ['MSTaskSwWClass', 'Shell_TrayWnd']:
                     app_name = "Taskbar Button"
-                elif "firefox" in window_title.lower():
+                elif "firefox" in title_lower:
                     app_name = "Firefox"
-                elif "chrome" in window_title.lower():
+                elif "chrome" in title_lower:
                     app_name = "Chrome"
-                elif "edge" in window_title.lower():
+                elif "edge" in title_lower:
                     app_name = "Microsoft Edge"
                 elif window_title:
                     app_name = window_title
@@ -604,21 +1094,29 @@ class MacroRecorder:
             return None
             
         except Exception as e:
-            self.logger.debug(f"Basic window info failed: {e}")
+            if self._debug:
+                self.logger.debug(f"Basic window info failed: {e}")
             return None
     
+    def _next_screenshot_path(self, prefix: str) -> Optional[Path]:
+        """Reserve the file path for the next screenshot in the package."""
+        if not self.macro_package_dir:
+            return None
+        
+        self.screenshot_counter += 1
+        screenshot_filename = f"{self.screenshot_counter:03d}_{prefix}.png"
+        screenshot_path = self.macro_package_dir / "screenshots" / screenshot_filename
+        
+        # Ensure screenshots directory exists
+        screenshot_path.parent.mkdir(exist_ok=True)
+        return screenshot_path
+    
     def _take_screenshot(self, prefix: str = "macro", action_data: Optional[Dict] = None) -> Optional[str]:
         """Take a full-screen screenshot with action indicators."""
         try:
-            if not self.macro_package_dir:
+            screenshot_path = self._next_screenshot_path(prefix)
+            if screenshot_path is None:
                 return None
-                
-            self.screenshot_counter += 1
-            screenshot_filename = f"{self.screenshot_counter:03d}_{prefix}.png"
-            screenshot_path = self.macro_package_dir / "screenshots" / screenshot_filename
-            
-            # Ensure screenshots directory exists
-            screenshot_path.parent.mkdir(exist_ok=True)
             
             # Always take full screen screenshot with action indicators
             return self._create_full_screen_screenshot_with_indicators(screenshot_path, prefix, action_data)
@@ -627,14 +1125,17 @@ class MacroRecorder:
             self.logger.warning(f"Failed to take screenshot: {str(e)}")
             return None
     
-    def _create_full_screen_screenshot_with_indicators(self, output_path: Path, action_type: str, action_data: Optional[Dict] = None) -> str:
+    def _create_full_screen_screenshot_with_indicators(
+        self,
+        output_path: Path,
+        action_type: str,
+        action_data: Optional[Dict] = None,
+        screen: Optional[Image.Image] = None
+    ) -> str:
         """Create a full-screen screenshot with visual indicators for the action."""
         try:
-            # Take full screen screenshot
-            screenshot = pyautogui.screenshot()
-            
-            # Convert to RGBA for overlay effects
-            enhanced = screenshot.convert("RGBA")
+            # Take full screen screenshot (unless already captured), converted to RGBA for overlay effects
+            enhanced = screen if screen is not None else self._capture_screen_rgba()
             overlay = Image.new("RGBA", enhanced.size, (0, 0, 0, 0))
             draw = ImageDraw.Draw(overlay)
             
@@ -674,36 +1175,68 @@ class MacroRecorder:
             
             # Combine original image with overlay
             final_image = Image.alpha_composite(enhanced, overlay)
-            final_image.save(str(output_path))
+            buffer = io.BytesIO()
+            final_image.save(buffer, format="PNG")
+            png_data = buffer.getvalue()
+            output_path.write_bytes(png_data)
             
-            return str(output_path.relative_to(self.macro_package_dir))
+            relative_path = output_path.relative_to(self.macro_package_dir)
+            with self._zip_lock:
+                if self._package_zip is not None:
+                    # PNGs are already deflated; store them as-is
+                    self._package_zip.writestr(relative_path.as_posix(), png_data, compress_type=zipfile.ZIP_STORED)
+            
+            return str(relative_path)
             
         except Exception as e:
             self.logger.warning(f"Failed to create full screen screenshot: {str(e)}")
             return None
     
+    def _capture_screen_rgba(self) -> Image.Image:
+        """Capture the screen as an RGBA image."""
+        return self._frame_to_rgba(self._grab_screen())
+    
+    def _grab_screen(self) -> Any:
+        """Grab the screen as a raw BGRA frame, or a PIL image when mss is unavailable."""
+        if self.frame_function is not None:
+            return self.frame_function()
+        if not MSS_AVAILABLE:
+            return pyautogui.screenshot()
+        
+        with self._sct_lock:
+            if self._sct is None:
+                self._sct = mss.mss()
+            sct_img = self._sct.grab(self._sct.monitors[1])
+        width, height = sct_img.size
+        return memoryview(sct_img.raw).cast("B", (height, width, 4))
+    
+    def _close_screen_capture(self):
+        """Close the recorder's own mss instance, if one was created."""
+        with self._sct_lock:
+            if self._sct is not None:
+                self._sct.close()
+                self._sct = None
+    
+    def _frame_to_rgba(self, frame: Any) -> Image.Image:
+        """Decode a grabbed frame to RGBA, skipping decoding if the screen has not changed."""
+        if isinstance(frame, Image.Image):
+            return frame.convert("RGBA")
+        
+        if self._last_frame_image is not None and frame == self._last_frame:
+            # Overlays are drawn on a separate layer, so the cached image is never modified
+            return self._last_frame_image
+        
+        height, width = frame.shape[:2]
+        image = Image.frombytes("RGB", (width, height), frame, "raw", "BGRX").convert("RGBA")
+        self._last_frame = frame
+        self._last_frame_image = image
+        return image
+    
     def _add_coordinate_annotation(self, draw: ImageDraw.Draw, x: int, y: int, image_size: tuple, action_type: str):
         """Add coordinate annotation to the screenshot."""
         try:
             # Try to use a better font if available
-            try:
-                from PIL import ImageFont
-                font_size = 14
-                try:
-                    # Windows
-                    font = ImageFont.truetype("arial.ttf", font_size)
-                except:
-                    try:
-                        # macOS
-                        font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", font_size)
-                    except:
-                        try:
-                            # Linux
-                            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", font_size)
-                        except:
-                            font = ImageFont.load_default()
-            except ImportError:
-                font = None
+            font = _annotation_font(14)
             
             # Coordinate text
             coord_text = f"({x}, {y})"
@@ -781,20 +1314,12 @@ class MacroRecorder:
         """Add metadata information to the screenshot."""
         try:
             # Try to get a font
-            try:
-                from PIL import ImageFont
-                try:
-                    font = ImageFont.truetype("arial.ttf", 12)
-                except:
-                    font = ImageFont.load_default()
-            except ImportError:
-                font = None
+            font = _metadata_font(12)
             
             # Create metadata text
             metadata_lines = []
             
             # Add timestamp
-            from datetime import datetime
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             metadata_lines.append(f"Captured: {timestamp}")
             
@@ -860,14 +1385,7 @@ class MacroRecorder:
     
     def _record_initial_state(self):
         """Record the initial state when starting recording."""
-        screenshot_path = None
-        if self.capture_screenshots:
-            screenshot_path = self._take_screenshot("initial_state")
-        
-        cursor_pos = pyautogui.position()
-        ui_context = None
-        if self.capture_ui_context:
-            ui_context = self._get_element_at_point(cursor_pos[0], cursor_pos[1])
+        cursor_pos = tuple(pyautogui.position())
         
         event = MacroEvent(
             event_type=MacroEventType.SCREENSHOT,
@@ -875,13 +1393,15 @@ class MacroRecorder:
             data={
                 "action": "initial_state",
                 "cursor_position": cursor_pos,
-                "screen_size": pyautogui.size()
-            },
-            ui_context=ui_context,
-            screenshot_path=screenshot_path
+                "screen_size": self._screen_size
+            }
         )
         
         self.events.append(event)
+        
+        # Listeners are already running, so both are filled in by the workers
+        self._request_screenshot(event, "initial_state")
+        self._request_ui_context(event, cursor_pos[0], cursor_pos[1])
     
     def _record_final_state(self):
         """Record the final state when stopping recording."""
@@ -889,7 +1409,7 @@ class MacroRecorder:
         if self.capture_screenshots:
             screenshot_path = self._take_screenshot("final_state")
         
-        cursor_pos = pyautogui.position()
+        cursor_pos = tuple(pyautogui.position())
         
         event = MacroEvent(
             event_type=MacroEventType.SCREENSHOT,
@@ -897,7 +1417,7 @@ class MacroRecorder:
             data={
                 "action": "final_state",
                 "cursor_position": cursor_pos,
-                "screen_size": pyautogui.size()
+                "screen_size": self._screen_size
             },
             screenshot_path=screenshot_path
         )
@@ -907,21 +1427,19 @@ class MacroRecorder:
     def _save_macro(self, output_format: str = "both") -> Dict[str, Any]:
         """Save the recorded macro as an organized package."""
         try:
+            events = list(self.events)
+            
             # Use existing package directory or create one if not exists
             if not self.macro_package_dir:
                 # Fallback: create package directory if not already created
-                safe_name = "".join(c for c in self.current_macro["name"] if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                package_name = f"{safe_name}_{timestamp}"
-                
-                self.macro_package_dir = Path("macros") / package_name
+                self.macro_package_dir = Path("macros") / self._package_name
                 self.macro_package_dir.mkdir(parents=True, exist_ok=True)
                 (self.macro_package_dir / "screenshots").mkdir(exist_ok=True)
             
             package_name = self.macro_package_dir.name
             
             # Update screenshot paths to be relative to package (if needed)
-            for event in self.events:
+            for event in events:
                 if event.screenshot_path and not event.screenshot_path.startswith("screenshots/"):
                     # Move existing screenshots to package directory if they exist
                     old_path = Path(event.screenshot_path)
@@ -932,7 +1450,7 @@ class MacroRecorder:
             
             # Create clean macro data for JSON (without screenshots, internal events)
             clean_events = []
-            for event in self.events:
+            for event in events:
                 # Skip internal recording events
                 if (event.event_type == MacroEventType.SCREENSHOT and 
                     event.data.get("action") in ["initial_state", "final_state"]):
@@ -981,7 +1499,7 @@ class MacroRecorder:
                 "events": clean_events,
                 "metadata": {
                     "total_events": len(clean_events),
-                    "duration": self.events[-1].timestamp - self.events[0].timestamp if self.events else 0,
+                    "duration": events[-1].timestamp - events[0].timestamp if events else 0,
                     "recording_settings": {
                         "capture_ui_context": self.capture_ui_context,
                         "capture_screenshots": self.capture_screenshots,
@@ -1000,13 +1518,13 @@ class MacroRecorder:
             # Prepare full macro data with screenshots for Python generation
             full_macro_data = {
                 **self.current_macro,
-                "events": [event.to_dict() for event in self.events],
+                "events": [event.to_dict() for event in events],
                 "metadata": {
                     **clean_macro_data["metadata"],
                     "package_info": {
                         "package_name": package_name,
                         "created_at": datetime.now().isoformat(),
-                        "screenshots_count": len([e for e in self.events if e.screenshot_path]),
+                        "screenshots_count": len([e for e in events if e.screenshot_path]),
                         "structure": {
                             "macro.json": "Clean macro data without screenshots",
                             "macro.py": "Executable Python script",
@@ -1022,8 +1540,14 @@ class MacroRecorder:
             # Save clean JSON format (without screenshots)
             if output_format in ["json", "both"]:
                 json_path = self.macro_package_dir / "macro.json"
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(clean_macro_data, f, indent=2, ensure_ascii=False)
+                if ORJSON_AVAILABLE:
+                    # orjson encodes straight to UTF-8 bytes, much faster for long macros
+                    json_path.write_bytes(orjson.dumps(clean_macro_data, option=orjson.OPT_INDENT_2))
+                else:
+                    # Serialize first and write once; json.dump issues a write()
+                    # per encoded fragment
+                    with open(json_path, 'w', encoding='utf-8') as f:
+                        f.write(json.dumps(clean_macro_data, indent=2, ensure_ascii=False))
                 saved_files.append(str(json_path))
             
             # Save Python format (with screenshot references for debugging)
@@ -1041,15 +1565,19 @@ class MacroRecorder:
                 f.write(readme_content)
             saved_files.append(str(readme_path))
             
-            # Create ZIP package
+            # Create ZIP package in the background; get_status reports when it is done
             zip_path = Path("macros") / f"{package_name}.zip"
-            self._create_zip_package(self.macro_package_dir, zip_path)
+            self._zip_jobs[package_name] = self._zip_executor.submit(
+                self._create_zip_package, self.macro_package_dir, zip_path, self._take_package_zip()
+            )
             saved_files.append(str(zip_path))
             
             return {
                 "saved_files": saved_files,
                 "package_directory": str(self.macro_package_dir),
+                "package_name": package_name,
                 "package_zip": str(zip_path),
+                "zip_state": "pending",
                 "macro_data": clean_macro_data,  # Return the clean version
                 "ui_elements_detected": clean_macro_data["metadata"]["ui_elements_detected"],
                 "element_types": clean_macro_data["metadata"]["element_types"]
@@ -1061,19 +1589,35 @@ class MacroRecorder:
                 "error": f"Failed to save macro: {str(e)}"
             }
     
-    def _create_zip_package(self, package_dir: Path, zip_path: Path):
-        """Create a ZIP file of the macro package."""
+    def _take_package_zip(self) -> Optional[zipfile.ZipFile]:
+        """Detach the recording's open package ZIP so no more screenshots are added to it."""
+        with self._zip_lock:
+            package_zip = self._package_zip
+            self._package_zip = None
+        return package_zip
+    
+    def _create_zip_package(self, package_dir: Path, zip_path: Path, zipf: Optional[zipfile.ZipFile] = None) -> Path:
+        """Create a ZIP file of the macro package, completing zipf if screenshots were streamed into it."""
         try:
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            if zipf is None:
+                zipf = zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED)
+            with zipf:
+                written = set(zipf.namelist())
                 for file_path in package_dir.rglob('*'):
                     if file_path.is_file():
-                        arcname = file_path.relative_to(package_dir)
-                        zipf.write(file_path, arcname)
+                        arcname = file_path.relative_to(package_dir).as_posix()
+                        if arcname in written:
+                            continue
+                        # PNGs are already deflated; compressing them again only costs CPU
+                        compress_type = zipfile.ZIP_STORED if file_path.suffix == ".png" else zipfile.ZIP_DEFLATED
+                        zipf.write(file_path, arcname, compress_type=compress_type)
             
             self.logger.info(f"Created macro package: {zip_path}")
+            return zip_path
             
         except Exception as e:
             self.logger.warning(f"Failed to create ZIP package: {str(e)}")
+            raise
     
     def _generate_readme(self, macro_data: Dict[str, Any]) -> str:
         """Generate a README file for the macro package."""
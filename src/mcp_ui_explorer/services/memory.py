@@ -1,17 +1,20 @@
 """Memory service for session summarization and context management."""
 
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import TYPE_CHECKING, Dict, Any, Optional, List
 
 from ..config import get_settings
 from ..utils.logging import get_logger
-from ..core.tracking import ActionLogger
+
+if TYPE_CHECKING:
+    # core imports services, so importing core here at runtime is circular
+    from ..core.tracking import ActionLogger
 
 
 class MemoryService:
     """Service for managing memory and session summarization."""
     
-    def __init__(self, action_logger: ActionLogger):
+    def __init__(self, action_logger: "ActionLogger"):
         self.settings = get_settings()
         self.logger = get_logger(__name__)
         self.action_logger = action_logger
@@ -1,6 +1,7 @@
 """UI-TARS service for element detection and analysis."""
 
 import os
+import asyncio
 import base64
 import re
 from typing import Dict, Any, Optional, Union
@@ -58,11 +59,12 @@ class UITarsService:
     
     async def analyze_image(
         self,
-        image_path: str,
+        image_path: Optional[str],
         query: str,
         api_url: Optional[str] = None,
         model_name: Optional[str] = None,
-        provider: Optional[str] = None
+        provider: Optional[str] = None,
+        image_bytes: Optional[Union[bytes, memoryview]] = None
     ) -> Dict[str, Any]:
         """
         Use UI-TARS model to identify coordinates of UI elements on screen.
@@ -73,6 +75,8 @@ class UITarsService:
             api_url: Override API URL (optional)
             model_name: Override model name (optional)
             provider: Override provider (optional)
+            image_bytes: PNG- or JPEG-encoded screenshot bytes kept in memory; used
+                instead of reading image_path when given (optional)
             
         Returns:
             Dictionary containing the analysis result with normalized coordinates
@@ -87,7 +91,7 @@ class UITarsService:
         
         # Try primary provider first
         result = await self._try_analyze_with_provider(
-            image_path, query, provider, api_url, model_name
+            image_path, query, provider, api_url, model_name, image_bytes
         )
         
         # If primary failed and fallback is enabled, try fallback providers
@@ -112,7 +116,8 @@ class UITarsService:
                 fallback_result = await self._try_analyze_with_provider(
                     image_path, query, fallback_provider,
                     fallback_config.get('api_url'),
-                    fallback_config.get('model_name')
+                    fallback_config.get('model_name'),
+                    image_bytes
                 )
                 
                 if fallback_result.get('success'):
@@ -124,28 +129,34 @@ class UITarsService:
     
     async def _try_analyze_with_provider(
         self,
-        image_path: str,
+        image_path: Optional[str],
         query: str,
         provider: str,
         api_url: str,
-        model_name: str
+        model_name: str,
+        image_bytes: Optional[Union[bytes, memoryview]] = None
     ) -> Dict[str, Any]:
         """Try to analyze image with a specific provider."""
         try:
-            # Check if image file exists
-            if not os.path.exists(image_path):
-                return {
-                    "success": False,
-                    "error": f"Image file not found: {image_path}",
-                    "provider": provider
-                }
-            
-            # Load and encode the image
-            with open(image_path, 'rb') as image_file:
-                image_data = image_file.read()
+            if image_bytes is not None:
+                # Screenshot already in memory, skip the filesystem round trip
+                image_data = image_bytes
+            else:
+                # Check if image file exists
+                if not image_path or not os.path.exists(image_path):
+                    return {
+                        "success": False,
+                        "error": f"Image file not found: {image_path}",
+                        "provider": provider
+                    }
                 
-            # Convert to base64
+                # Load and encode the image
+                with open(image_path, 'rb') as image_file:
+                    image_data = image_file.read()
+            
+            # Convert to base64; screenshots may be JPEG or PNG
             image_base64 = base64.b64encode(image_data).decode('utf-8')
+            media_type = "image/jpeg" if bytes(image_data[:2]) == b"\xff\xd8" else "image/png"
             
             # Get client for this provider
             client = self._get_client(provider, api_url)
@@ -153,16 +164,18 @@ class UITarsService:
             # Prepare the prompt based on provider
             system_prompt, user_prompt = self._get_prompts_for_provider(provider, query)
             
-            self.logger.debug(f"Analyzing image {image_path} with provider {provider}, query: {query}")
+            self.logger.debug(f"Analyzing image {image_path or '<in-memory>'} with provider {provider}, query: {query}")
             
             # Prepare messages based on provider capabilities
-            messages = self._prepare_messages(provider, system_prompt, user_prompt, image_base64)
+            messages = self._prepare_messages(provider, system_prompt, user_prompt, image_base64, media_type)
             
             # Get provider-specific settings
             provider_config = self._get_provider_settings(provider)
             
-            # Make the API call
-            response = client.chat.completions.create(
+            # Make the API call; the client is synchronous, so run it in a
+            # worker thread instead of stalling the event loop for the round trip
+            response = await asyncio.to_thread(
+                client.chat.completions.create,
                 model=model_name,
                 messages=messages,
                 max_tokens=provider_config.get('max_tokens', 150),
@@ -221,7 +234,14 @@ If you cannot find the element, respond with "Element not found"."""
         
         return system_prompt, user_prompt
     
-    def _prepare_messages(self, provider: str, system_prompt: str, user_prompt: str, image_base64: str) -> list:
+    def _prepare_messages(
+        self,
+        provider: str,
+        system_prompt: str,
+        user_prompt: str,
+        image_base64: str,
+        media_type: str = "image/png"
+    ) -> list:
         """Prepare messages in the format expected by the provider."""
         if provider == "anthropic":
             # Anthropic uses a different message format
@@ -235,7 +255,7 @@ If you cannot find the element, respond with "Element not found"."""
                             "type": "image",
                             "source": {
                                 "type": "base64",
-                                "media_type": "image/png",
+                                "media_type": media_type,
                                 "data": image_base64
                             }
                         }
@@ -253,7 +273,7 @@ If you cannot find the element, respond with "Element not found"."""
                         {
                             "type": "image_url",
                             "image_url": {
-                                "url": f"data:image/png;base64,{image_base64}"
+                                "url": f"data:{media_type};base64,{image_base64}"
                             }
                         }
                     ]
@@ -2,6 +2,7 @@
 
 import os
 import time
+import asyncio
 from typing import Dict, Any, Optional
 
 from ..config import get_settings
@@ -17,6 +18,10 @@ class VerificationService:
         self.logger = get_logger(__name__)
         self.ui_tars_service = ui_tars_service
     
+    def requires_comparison_image(self) -> bool:
+        """Whether verify_action makes use of a before image passed as comparison_image."""
+        return self.settings.ui.compare_before_after
+    
     async def verify_action(
         self,
         action_description: str,
@@ -44,7 +49,7 @@ class VerificationService:
         
         try:
             # Wait for the UI to settle after the action
-            time.sleep(timeout)
+            await asyncio.sleep(timeout)
             
             # Take a screenshot to verify the current state
             if screenshot_function:
@@ -61,7 +66,8 @@ class VerificationService:
             # Use UI-TARS to check if the expected element/state is present
             verification_result = await self.ui_tars_service.analyze_image(
                 image_path=image_path,
-                query=verification_query
+                query=verification_query,
+                image_bytes=image_data
             )
             
             # Analyze the verification result
@@ -90,13 +96,13 @@ class VerificationService:
             
             # Optional: Compare with before image if provided
             comparison_details = None
-            if comparison_image and os.path.exists(comparison_image):
+            if comparison_image and self.requires_comparison_image() and os.path.exists(comparison_image):
                 try:
-                    # Basic file comparison (could be enhanced with image diff)
-                    with open(comparison_image, 'rb') as f1, open(image_path, 'rb') as f2:
-                        before_size = len(f1.read())
-                        after_size = len(f2.read())
-                        
+                    # Basic size comparison (could be enhanced with image diff);
+                    # the after image is already in memory
+                    before_size = os.path.getsize(comparison_image)
+                    after_size = len(image_data)
+                    
                     comparison_details = {
                         "before_image": comparison_image,
                         "after_image": image_path,
@@ -2,6 +2,6 @@
 
 from .logging import setup_logging, get_logger
 from .coordinates import CoordinateConverter
-from .system import setup_unicode_encoding
+from .system import setup_unicode_encoding, install_fast_event_loop
 
-__all__ = ["setup_logging", "get_logger", "CoordinateConverter", "setup_unicode_encoding"] 
\ No newline at end of file
+__all__ = ["setup_logging", "get_logger", "CoordinateConverter", "setup_unicode_encoding", "install_fast_event_loop"] 
\ No newline at end of file
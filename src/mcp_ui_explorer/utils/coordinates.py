@@ -1,7 +1,8 @@
 """Coordinate conversion utilities for MCP UI Explorer."""
 
 from typing import Dict, Any, Tuple
-import pyautogui
+
+from .ui_backend import get_pyautogui
 
 
 class CoordinateConverter:
@@ -10,7 +11,7 @@ class CoordinateConverter:
     @staticmethod
     def get_screen_size() -> Tuple[int, int]:
         """Get the current screen size."""
-        return pyautogui.size()
+        return get_pyautogui().size()
     
     @staticmethod
     def normalize_coordinates(x: float, y: float) -> Dict[str, float]:
@@ -80,6 +81,29 @@ class CoordinateConverter:
                 "absolute": {"x": int(x), "y": int(y)}
             }
     
+    @staticmethod
+    def absolute_only(x: float, y: float) -> Dict[str, Any]:
+        """
+        Create coordinate information for absolute input without a screen-size query.
+        
+        Args:
+            x: Absolute X coordinate
+            y: Absolute Y coordinate
+            
+        Returns:
+            Dictionary shaped like create_coordinate_info, with absolute coordinates only
+        """
+        return {
+            "input": {
+                "x": x,
+                "y": y,
+                "type": "absolute"
+            },
+            "coordinates": {
+                "absolute": {"x": int(x), "y": int(y)}
+            }
+        }
+    
     @staticmethod
     def create_coordinate_info(
         x: float,
@@ -1,7 +1,9 @@
 """System utilities for MCP UI Explorer."""
 
+import importlib
 import os
 import sys
+from typing import Optional
 
 
 def setup_unicode_encoding() -> None:
@@ -18,4 +20,23 @@ def setup_unicode_encoding() -> None:
             sys.stderr.reconfigure(encoding="utf-8")
         except AttributeError:
             # Python < 3.7 doesn't have reconfigure method
-            pass 
\ No newline at end of file
+            pass 
+
+def install_fast_event_loop() -> Optional[str]:
+    """
+    Install a faster asyncio event loop policy when one is available.
+    
+    Uses winloop on Windows and uvloop elsewhere. Must be called before
+    asyncio.run(); does nothing if neither package is installed.
+    
+    Returns:
+        Name of the installed loop package, or None if the default loop is kept
+    """
+    loop_module = "winloop" if sys.platform == "win32" else "uvloop"
+    try:
+        module = importlib.import_module(loop_module)
+    except ImportError:
+        return None
+    
+    module.install()
+    return loop_module
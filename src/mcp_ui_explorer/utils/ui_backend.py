@@ -0,0 +1,375 @@
+"""Low-level input injection for MCP UI Explorer.
+
+On Windows, clicks and keystrokes are sent straight to ``user32.SendInput`` so
+that a whole action (e.g. all key downs and ups of a hotkey) is a single
+syscall, without pyautogui's forced ``PAUSE`` and per-call Python overhead.
+pyautogui's ``FAILSAFE`` (abort when the mouse is in a screen corner) is still
+honoured. Other platforms, and keys that have no virtual-key mapping, fall
+back to pyautogui with its pause disabled.
+"""
+
+import sys
+import time
+import ctypes
+from ctypes import wintypes
+from types import ModuleType
+from typing import Any, List, Optional, Sequence, Tuple
+
+
+# Virtual-key codes for the named keys accepted by pyautogui
+_NAMED_VK = {
+    "backspace": 0x08,
+    "tab": 0x09,
+    "enter": 0x0D,
+    "return": 0x0D,
+    "shift": 0x10,
+    "ctrl": 0x11,
+    "control": 0x11,
+    "alt": 0x12,
+    "pause": 0x13,
+    "capslock": 0x14,
+    "esc": 0x1B,
+    "escape": 0x1B,
+    "space": 0x20,
+    "pageup": 0x21,
+    "pgup": 0x21,
+    "page_up": 0x21,
+    "pagedown": 0x22,
+    "pgdn": 0x22,
+    "page_down": 0x22,
+    "end": 0x23,
+    "home": 0x24,
+    "left": 0x25,
+    "up": 0x26,
+    "right": 0x27,
+    "down": 0x28,
+    "printscreen": 0x2C,
+    "prtsc": 0x2C,
+    "insert": 0x2D,
+    "delete": 0x2E,
+    "del": 0x2E,
+    "win": 0x5B,
+    "winleft": 0x5B,
+    "winright": 0x5C,
+    "apps": 0x5D,
+    "numlock": 0x90,
+    "scrolllock": 0x91,
+    "shiftleft": 0xA0,
+    "shiftright": 0xA1,
+    "ctrlleft": 0xA2,
+    "ctrlright": 0xA3,
+    "altleft": 0xA4,
+    "altright": 0xA5,
+    "volumemute": 0xAD,
+    "volumedown": 0xAE,
+    "volumeup": 0xAF,
+    **{f"f{n}": 0x6F + n for n in range(1, 25)},
+}
+
+# Keys that must carry KEYEVENTF_EXTENDEDKEY to be told apart from the numpad
+_EXTENDED_VK = frozenset({
+    0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x27, 0x28,
+    0x2C, 0x2D, 0x2E, 0x5B, 0x5C, 0x5D, 0x90, 0xA3, 0xA5,
+})
+
+# (VkKeyScanW shift-state bit, modifier virtual key) for shift, ctrl and alt
+_SHIFT_STATE_VKS = ((0x1, 0x10), (0x2, 0x11), (0x4, 0x12))
+
+# Characters that pyautogui.write() types as key presses rather than text
+_TEXT_KEYS = {"\n": "enter", "\t": "tab", "\b": "backspace"}
+
+# Upper bound on INPUT structures per SendInput call; larger batches are split
+MAX_SENDINPUT_BATCH = 512
+
+
+INPUT_MOUSE = 0
+INPUT_KEYBOARD = 1
+
+KEYEVENTF_EXTENDEDKEY = 0x0001
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+
+MOUSEEVENTF_MOVE = 0x0001
+MOUSEEVENTF_ABSOLUTE = 0x8000
+MOUSEEVENTF_VIRTUALDESK = 0x4000
+_MOUSE_BUTTON_FLAGS = {
+    "left": (0x0002, 0x0004),
+    "right": (0x0008, 0x0010),
+    "middle": (0x0020, 0x0040),
+}
+
+SM_XVIRTUALSCREEN = 76
+SM_YVIRTUALSCREEN = 77
+SM_CXVIRTUALSCREEN = 78
+SM_CYVIRTUALSCREEN = 79
+
+
+# The INPUT structures are plain ctypes and are defined on every platform so
+# that input sequences can be built and inspected without sending them
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", wintypes.LONG),
+        ("dy", wintypes.LONG),
+        ("mouseData", wintypes.DWORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", wintypes.WORD),
+        ("wScan", wintypes.WORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [
+        ("uMsg", wintypes.DWORD),
+        ("wParamL", wintypes.WORD),
+        ("wParamH", wintypes.WORD),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT)]
+
+
+class INPUT(ctypes.Structure):
+    _anonymous_ = ("u",)
+    _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+
+if sys.platform == "win32":
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _user32.SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int)
+    _user32.SendInput.restype = wintypes.UINT
+    _user32.VkKeyScanW.argtypes = (wintypes.WCHAR,)
+    _user32.VkKeyScanW.restype = ctypes.c_short
+
+    SENDINPUT_AVAILABLE = True
+else:
+    SENDINPUT_AVAILABLE = False
+
+
+def _send_inputs(inputs: List[INPUT]) -> None:
+    """Submit INPUT structures with one SendInput call per MAX_SENDINPUT_BATCH."""
+    for start in range(0, len(inputs), MAX_SENDINPUT_BATCH):
+        chunk = inputs[start:start + MAX_SENDINPUT_BATCH]
+        count = len(chunk)
+        array = (INPUT * count)(*chunk)
+        sent = _user32.SendInput(count, array, ctypes.sizeof(INPUT))
+        if sent != count:
+            raise OSError(ctypes.get_last_error(), f"SendInput injected {sent} of {count} events")
+
+
+def _key_input(vk: int, key_up: bool = False) -> INPUT:
+    flags = KEYEVENTF_KEYUP if key_up else 0
+    if vk in _EXTENDED_VK:
+        flags |= KEYEVENTF_EXTENDEDKEY
+    return INPUT(type=INPUT_KEYBOARD, ki=KEYBDINPUT(wVk=vk, wScan=0, dwFlags=flags))
+
+
+def _unicode_inputs(char: str) -> List[INPUT]:
+    """Key down/up events typing one character, using UTF-16 surrogates if needed."""
+    encoded = char.encode("utf-16-le")
+    units = [int.from_bytes(encoded[i:i + 2], "little") for i in range(0, len(encoded), 2)]
+    inputs = []
+    for unit in units:
+        inputs.append(INPUT(type=INPUT_KEYBOARD, ki=KEYBDINPUT(wVk=0, wScan=unit, dwFlags=KEYEVENTF_UNICODE)))
+        inputs.append(INPUT(type=INPUT_KEYBOARD, ki=KEYBDINPUT(
+            wVk=0, wScan=unit, dwFlags=KEYEVENTF_UNICODE | KEYEVENTF_KEYUP
+        )))
+    return inputs
+
+
+def _key_vks(key: str) -> Optional[List[int]]:
+    """Map a pyautogui-style key name to virtual-key codes, modifiers first.
+
+    Characters that need shift, ctrl or alt on the current keyboard layout
+    (e.g. "A" or "!") include those modifiers, as pyautogui holds them too.
+    Returns None if the key cannot be mapped.
+    """
+    vk = _NAMED_VK.get(key.lower())
+    if vk is not None:
+        return [vk]
+    if len(key) != 1:
+        return None
+
+    scan = _user32.VkKeyScanW(key)
+    if scan == -1:
+        return None
+    shift_state = (scan >> 8) & 0xFF
+    if shift_state & ~0x7:
+        # Hankaku and reserved shift states have no modifier key to hold
+        return None
+    vks = [modifier for bit, modifier in _SHIFT_STATE_VKS if shift_state & bit]
+    vks.append(scan & 0xFF)
+    return vks
+
+
+def _press_inputs(vks: Sequence[int]) -> List[INPUT]:
+    """Key downs in order, then key ups in reverse."""
+    inputs = [_key_input(vk) for vk in vks]
+    inputs.extend(_key_input(vk, key_up=True) for vk in reversed(vks))
+    return inputs
+
+
+def _char_inputs(char: str) -> List[INPUT]:
+    key = _TEXT_KEYS.get(char)
+    if key is not None:
+        vk = _NAMED_VK[key]
+        return [_key_input(vk), _key_input(vk, key_up=True)]
+    return _unicode_inputs(char)
+
+
+def _text_inputs(text: str) -> List[INPUT]:
+    inputs = []
+    for char in text:
+        inputs.extend(_char_inputs(char))
+    return inputs
+
+
+def _key_inputs(key: str, presses: int = 1) -> Optional[List[INPUT]]:
+    vks = _key_vks(key)
+    if vks is None:
+        return None
+    return _press_inputs(vks) * presses
+
+
+def _hotkey_inputs(keys: Sequence[str]) -> Optional[List[INPUT]]:
+    vks = []
+    for key in keys:
+        key_vks = _key_vks(key)
+        if key_vks is None:
+            return None
+        # A shifted character after an explicit "shift" presses shift only once
+        vks.extend(vk for vk in key_vks if vk not in vks)
+    return _press_inputs(vks)
+
+
+_PYAUTOGUI: Optional[ModuleType] = None
+
+
+def get_pyautogui() -> ModuleType:
+    """Import pyautogui on first use; the import probes the display and is slow."""
+    global _PYAUTOGUI
+    if _PYAUTOGUI is None:
+        import pyautogui
+        _PYAUTOGUI = pyautogui
+    return _PYAUTOGUI
+
+
+def _check_failsafe() -> None:
+    """Raise pyautogui.FailSafeException if FAILSAFE is on and the mouse is in a corner.
+
+    pyautogui runs this check itself; input sent through SendInput bypasses
+    pyautogui, so those paths call it before sending.
+    """
+    get_pyautogui().failSafeCheck()
+
+
+def send_click(x: int, y: int, button: str = "left", clicks: int = 1) -> None:
+    """Move to absolute screen coordinates and click."""
+    if not SENDINPUT_AVAILABLE or button not in _MOUSE_BUTTON_FLAGS:
+        get_pyautogui().click(x, y, clicks=clicks, button=button, _pause=False)
+        return
+    _check_failsafe()
+
+    # Absolute coordinates are normalized to 0..65535 across the virtual desktop
+    left = _user32.GetSystemMetrics(SM_XVIRTUALSCREEN)
+    top = _user32.GetSystemMetrics(SM_YVIRTUALSCREEN)
+    width = max(_user32.GetSystemMetrics(SM_CXVIRTUALSCREEN) - 1, 1)
+    height = max(_user32.GetSystemMetrics(SM_CYVIRTUALSCREEN) - 1, 1)
+
+    down_flag, up_flag = _MOUSE_BUTTON_FLAGS[button]
+    inputs = [INPUT(type=INPUT_MOUSE, mi=MOUSEINPUT(
+        dx=((x - left) * 65535) // width,
+        dy=((y - top) * 65535) // height,
+        dwFlags=MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE | MOUSEEVENTF_VIRTUALDESK
+    ))]
+    for _ in range(clicks):
+        inputs.append(INPUT(type=INPUT_MOUSE, mi=MOUSEINPUT(dwFlags=down_flag)))
+        inputs.append(INPUT(type=INPUT_MOUSE, mi=MOUSEINPUT(dwFlags=up_flag)))
+    _send_inputs(inputs)
+
+
+def send_text(text: str, interval: float = 0.0) -> None:
+    """Type text into the focused window."""
+    if not SENDINPUT_AVAILABLE:
+        get_pyautogui().write(text, interval=interval, _pause=False)
+        return
+    _check_failsafe()
+
+    if interval > 0:
+        for char in text:
+            _send_inputs(_char_inputs(char))
+            time.sleep(interval)
+        return
+
+    inputs = _text_inputs(text)
+    if inputs:
+        _send_inputs(inputs)
+
+
+def send_key(key: str, presses: int = 1, interval: float = 0.0) -> None:
+    """Press and release a single key one or more times."""
+    inputs = _key_inputs(key) if SENDINPUT_AVAILABLE else None
+    if inputs is None:
+        get_pyautogui().press(key, presses=presses, interval=interval, _pause=False)
+        return
+    _check_failsafe()
+
+    if interval > 0:
+        for _ in range(presses):
+            _send_inputs(inputs)
+            time.sleep(interval)
+    else:
+        _send_inputs(inputs * presses)
+
+
+def send_hotkey(keys: List[str]) -> None:
+    """Press a key combination: all key downs in order, then key ups in reverse."""
+    inputs = _hotkey_inputs(keys) if SENDINPUT_AVAILABLE else None
+    if inputs is None:
+        get_pyautogui().hotkey(*keys, _pause=False)
+        return
+    _check_failsafe()
+    _send_inputs(inputs)
+
+
+def send_keyboard_batch(actions: Sequence[Tuple[str, Any]]) -> None:
+    """Send a run of keyboard actions with as few SendInput calls as possible.
+
+    Each action is ("text", str), ("key", str) or ("hotkey", list of keys).
+    If any key cannot be mapped, the actions are sent one by one instead.
+    """
+    if SENDINPUT_AVAILABLE:
+        inputs = []
+        for kind, value in actions:
+            if kind == "text":
+                part = _text_inputs(value)
+            elif kind == "key":
+                part = _key_inputs(value)
+            else:
+                part = _hotkey_inputs(value)
+            if part is None:
+                break
+            inputs.extend(part)
+        else:
+            if inputs:
+                _check_failsafe()
+                _send_inputs(inputs)
+            return
+
+    for kind, value in actions:
+        if kind == "text":
+            send_text(value)
+        elif kind == "key":
+            send_key(value)
+        else:
+            send_hotkey(value)
@@ -0,0 +1,82 @@
+"""Unit tests for UI action helpers."""
+
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from mcp_ui_explorer.core import actions as actions_module
+from mcp_ui_explorer.core.actions import UIActions, hotkey_verification_query
+
+
+class TestHotkeyVerificationQuery:
+    """Test default verification queries for hot_key."""
+
+    @pytest.mark.parametrize("keys, query", [
+        (["ctrl", "c"], "content was copied to clipboard"),
+        (["c", "ctrl"], "content was copied to clipboard"),
+        (["cmd", "v"], "content was pasted from clipboard"),
+        (["alt", "tab"], "application switcher appeared or focus changed"),
+    ])
+    def test_exact_shortcut(self, keys, query):
+        """Test that known shortcuts match in any key order."""
+        assert hotkey_verification_query(frozenset(keys)) == query
+
+    @pytest.mark.parametrize("keys, query", [
+        (["ctrl", "shift", "s"], "file was saved or save dialog appeared"),
+        (["ctrl", "alt", "tab"], "application switcher appeared or focus changed"),
+        (["ctrl", "shift", "z"], "last action was undone"),
+    ])
+    def test_extra_modifiers(self, keys, query):
+        """Test that a known shortcut with extra modifiers keeps its query."""
+        assert hotkey_verification_query(frozenset(keys)) == query
+
+    @pytest.mark.parametrize("keys", [
+        ["ctrl", "alt", "delete"],
+        ["ctrl", "c", "v"],
+        ["shift", "s"],
+        ["f5"],
+    ])
+    def test_unknown_shortcut(self, keys):
+        """Test that other combinations get no specific query."""
+        assert hotkey_verification_query(frozenset(keys)) is None
+
+
+class TestHierarchyCache:
+    """Test reuse and expiry of UI hierarchy walks."""
+
+    @pytest.fixture
+    def actions(self):
+        actions = UIActions.__new__(UIActions)
+        actions.settings = MagicMock()
+        actions.settings.ui.hierarchy_cache_ttl = 1.0
+        actions._hierarchy_cache = {}
+        with patch.object(actions_module, "WIN32GUI_AVAILABLE", False), \
+                patch.object(actions_module, "analyze_ui_hierarchy", side_effect=lambda **kwargs: [kwargs]):
+            yield actions
+
+    def walk(self, actions, now, region=(0, 0, 100, 100)):
+        with patch.object(actions_module.time, "monotonic", return_value=now):
+            return actions._analyze_ui_hierarchy_cached(region, 8, False, 5)
+
+    def test_reused_within_ttl(self, actions):
+        """Test that a recent walk of the same region is reused."""
+        first = self.walk(actions, 10.0)
+        second = self.walk(actions, 10.5)
+        assert second is first
+        assert actions.hierarchy_cache_hit is True
+
+    def test_rewalked_after_ttl(self, actions):
+        """Test that an expired walk is replaced."""
+        first = self.walk(actions, 10.0)
+        second = self.walk(actions, 11.5)
+        assert second is not first
+        assert actions.hierarchy_cache_hit is False
+
+    def test_expired_entries_dropped(self, actions):
+        """Test that walks of other regions are dropped once expired."""
+        for offset in range(5):
+            self.walk(actions, 10.0, region=(offset, 0, 100, 100))
+        assert len(actions._hierarchy_cache) == 5
+
+        self.walk(actions, 20.0)
+        assert len(actions._hierarchy_cache) == 1
@@ -102,6 +102,7 @@ class TestSettings:
         
         # Test debug setting
         assert settings.debug is False
+        assert settings.compact_tool_schemas is False
         
         # Test UI-TARS settings
         assert settings.ui_tars.provider == "local"
@@ -118,6 +119,11 @@ class TestSettings:
         assert settings.ui.default_verification_timeout == 3.0
         assert settings.ui.auto_verify is True
         assert settings.ui.screenshot_prefix == "ui_hierarchy"
+        assert settings.ui.screenshot_format == "jpg"
+        assert settings.ui.before_screenshot_ttl == 5.0
+        assert settings.ui.hierarchy_cache_ttl == 1.0
+        assert settings.ui.compare_before_after is True
+        assert settings.ui.disable_pyautogui_pause is False
         
         # Test logging settings
         assert settings.logging.level == "INFO"
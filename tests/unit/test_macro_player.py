@@ -0,0 +1,179 @@
+"""Unit tests for the macro player."""
+
+from unittest.mock import patch, AsyncMock
+
+import pytest
+
+from mcp_ui_explorer.services import macro_player
+from mcp_ui_explorer.models.enums import MacroEventType
+from mcp_ui_explorer.services.macro_player import MacroPlayer
+
+
+def event(event_type, timestamp, **data):
+    """Build a recorded macro event."""
+    return {"event_type": event_type, "timestamp": timestamp, "data": data}
+
+
+def click(timestamp):
+    return event(MacroEventType.MOUSE_CLICK, timestamp, x=10, y=10)
+
+
+def typed(timestamp, text="abc"):
+    return event(MacroEventType.KEYBOARD_TYPE, timestamp, text=text)
+
+
+def key(timestamp, name="enter"):
+    return event(MacroEventType.KEYBOARD_KEY, timestamp, key=name)
+
+
+def hotkey(timestamp, keys=("ctrl", "s")):
+    return event(MacroEventType.KEYBOARD_HOTKEY, timestamp, keys=list(keys))
+
+
+@pytest.fixture
+def player():
+    """Create a player in the state play_macro leaves it in before executing events."""
+    player = MacroPlayer()
+    player.is_playing = True
+    player.playback_stats = {"events_executed": 0, "events_skipped": 0}
+    return player
+
+
+class TestCompileSchedule:
+    """Test flattening event timestamps into pre-event delays."""
+
+    def test_delays_between_events(self, player):
+        """Test that each delay is the gap since the previous event."""
+        events = [click(10.0), click(10.5), click(12.0)]
+        assert player._compile_schedule(events, 1.0) == [0.0, 0.5, 1.5]
+
+    def test_speed_multiplier(self, player):
+        """Test that delays are divided by the speed multiplier."""
+        events = [click(10.0), click(11.0), click(13.0)]
+        assert player._compile_schedule(events, 2.0) == [0.0, 0.5, 1.0]
+
+    def test_missing_timestamp(self, player):
+        """Test that an event without a timestamp follows the previous one immediately."""
+        events = [click(10.0), {"event_type": MacroEventType.MOUSE_CLICK, "data": {}}, click(11.0)]
+        assert player._compile_schedule(events, 1.0) == [0.0, 0.0, 1.0]
+
+
+class TestKeyboardRunEnd:
+    """Test finding back-to-back keyboard events to inject as one batch."""
+
+    def run_end(self, player, events, start=0):
+        return player._keyboard_run_end(events, player._compile_schedule(events, 1.0), start)
+
+    def test_back_to_back_keyboard_events(self, player):
+        """Test that keyboard events without a real pause form one run."""
+        events = [typed(10.0), key(10.0), hotkey(10.005), click(10.005)]
+        assert self.run_end(player, events) == 3
+
+    def test_run_broken_by_pause(self, player):
+        """Test that a pause longer than MIN_SLEEP_DELAY ends the run."""
+        events = [typed(10.0), key(10.0), typed(10.5)]
+        assert self.run_end(player, events) == 2
+
+    def test_first_event_may_follow_pause(self, player):
+        """Test that the delay before the first event of a run does not matter."""
+        events = [click(10.0), typed(11.0), key(11.0)]
+        assert self.run_end(player, events, start=1) == 3
+
+    def test_non_keyboard_event(self, player):
+        """Test that a run cannot start at a non-keyboard event."""
+        events = [click(10.0), typed(10.0)]
+        assert self.run_end(player, events) == 0
+
+    def test_empty_action_ends_run(self, player):
+        """Test that keyboard events without a value are left to _execute_event."""
+        events = [typed(10.0), key(10.0, name=""), typed(10.0)]
+        assert self.run_end(player, events) == 1
+
+
+class TestExecuteEvents:
+    """Test the playback loop."""
+
+    @pytest.fixture
+    def execute_event(self, player):
+        with patch.object(player, "_execute_event", AsyncMock(return_value=True)) as mock_execute:
+            yield mock_execute
+
+    @pytest.fixture
+    def send_batch(self):
+        with patch.object(macro_player, "send_keyboard_batch") as mock_send:
+            yield mock_send
+
+    @pytest.mark.asyncio
+    async def test_keyboard_run_sent_as_batch(self, player, execute_event, send_batch):
+        """Test that a keyboard run is injected with one backend call."""
+        events = [click(10.0), typed(10.0), key(10.0), hotkey(10.0)]
+        result = await player._execute_events(events, 1.0, False, True)
+
+        assert result["success"] is True
+        execute_event.assert_awaited_once()
+        send_batch.assert_called_once_with([("text", "abc"), ("key", "enter"), ("hotkey", ["ctrl", "s"])])
+        assert player.playback_stats["events_executed"] == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_index(self, player, execute_event, send_batch):
+        """Test that a failed event stops playback and reports its index."""
+        execute_event.side_effect = [True, True, False]
+        events = [click(10.0), click(10.0), click(10.0), click(10.0)]
+        result = await player._execute_events(events, 1.0, True, True)
+
+        assert result["success"] is False
+        assert result["failed_index"] == 2
+        assert result["failed_event"] is events[2]
+        assert execute_event.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_exception_failed_index(self, player, execute_event, send_batch):
+        """Test that an event raising an error reports its index."""
+        execute_event.side_effect = [True, RuntimeError("boom")]
+        events = [click(10.0), click(10.0), click(10.0)]
+        result = await player._execute_events(events, 1.0, True, True)
+
+        assert result["failed_index"] == 1
+        assert "boom" in result["message"]
+
+    @pytest.mark.asyncio
+    async def test_continue_past_failure(self, player, execute_event, send_batch):
+        """Test that failures are skipped when not stopping on them."""
+        execute_event.side_effect = [True, False, True]
+        events = [click(10.0), click(10.0), click(10.0)]
+        result = await player._execute_events(events, 1.0, True, False)
+
+        assert result["success"] is True
+        assert player.playback_stats == {"events_executed": 2, "events_skipped": 1}
+
+    @pytest.mark.asyncio
+    async def test_start_index(self, player, execute_event, send_batch):
+        """Test that playback resumes at start_index without replaying earlier events."""
+        events = [click(10.0), click(10.0), click(10.0), click(10.0)]
+        await player._execute_events(events, 1.0, False, True, start_index=2)
+
+        assert [call.args[0] for call in execute_event.await_args_list] == [events[2], events[3]]
+        assert player.playback_stats["events_executed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_resume_after_failure(self, player, execute_event, send_batch):
+        """Test that resuming at a reported failed_index retries that event."""
+        events = [click(10.0), click(10.0), click(10.0)]
+        execute_event.side_effect = [True, False]
+        failed = await player._execute_events(events, 1.0, True, True)
+
+        execute_event.side_effect = None
+        execute_event.reset_mock()
+        result = await player._execute_events(events, 1.0, True, True, start_index=failed["failed_index"])
+
+        assert result["success"] is True
+        assert [call.args[0] for call in execute_event.await_args_list] == [events[1], events[2]]
+
+    @pytest.mark.asyncio
+    async def test_resume_waits_only_own_delay(self, player, execute_event, send_batch):
+        """Test that resuming sleeps for the resumed event's delay, not the skipped ones."""
+        events = [click(10.0), click(15.0), click(15.5)]
+        with patch.object(macro_player.asyncio, "sleep", AsyncMock()) as mock_sleep:
+            await player._execute_events(events, 1.0, False, True, start_index=2)
+
+        mock_sleep.assert_awaited_once_with(0.5)
@@ -0,0 +1,426 @@
+"""Unit tests for the macro recorder."""
+
+import queue
+import threading
+import zipfile
+from concurrent.futures import Future
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from mcp_ui_explorer.services import macro_recorder
+from mcp_ui_explorer.models.enums import MacroState, MacroEventType
+from mcp_ui_explorer.services.macro_recorder import MacroRecorder, MacroEvent
+
+
+def element(control_type, text, left, top, right, bottom, children=()):
+    """Build an element dict shaped like analyze_ui_hierarchy output."""
+    return {
+        "control_type": control_type,
+        "text": text,
+        "position": {"left": left, "top": top, "right": right, "bottom": bottom},
+        "properties": {"class_name": "", "automation_id": ""},
+        "children": list(children),
+    }
+
+
+WINDOW = element("Window", "Editor", 0, 0, 800, 600, [
+    element("Pane", "Toolbar", 0, 0, 800, 50, [
+        element("Button", "Save", 10, 10, 40, 40),
+        element("Button", "Open", 50, 10, 80, 40),
+    ]),
+    element("Edit", "Document", 0, 50, 800, 600),
+])
+
+
+@pytest.fixture
+def recorder():
+    """Create a recorder and shut down its ZIP worker afterwards."""
+    recorder = MacroRecorder()
+    yield recorder
+    recorder._zip_executor.shutdown(wait=False)
+
+
+@pytest.fixture
+def win32gui():
+    """Stand in for win32gui with a Firefox window under every point."""
+    fake = MagicMock()
+    fake.WindowFromPoint.return_value = 42
+    fake.GetForegroundWindow.return_value = 42
+    fake.GetClassName.return_value = "MozillaWindowClass"
+    fake.GetWindowText.return_value = "Example - Mozilla Firefox"
+    fake.GetWindowRect.return_value = (0, 0, 800, 600)
+    with patch.object(macro_recorder, "win32gui", fake, create=True), \
+            patch.object(macro_recorder, "WIN32_AVAILABLE", True):
+        yield fake
+
+
+class TestHierarchySnapshot:
+    """Test the per-window hierarchy snapshot."""
+
+    def test_entries_sorted_by_area(self, recorder, win32gui):
+        """Test that the snapshot flattens the tree, smallest elements first."""
+        with patch.object(macro_recorder, "analyze_ui_hierarchy", return_value=[WINDOW]):
+            entries = recorder._hierarchy_snapshot()
+
+        texts = [entry[-1]["text"] for entry in entries]
+        assert set(texts[:2]) == {"Save", "Open"}
+        assert texts[2:] == ["Toolbar", "Document", "Editor"]
+        areas = [entry[0] for entry in entries]
+        assert areas == sorted(areas)
+
+    def test_reused_for_same_window(self, recorder, win32gui):
+        """Test that the snapshot is not rebuilt while the window keeps focus."""
+        with patch.object(macro_recorder, "analyze_ui_hierarchy", return_value=[WINDOW]) as mock_analyze:
+            first = recorder._hierarchy_snapshot()
+            second = recorder._hierarchy_snapshot()
+
+        assert first is second
+        mock_analyze.assert_called_once()
+
+    def test_rebuilt_when_focus_moves(self, recorder, win32gui):
+        """Test that a different foreground window rebuilds the snapshot."""
+        with patch.object(macro_recorder, "analyze_ui_hierarchy", return_value=[WINDOW]) as mock_analyze:
+            recorder._hierarchy_snapshot()
+            win32gui.GetForegroundWindow.return_value = 43
+            recorder._hierarchy_snapshot()
+
+        assert mock_analyze.call_count == 2
+
+
+class TestFindClosestElement:
+    """Test picking an element from the snapshot."""
+
+    @pytest.fixture
+    def entries(self, recorder, win32gui):
+        with patch.object(macro_recorder, "analyze_ui_hierarchy", return_value=[WINDOW]):
+            return recorder._hierarchy_snapshot()
+
+    def test_most_specific_containing_element(self, recorder, entries):
+        """Test that the smallest element containing the point wins."""
+        context = recorder._find_closest_element(entries, 20, 20)
+        assert context["text"] == "Save"
+        assert context["distance"] == 0
+        assert context["properties"]["detection_method"] == "accessibility_hierarchy"
+
+    def test_snapshot_not_modified(self, recorder, entries):
+        """Test that building a context leaves the snapshot element untouched."""
+        recorder._find_closest_element(entries, 20, 20)
+        assert "detection_method" not in entries[0][-1]["properties"]
+
+    def test_nearby_element(self, recorder):
+        """Test that the closest center within range is used when nothing contains the point."""
+        entries = [(900, 10, 10, 40, 40, 50, 50, element("Button", "Save", 10, 10, 40, 40))]
+        context = recorder._find_closest_element(entries, 55, 25)
+        assert context["text"] == "Save"
+        assert context["distance"] == 30
+        assert context["properties"]["detection_method"] == "accessibility_nearby"
+
+    def test_nothing_in_range(self, recorder):
+        """Test that elements beyond NEARBY_ELEMENT_DISTANCE are ignored."""
+        entries = [(900, 10, 10, 40, 40, 50, 50, element("Button", "Save", 10, 10, 40, 40))]
+        assert recorder._find_closest_element(entries, 500, 500) is None
+
+
+class TestBasicWindowInfo:
+    """Test the win32 window fallback."""
+
+    def test_window_context(self, recorder, win32gui):
+        """Test that the window under the point is described."""
+        context = recorder._get_basic_window_info(100, 100)
+        assert context["text"] == "Firefox"
+        assert context["position"] == {"left": 0, "top": 0, "right": 800, "bottom": 600}
+        assert context["properties"]["handle"] == 42
+        assert context["properties"]["detection_method"] == "basic_window_fallback"
+
+    def test_taskbar(self, recorder, win32gui):
+        """Test that taskbar windows are labelled as such."""
+        win32gui.GetClassName.return_value = "Shell_TrayWnd"
+        assert recorder._get_basic_window_info(100, 1070)["text"] == "Taskbar Button"
+
+    def test_window_info_cached(self, recorder, win32gui):
+        """Test that class, title and rect are queried once per window within the TTL."""
+        recorder._get_basic_window_info(100, 100)
+        recorder._get_basic_window_info(200, 200)
+        win32gui.GetClassName.assert_called_once_with(42)
+        assert win32gui.WindowFromPoint.call_count == 2
+
+    def test_no_window(self, recorder, win32gui):
+        """Test that no context is returned without a window."""
+        win32gui.WindowFromPoint.return_value = 0
+        assert recorder._get_basic_window_info(100, 100) is None
+
+    def test_without_win32(self, recorder):
+        """Test that the fallback is skipped where win32gui is unavailable."""
+        with patch.object(macro_recorder, "WIN32_AVAILABLE", False):
+            assert recorder._get_basic_window_info(100, 100) is None
+
+
+class TestSaveStatus:
+    """Test reporting background package ZIP builds."""
+
+    def test_no_saves(self, recorder):
+        """Test that a fresh recorder reports no package saves."""
+        assert recorder.get_status()["package_saves"] == []
+
+    def test_pending_and_done(self, recorder):
+        """Test that each saved package reports its ZIP state."""
+        done = Future()
+        done.set_result(Path("macros") / "first.zip")
+        recorder._zip_jobs["first"] = done
+        recorder._zip_jobs["second"] = Future()
+
+        saves = recorder.get_status()["package_saves"]
+        assert [save["package_name"] for save in saves] == ["first", "second"]
+        assert saves[0]["zip_state"] == "done"
+        assert saves[0]["package_zip"] == str(Path("macros") / "first.zip")
+        assert saves[1]["zip_state"] == "pending"
+
+    def test_failed(self, recorder):
+        """Test that a failed ZIP build is reported with its error."""
+        failed = Future()
+        failed.set_exception(OSError("disk full"))
+        recorder._zip_jobs["broken"] = failed
+
+        save = recorder.get_save_status("broken")
+        assert save["success"] is False
+        assert save["zip_state"] == "failed"
+        assert "disk full" in save["error"]
+
+    def test_unknown_package(self, recorder):
+        """Test that an unknown package name is an error."""
+        assert recorder.get_save_status("missing")["success"] is False
+
+
+class TestStopWithoutSaving:
+    """Test stopping a recording that is not saved."""
+
+    def test_partial_zip_removed(self, recorder, tmp_path):
+        """Test that the package ZIP opened at start is deleted when not saved."""
+        zip_path = tmp_path / "package.zip"
+        recorder._package_zip = zipfile.ZipFile(zip_path, "w")
+        recorder._package_zip.writestr("screenshots/001.png", b"png")
+        recorder.state = MacroState.RECORDING
+        recorder.current_macro = {"name": "test"}
+
+        with patch.object(recorder, "_stop_listeners"), \
+                patch.object(recorder, "_commit_text_buffer"), \
+                patch.object(recorder, "_record_final_state"):
+            result = recorder.stop_recording(save_macro=False)
+
+        assert result["success"] is True
+        assert recorder._package_zip is None
+        assert not zip_path.exists()
+
+
+class TestScreenCapture:
+    """Test the recorder's own mss capture session."""
+
+    @pytest.fixture
+    def mss(self):
+        fake = MagicMock()
+        sct = fake.mss.return_value
+        sct.monitors = [{}, {"left": 0, "top": 0, "width": 2, "height": 1}]
+        sct.grab.return_value.size = (2, 1)
+        sct.grab.return_value.raw = bytearray(8)
+        with patch.object(macro_recorder, "mss", fake, create=True), \
+                patch.object(macro_recorder, "MSS_AVAILABLE", True):
+            yield fake
+
+    def test_one_instance_across_threads(self, recorder, mss):
+        """Test that grabs from several threads share one mss instance."""
+        frames = []
+        threads = [threading.Thread(target=lambda: frames.append(recorder._grab_screen())) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(frames) == 3
+        assert frames[0].shape == (1, 2, 4)
+        mss.mss.assert_called_once()
+
+    def test_closed_when_recording_stops(self, recorder, mss):
+        """Test that the mss instance is closed and recreated on next use."""
+        recorder._grab_screen()
+        recorder._close_screen_capture()
+        mss.mss.return_value.close.assert_called_once()
+
+        recorder._grab_screen()
+        assert mss.mss.call_count == 2
+
+    def test_frame_function_preferred(self, recorder, mss):
+        """Test that a provided frame source is used instead of mss."""
+        recorder.frame_function = MagicMock(return_value="frame")
+        assert recorder._grab_screen() == "frame"
+        mss.mss.assert_not_called()
+
+
+def click_event(timestamp):
+    return MacroEvent(event_type=MacroEventType.MOUSE_CLICK, timestamp=timestamp, data={})
+
+
+class TestResolveWorker:
+    """Test the background UI-context worker."""
+
+    @pytest.fixture
+    def lookup(self, recorder):
+        contexts = iter([{"text": "first"}, {"text": "second"}, {"text": "third"}])
+        with patch.object(recorder, "_get_element_at_point", side_effect=lambda x, y: next(contexts)) as mock_lookup:
+            yield mock_lookup
+
+    def resolve(self, recorder, jobs):
+        """Run the worker over jobs until the queue's sentinel."""
+        pending = queue.Queue()
+        for job in jobs:
+            pending.put(job)
+        pending.put(None)
+        recorder._resolve_worker(pending)
+
+    def test_burst_shares_one_lookup(self, recorder, lookup):
+        """Test that nearby events in quick succession reuse the first lookup."""
+        events = [click_event(10.0), click_event(10.02), click_event(10.04)]
+        self.resolve(recorder, [(events[0], 100, 100, None), (events[1], 105, 100, None), (events[2], 110, 100, None)])
+
+        lookup.assert_called_once_with(100, 100)
+        assert [event.ui_context for event in events] == [{"text": "first"}] * 3
+        assert events[1].ui_context is not events[0].ui_context
+
+    def test_pause_breaks_burst(self, recorder, lookup):
+        """Test that events further apart than UI_CONTEXT_COALESCE_WINDOW are looked up again."""
+        events = [click_event(10.0), click_event(10.5)]
+        self.resolve(recorder, [(events[0], 100, 100, None), (events[1], 100, 100, None)])
+
+        assert lookup.call_count == 2
+        assert events[1].ui_context == {"text": "second"}
+
+    def test_distance_breaks_burst(self, recorder, lookup):
+        """Test that events beyond mouse_move_threshold are looked up again."""
+        recorder.mouse_move_threshold = 20
+        events = [click_event(10.0), click_event(10.01)]
+        self.resolve(recorder, [(events[0], 100, 100, None), (events[1], 130, 100, None)])
+
+        assert lookup.call_count == 2
+
+    def test_source_context_copied(self, recorder, lookup):
+        """Test that a job with a source event copies its context without a lookup."""
+        source, event = click_event(10.0), click_event(11.0)
+        self.resolve(recorder, [(source, 100, 100, None), (event, 500, 500, source)])
+
+        lookup.assert_called_once()
+        assert event.ui_context == source.ui_context
+        assert event.ui_context is not source.ui_context
+
+
+class TestRequestUIContext:
+    """Test queueing UI-context lookups while recording."""
+
+    @pytest.fixture
+    def jobs(self, recorder):
+        recorder._resolve_queue = queue.Queue(maxsize=2)
+        return recorder._resolve_queue
+
+    def test_queued(self, recorder, jobs):
+        """Test that a lookup is queued for the worker."""
+        event = click_event(10.0)
+        recorder._request_ui_context(event, 1, 2)
+        assert jobs.get_nowait() == (event, 1, 2, None)
+
+    def test_oldest_dropped_when_full(self, recorder, jobs):
+        """Test that a full queue drops its oldest lookup for the newest."""
+        events = [click_event(10.0 + i) for i in range(3)]
+        for event in events:
+            recorder._request_ui_context(event, 0, 0)
+
+        assert [jobs.get_nowait()[0] for _ in range(2)] == events[1:]
+
+    def test_sentinel_kept_when_full(self, recorder, jobs):
+        """Test that the stop sentinel is never dropped for a new lookup."""
+        jobs.put_nowait(None)
+        jobs.put_nowait((click_event(10.0), 0, 0, None))
+        recorder._request_ui_context(click_event(11.0), 0, 0)
+
+        remaining = [jobs.get_nowait() for _ in range(jobs.qsize())]
+        assert remaining[-1] is None
+        assert len(remaining) == 2
+
+    def test_resolved_inline_when_stopped(self, recorder):
+        """Test that lookups run inline once the worker has stopped."""
+        event = click_event(10.0)
+        with patch.object(recorder, "_get_element_at_point", return_value={"text": "Save"}):
+            recorder._request_ui_context(event, 1, 2)
+        assert event.ui_context == {"text": "Save"}
+
+    def test_disabled(self, recorder, jobs):
+        """Test that nothing is queued when UI context capture is off."""
+        recorder.capture_ui_context = False
+        recorder._request_ui_context(click_event(10.0), 1, 2)
+        assert jobs.empty()
+
+
+class TestWorkerFailures:
+    """Test that a failing worker job cannot stall stopping a recording."""
+
+    def test_screenshot_worker_survives_error(self, recorder):
+        """Test that one failing screenshot does not stop later ones."""
+        events = [click_event(10.0), click_event(11.0)]
+        jobs = queue.Queue()
+        jobs.put((events[0], "bad frame", "first.png", "click", None))
+        jobs.put((events[1], "frame", "second.png", "click", None))
+        jobs.put(None)
+
+        def to_rgba(frame):
+            if frame == "bad frame":
+                raise ValueError("bad frame")
+            return frame
+
+        with patch.object(recorder, "_frame_to_rgba", side_effect=to_rgba), \
+                patch.object(recorder, "_create_full_screen_screenshot_with_indicators",
+                             side_effect=lambda path, *args: path):
+            recorder._screenshot_worker(jobs)
+
+        assert events[0].screenshot_path is None
+        assert events[1].screenshot_path == "second.png"
+
+    def test_resolve_worker_survives_error(self, recorder):
+        """Test that one failing lookup does not stop later ones."""
+        events = [click_event(10.0), click_event(11.0)]
+        jobs = queue.Queue()
+        jobs.put((events[0], 100, 100, None))
+        jobs.put((events[1], 500, 500, None))
+        jobs.put(None)
+
+        with patch.object(recorder, "_get_element_at_point", side_effect=[RuntimeError("COM error"), {"text": "Save"}]):
+            recorder._resolve_worker(jobs)
+
+        assert events[0].ui_context is None
+        assert events[1].ui_context == {"text": "Save"}
+
+    def test_stop_with_dead_worker(self, recorder):
+        """Test that the sentinel is queued without blocking when a dead worker left the queue full."""
+        thread = threading.Thread(target=lambda: None, name="macro-screenshots")
+        thread.start()
+        thread.join()
+        jobs = queue.Queue(maxsize=2)
+        jobs.put_nowait("pending")
+        jobs.put_nowait("pending")
+
+        with patch.object(macro_recorder, "WORKER_STOP_TIMEOUT", 0.01):
+            recorder._stop_worker(thread, jobs)
+
+        remaining = [jobs.get_nowait() for _ in range(jobs.qsize())]
+        assert remaining == ["pending", None]
+
+    def test_stop_with_stuck_worker(self, recorder):
+        """Test that stopping gives up on a worker that never finishes."""
+        release = threading.Event()
+        thread = threading.Thread(target=release.wait, name="macro-ui-context", daemon=True)
+        thread.start()
+        try:
+            with patch.object(macro_recorder, "WORKER_STOP_TIMEOUT", 0.01):
+                recorder._stop_worker(thread, queue.Queue(maxsize=1))
+            assert thread.is_alive()
+        finally:
+            release.set()
+            thread.join()
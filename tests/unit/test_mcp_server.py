@@ -0,0 +1,67 @@
+"""Unit tests for the MCP server."""
+
+import inspect
+import json
+from collections import namedtuple
+
+import pytest
+
+from mcp_ui_explorer.core.ui_explorer import UIExplorer
+from mcp_ui_explorer.models.enums import MacroEventType
+from mcp_ui_explorer.server.mcp_server import TOOL_SPECS, SERVER_ONLY_FIELDS, TOOL_INPUT_MODELS, dumps_result
+from mcp_ui_explorer.services.macro_recorder import MacroEvent
+
+
+TOOL_NAMES = [name for name, _, _ in TOOL_SPECS]
+
+
+class TestToolDispatch:
+    """Test that tool arguments can be passed straight to UIExplorer."""
+
+    @pytest.mark.parametrize("name", TOOL_NAMES)
+    def test_fields_match_method_signature(self, name):
+        """Test that each input model field is a parameter of the UIExplorer method."""
+        fields = set(TOOL_INPUT_MODELS[name].model_fields) - SERVER_ONLY_FIELDS.get(name, set())
+        parameters = inspect.signature(getattr(UIExplorer, name)).parameters
+        assert fields == set(parameters) - {"self"}
+
+    @pytest.mark.parametrize("name", TOOL_NAMES)
+    def test_required_parameters_are_required_fields(self, name):
+        """Test that a method parameter without a default is never left unset by the model."""
+        model_fields = TOOL_INPUT_MODELS[name].model_fields
+        for parameter in inspect.signature(getattr(UIExplorer, name)).parameters.values():
+            if parameter.name != "self" and parameter.default is inspect.Parameter.empty:
+                assert model_fields[parameter.name].is_required()
+
+    def test_server_only_fields_exist(self):
+        """Test that server-only fields belong to the tool's input model."""
+        for name, fields in SERVER_ONLY_FIELDS.items():
+            assert fields <= set(TOOL_INPUT_MODELS[name].model_fields)
+
+    def test_tool_names_unique(self):
+        """Test that no tool is registered twice."""
+        assert len(TOOL_NAMES) == len(set(TOOL_NAMES))
+
+
+# Shaped like pyautogui.Point
+Point = namedtuple("Point", "x y")
+
+
+class TestDumpsResult:
+    """Test serializing tool results."""
+
+    def test_event_with_namedtuple(self):
+        """Test that a recorded event holding a namedtuple serializes as arrays."""
+        event = MacroEvent(
+            event_type=MacroEventType.SCREENSHOT,
+            timestamp=10.0,
+            data={"action": "initial_state", "cursor_position": Point(100, 200)},
+        )
+        result = json.loads(dumps_result({"success": True, "events": [event.to_dict()]}))
+        assert result["events"][0]["data"]["cursor_position"] == [100, 200]
+        assert result["events"][0]["event_type"] == "screenshot"
+
+    def test_unserializable_value(self):
+        """Test that values with no JSON form still raise TypeError."""
+        with pytest.raises(TypeError):
+            dumps_result({"value": object()})
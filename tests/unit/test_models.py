@@ -6,6 +6,7 @@ from pydantic import ValidationError
 from mcp_ui_explorer.models import (
     RegionType,
     ControlType,
+    coerce_control_type,
     ScreenshotUIInput,
     ClickUIElementInput,
     KeyboardInputInput,
@@ -54,6 +55,28 @@ class TestControlType:
             assert control_type in ControlType.__members__.values()
 
 
+class TestCoerceControlType:
+    """Test coerce_control_type helper."""
+
+    def test_string_value(self):
+        """Test coercing a control type string."""
+        assert coerce_control_type("Button") is ControlType.BUTTON
+
+    def test_member(self):
+        """Test that a member is returned unchanged."""
+        assert coerce_control_type(ControlType.EDIT) is ControlType.EDIT
+
+    def test_all_values(self):
+        """Test that every member value round-trips."""
+        for member in ControlType:
+            assert coerce_control_type(member.value) is member
+
+    def test_invalid_value(self):
+        """Test that unknown values raise like ControlType() does."""
+        with pytest.raises(ValueError):
+            coerce_control_type("NotAControl")
+
+
 class TestScreenshotUIInput:
     """Test ScreenshotUIInput model."""
 
@@ -66,6 +89,7 @@ class TestScreenshotUIInput:
         assert input_model.min_size == 20
         assert input_model.output_prefix == "ui_hierarchy"
         assert input_model.region is None
+        assert input_model.verbose_preamble is False
 
     def test_valid_region_string(self):
         """Test valid region string."""
@@ -0,0 +1,61 @@
+"""Unit tests for package-level exports."""
+
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+import mcp_ui_explorer
+
+
+@pytest.fixture
+def package_globals():
+    """Remove names cached in the package namespace by a test."""
+    names = set(vars(mcp_ui_explorer))
+    yield vars(mcp_ui_explorer)
+    for name in set(vars(mcp_ui_explorer)) - names:
+        delattr(mcp_ui_explorer, name)
+
+
+class TestLazyExports:
+    """Test exports resolved on first attribute access."""
+
+    def test_subpackage_import_stays_light(self):
+        """Test that importing a subpackage does not load UIExplorer or the server."""
+        code = (
+            "import sys, mcp_ui_explorer.models; "
+            "print(any(m in sys.modules for m in "
+            "('mcp_ui_explorer.core.ui_explorer', 'mcp_ui_explorer.server.mcp_server')))"
+        )
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+        assert result.stdout.strip() == "False"
+
+    def test_class_resolved_and_cached(self, package_globals):
+        """Test that a lazy name resolves to the real object and is cached."""
+        from mcp_ui_explorer.core.ui_explorer import UIExplorer
+
+        package_globals.pop("UIExplorer", None)
+        assert mcp_ui_explorer.UIExplorer is UIExplorer
+        assert package_globals["UIExplorer"] is UIExplorer
+
+    def test_wrapper_shared_with_mcp(self, package_globals):
+        """Test that wrapper and mcp are the same ServerWrapper instance, built once."""
+        package_globals.pop("wrapper", None)
+        package_globals.pop("mcp", None)
+        with patch("mcp_ui_explorer.server.mcp_server.ServerWrapper") as mock_wrapper:
+            assert mcp_ui_explorer.wrapper is mcp_ui_explorer.mcp
+        mock_wrapper.assert_called_once_with()
+
+    def test_unknown_attribute(self):
+        """Test that unknown names raise AttributeError."""
+        with pytest.raises(AttributeError):
+            mcp_ui_explorer.not_an_export
+
+    def test_all_exports_resolve(self, package_globals):
+        """Test that every name in __all__ can be resolved."""
+        with patch("mcp_ui_explorer.server.mcp_server.ServerWrapper"):
+            for name in mcp_ui_explorer.__all__:
+                assert getattr(mcp_ui_explorer, name) is not None
@@ -0,0 +1,151 @@
+"""Unit tests for the SendInput input backend."""
+
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from mcp_ui_explorer.utils import ui_backend
+
+
+# VkKeyScanW results on a US keyboard layout: virtual key in the low byte,
+# shift state (1 = shift, 2 = ctrl, 4 = alt) in the high byte
+US_LAYOUT = {"a": 0x041, "A": 0x141, "s": 0x053, "1": 0x031, "!": 0x131}
+
+VK_SHIFT = 0x10
+VK_CONTROL = 0x11
+
+
+@pytest.fixture
+def us_layout():
+    """Stand in for user32 with a US keyboard layout."""
+    user32 = MagicMock()
+    user32.VkKeyScanW.side_effect = lambda char: US_LAYOUT.get(char, -1)
+    with patch.object(ui_backend, "_user32", user32, create=True):
+        yield user32
+
+
+def key_events(inputs):
+    """List (virtual key, is key up) for keyboard INPUT structures."""
+    assert all(i.type == ui_backend.INPUT_KEYBOARD for i in inputs)
+    return [(i.ki.wVk, bool(i.ki.dwFlags & ui_backend.KEYEVENTF_KEYUP)) for i in inputs]
+
+
+class TestKeyInputs:
+    """Test building key press INPUT sequences."""
+
+    def test_plain_character(self, us_layout):
+        """Test that an unshifted character is a single down/up pair."""
+        assert key_events(ui_backend._key_inputs("a")) == [(0x41, False), (0x41, True)]
+
+    def test_uppercase_character_holds_shift(self, us_layout):
+        """Test that an uppercase letter is pressed with shift held."""
+        assert key_events(ui_backend._key_inputs("A")) == [
+            (VK_SHIFT, False), (0x41, False), (0x41, True), (VK_SHIFT, True)
+        ]
+
+    def test_shifted_symbol_holds_shift(self, us_layout):
+        """Test that a symbol typed with shift presses shift and its base key."""
+        assert key_events(ui_backend._key_inputs("!")) == [
+            (VK_SHIFT, False), (0x31, False), (0x31, True), (VK_SHIFT, True)
+        ]
+
+    def test_repeated_presses(self, us_layout):
+        """Test that presses repeats the whole sequence."""
+        assert key_events(ui_backend._key_inputs("A", presses=2)) == [
+            (VK_SHIFT, False), (0x41, False), (0x41, True), (VK_SHIFT, True)
+        ] * 2
+
+    def test_named_key(self, us_layout):
+        """Test that named keys map without a layout lookup."""
+        inputs = ui_backend._key_inputs("Enter")
+        assert key_events(inputs) == [(0x0D, False), (0x0D, True)]
+        us_layout.VkKeyScanW.assert_not_called()
+
+    def test_extended_key_flag(self, us_layout):
+        """Test that navigation keys carry the extended-key flag."""
+        inputs = ui_backend._key_inputs("left")
+        assert all(i.ki.dwFlags & ui_backend.KEYEVENTF_EXTENDEDKEY for i in inputs)
+
+    def test_unmapped_character(self, us_layout):
+        """Test that characters without a virtual key are left to pyautogui."""
+        assert ui_backend._key_inputs("é") is None
+
+    def test_unsupported_shift_state(self, us_layout):
+        """Test that shift states without a modifier key are left to pyautogui."""
+        us_layout.VkKeyScanW.side_effect = lambda char: 0x841
+        assert ui_backend._key_inputs("a") is None
+
+
+class TestHotkeyInputs:
+    """Test building hotkey INPUT sequences."""
+
+    def test_ctrl_shift_s(self, us_layout):
+        """Test that keys go down in order and up in reverse."""
+        assert key_events(ui_backend._hotkey_inputs(["ctrl", "shift", "s"])) == [
+            (VK_CONTROL, False), (VK_SHIFT, False), (0x53, False),
+            (0x53, True), (VK_SHIFT, True), (VK_CONTROL, True),
+        ]
+
+    def test_shifted_character_in_hotkey(self, us_layout):
+        """Test that a shifted character adds shift to the combination."""
+        assert key_events(ui_backend._hotkey_inputs(["ctrl", "A"])) == [
+            (VK_CONTROL, False), (VK_SHIFT, False), (0x41, False),
+            (0x41, True), (VK_SHIFT, True), (VK_CONTROL, True),
+        ]
+
+    def test_explicit_shift_not_pressed_twice(self, us_layout):
+        """Test that shift is pressed once when also implied by a character."""
+        assert key_events(ui_backend._hotkey_inputs(["shift", "!"])) == [
+            (VK_SHIFT, False), (0x31, False), (0x31, True), (VK_SHIFT, True)
+        ]
+
+    def test_unmapped_key(self, us_layout):
+        """Test that one unmapped key makes the whole hotkey fall back."""
+        assert ui_backend._hotkey_inputs(["ctrl", "é"]) is None
+
+    def test_send_hotkey_single_call(self, us_layout):
+        """Test that a mapped hotkey is sent as one batch."""
+        with patch.object(ui_backend, "SENDINPUT_AVAILABLE", True), \
+                patch.object(ui_backend, "get_pyautogui"), \
+                patch.object(ui_backend, "_send_inputs") as mock_send:
+            ui_backend.send_hotkey(["ctrl", "shift", "s"])
+        mock_send.assert_called_once()
+        assert len(mock_send.call_args[0][0]) == 6
+
+
+class FailSafeException(Exception):
+    """Stand-in for pyautogui.FailSafeException."""
+
+
+class TestFailsafe:
+    """Test that SendInput paths honour pyautogui's FAILSAFE."""
+
+    @pytest.fixture
+    def pyautogui(self, us_layout):
+        fake = MagicMock()
+        fake.failSafeCheck.side_effect = FailSafeException
+        with patch.object(ui_backend, "SENDINPUT_AVAILABLE", True), \
+                patch.object(ui_backend, "get_pyautogui", return_value=fake):
+            yield fake
+
+    @pytest.mark.parametrize("send", [
+        lambda: ui_backend.send_click(10, 10),
+        lambda: ui_backend.send_text("abc"),
+        lambda: ui_backend.send_key("a"),
+        lambda: ui_backend.send_hotkey(["ctrl", "s"]),
+        lambda: ui_backend.send_keyboard_batch([("text", "abc"), ("key", "enter")]),
+    ])
+    def test_failsafe_aborts_input(self, pyautogui, send):
+        """Test that nothing is sent when the failsafe triggers."""
+        with patch.object(ui_backend, "_send_inputs") as mock_send:
+            with pytest.raises(FailSafeException):
+                send()
+        mock_send.assert_not_called()
+
+    def test_input_sent_when_failsafe_passes(self, pyautogui):
+        """Test that input is sent after a passing failsafe check."""
+        pyautogui.failSafeCheck.side_effect = None
+        with patch.object(ui_backend, "_send_inputs") as mock_send:
+            ui_backend.send_key("a")
+        pyautogui.failSafeCheck.assert_called_once()
+        mock_send.assert_called_once()
@@ -185,6 +185,16 @@ class TestCoordinateConverter:
             assert result["screen_dimensions"]["width"] == 1920
             assert result["screen_dimensions"]["height"] == 1080
 
+    def test_absolute_only(self):
+        """Test absolute coordinate info skips the screen size lookup."""
+        with patch('pyautogui.size') as mock_size:
+            result = CoordinateConverter.absolute_only(960.7, 540.2)
+            
+            mock_size.assert_not_called()
+            assert result["input"]["type"] == "absolute"
+            assert result["coordinates"]["absolute"] == {"x": 960, "y": 540}
+            assert "normalized" not in result["coordinates"]
+
     def test_create_coordinate_info_without_screen_info(self):
         """Test creating coordinate info without screen dimensions."""
         with patch('pyautogui.size') as mock_size: